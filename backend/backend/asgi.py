@@ -6,3 +6,17 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_asgi_application()
+
+# 요청을 받는 프로세스에서만 버퍼에 남은 조회수를 주기적으로 / 종료 시 반영
+from ingredients.view_counter import register_exit_flush, start_periodic_flush  # noqa: E402
+
+register_exit_flush()
+start_periodic_flush()
+
+# DRUG_AUTOLOAD=1 이면 빈 DB 를 백그라운드에서 1번 채움 (워커 여러 개여도 잠금으로 1번만)
+from django.conf import settings  # noqa: E402
+
+if settings.DRUG_AUTOLOAD:
+    from ingredients.ingest import start_catalog_bootstrap
+
+    start_catalog_bootstrap()
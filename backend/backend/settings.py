@@ -20,7 +20,24 @@ E_DRUG_API_KEY = os.getenv('E_DRUG_API_KEY')
 GMS_KEY = os.getenv("GMS_KEY")
 
 # OpenAI 호환 API Base URL (SSAFY GMS 프록시)
-OPENAI_BASE_URL = "https://gms.ssafy.io/gmsapi/api.openai.com/v1"
+# - 부하 테스트 시 로컬 목 서버로 교체 (python manage.py mock_upstream)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://gms.ssafy.io/gmsapi/api.openai.com/v1")
+
+# e약은요 의약품 목록 API
+E_DRUG_API_URL = os.getenv(
+    "E_DRUG_API_URL",
+    "https://apis.data.go.kr/1471000/DrbEasyDrugInfoService/getDrbEasyDrugList",
+)
+# 페이지당 항목 수 / 동시 조회 스레드 수 / 페이지별 최대 시도 횟수
+E_DRUG_API_PAGE_SIZE = 100
+E_DRUG_API_FETCH_WORKERS = 4
+E_DRUG_API_PAGE_ATTEMPTS = 3
+# 의약품 적재 배치 크기 (bulk_create / 트랜잭션 단위) / 이미지 동시 다운로드 수
+DRUG_INGEST_BATCH_SIZE = 500
+DRUG_IMAGE_WORKERS = 8
+# 빈 DB 일 때 WSGI / ASGI 워커 시작 후 백그라운드에서 목록 적재 (기본 꺼짐, load_drugs 커맨드 권장)
+DRUG_AUTOLOAD = os.getenv('DRUG_AUTOLOAD', '') in ('1', 'true', 'True')
+DRUG_AUTOLOAD_LOCK = BASE_DIR / 'var' / 'drug_bootstrap.lock'
 
 DEBUG = True
 ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
@@ -153,6 +170,15 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # 쓰기 잠금 대기 시간 (초)
+            'timeout': 20,
+        },
+        # 여러 스레드가 함께 쓰는 테스트를 위해 테스트 DB 도 파일로 생성
+        # (메모리 공유 캐시 DB 는 잠금 대기 없이 바로 실패함)
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -194,3 +220,97 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.SessionAuthentication',
     ],
 }
+
+
+# ========================
+# Drugs
+# ========================
+# 약 목록 커서 페이지네이션 기본 / 최대 페이지 크기
+DRUG_LIST_PAGE_SIZE = 20
+DRUG_LIST_MAX_PAGE_SIZE = 100
+
+# 상세 조회수 버퍼 반영 주기 (초) / 버퍼 건수 기준
+DRUG_VIEW_FLUSH_INTERVAL = 10
+DRUG_VIEW_FLUSH_THRESHOLD = 100
+
+# 반응 일괄 조회 시 한 번에 요청 가능한 의약품 수
+DRUG_REACTIONS_BATCH_MAX = 100
+
+# 기간별 인기 의약품 TOP-K 개수 (refresh_trending 커맨드로 갱신)
+TRENDING_TOP_K = 10
+
+# AI 요약 백그라운드 생성 (워커 수 / 최대 시도 횟수 / 재시도 대기 기본값(초, 지수 증가))
+AI_SUMMARY_WORKERS = 4
+AI_SUMMARY_MAX_ATTEMPTS = 3
+AI_SUMMARY_RETRY_BACKOFF = 2
+
+# 이 시간(초) 동안 갱신이 없는 작업은 중단된 것으로 보고 다시 등록
+AI_SUMMARY_JOB_TIMEOUT = 180
+
+# 클라이언트 폴링 권장 간격 (초)
+AI_SUMMARY_POLL_INTERVAL = 2
+
+# 증상 키워드 추출 캐시 (DB 보관 기간 / 프로세스 내 LRU 보관 기간(초) / LRU 최대 항목 수)
+KEYWORD_CACHE_TTL = 60 * 60 * 24 * 30
+KEYWORD_CACHE_LOCAL_TTL = 60 * 60
+KEYWORD_CACHE_LOCAL_SIZE = 1024
+
+# 증상 사전 빠른 매칭 최소 확신도 (이보다 낮으면 AI 로 키워드 추출)
+SYMPTOM_LEXICON_MIN_CONFIDENCE = 0.8
+
+# AI 증상 검색 한 페이지 결과 수 (기본 / 최대)
+AI_SEARCH_PAGE_SIZE = 20
+AI_SEARCH_MAX_PAGE_SIZE = 50
+
+# 효능 벡터 색인 (ingredients.effect_index)
+# 저장 위치 / 검색 결과 최대 개수 / 최소 유사도 / 다른 프로세스의 재생성 확인 간격(초)
+EFFECT_INDEX_DIR = BASE_DIR / 'var' / 'effect_index'
+EFFECT_INDEX_TOP_K = 100
+EFFECT_INDEX_MIN_SCORE = 0.1
+EFFECT_INDEX_CHECK_INTERVAL = 30
+# 디스크에 남겨 둘 색인 수 (현재 색인 포함, 이전 색인을 읽고 있는 프로세스용)
+EFFECT_INDEX_KEEP_BUILDS = 3
+# 카탈로그가 바뀌면 백그라운드 스레드에서 재생성하고 그동안은 이전 색인으로 검색
+# False 면 검색 요청 안에서 바로 재생성 (다른 스레드가 커밋 전 데이터를 볼 수 없는 테스트용)
+EFFECT_INDEX_BACKGROUND_REBUILD = True
+
+# 챗봇 답변 캐시 (보관 기간(초) / 최대 보관 답변 수, 넘으면 오래 안 쓴 답변부터 삭제)
+CHAT_ANSWER_CACHE_TTL = 60 * 60 * 24 * 7
+CHAT_ANSWER_CACHE_MAX_ENTRIES = 10000
+# 만료 / 초과 답변 정리 간격(초), 답변을 저장할 때마다 COUNT 를 돌리지 않도록
+CHAT_ANSWER_CACHE_EVICT_INTERVAL = 60
+
+# 외부 API HTTP 클라이언트 (ingredients.http_client)
+# upstream 별 타임아웃: (연결, 읽기) 초
+HTTP_UPSTREAMS = {
+    'openai': {'timeout': (5, 30)},     # GMS (chat/completions, responses) - 챗봇 / AI 검색
+    # 백그라운드 AI 요약 생성: 대화형 호출과 회로 차단기를 나눠 느린 요약이 챗봇을 막지 않도록 하고
+    # 마감 시간이 없는 호출이므로 타임아웃에 걸린 호출만 느린 호출로 셈
+    'openai_summary': {'timeout': (5, 30), 'circuit': {'slow_call_seconds': 30.0}},
+    'drug_api': {'timeout': (5, 30)},   # e약은요 의약품 목록
+    'image': {'timeout': (5, 10)},      # 의약품 이미지 다운로드
+}
+# 429 / 5xx 재시도 횟수와 백오프 기본값(초, 0.5 → 1 → 2 ...)
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.5
+# 세션별로 유지할 호스트 풀 수 / 호스트당 최대 연결 수
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 20
+# 지연 시간 백분위 계산에 쓰는 최근 호출 수
+HTTP_METRICS_WINDOW = 500
+
+# upstream 별 회로 차단기 (HTTP_UPSTREAMS 의 'circuit' 로 upstream 마다 덮어쓸 수 있음)
+# - 최근 window 건 중 min_calls 이상 호출되고 실패(느린 호출 포함) 비율이 failure_rate 이상이면 차단
+# - open_seconds 뒤 half_open_calls 건만 시험 호출
+CIRCUIT_BREAKER = {
+    'window': 20,
+    'min_calls': 5,
+    'failure_rate': 0.5,
+    'slow_call_seconds': 10.0,
+    'open_seconds': 30.0,
+    'half_open_calls': 1,
+}
+
+# LLM 을 쓰는 API 의 요청당 마감 시간 (초)
+AI_SEARCH_DEADLINE = 8
+CHAT_DEADLINE = 20
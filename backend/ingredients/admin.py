@@ -1,7 +1,12 @@
 from django.contrib import admin
-from .models import Drug, DrugComment, DrugReaction, DrugAiSummary
+from .models import Drug, DrugComment, DrugReaction, DrugAiSummary, DrugAiSummaryJob, DrugChatAnswer, DrugStats, SymptomQueryCache, TrendingDrug
 
 admin.site.register(Drug)
 admin.site.register(DrugComment)
 admin.site.register(DrugReaction)
 admin.site.register(DrugAiSummary)
+admin.site.register(DrugStats)
+admin.site.register(TrendingDrug)
+admin.site.register(DrugAiSummaryJob)
+admin.site.register(SymptomQueryCache)
+admin.site.register(DrugChatAnswer)
@@ -0,0 +1,364 @@
+# ingredients/ai_summary.py
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from . import http_client
+from .models import Drug, DrugAiSummary, DrugAiSummaryJob
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (DrugAiSummaryJob.STATUS_PENDING, DrugAiSummaryJob.STATUS_RUNNING)
+
+
+# gpt 호출 함수
+def call_gpt_for_drug_summary(drug):
+    developer_msg = """
+너는 한국어로 약 정보를 쉽게 설명해주는 AI야.
+반드시 JSON만 출력해야 해.
+
+{
+  "one_liner": "",
+  "easy_explain": "",
+  "key_points": [],
+  "cautions": [],
+  "when_to_see_doctor": []
+}
+""".strip()
+
+    user_msg = f"""
+약 이름: {drug.name}
+효능: {drug.effect}
+복용법: {drug.usage}
+주의사항: {drug.warning}
+""".strip()
+
+
+    payload = {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "developer", "content": developer_msg},
+            {"role": "user", "content": user_msg},
+        ],
+        "temperature": 0.2,
+    }
+
+    r = http_client.post(
+        'openai_summary',
+        f"{settings.OPENAI_BASE_URL}/chat/completions",
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {settings.GMS_KEY}",
+        },
+        json=payload,
+    )
+    r.raise_for_status()
+    data = r.json()
+
+    content = data["choices"][0]["message"]["content"]
+    return json.loads(content)
+
+
+# ============================
+# 요약 저장 / 응답 형태
+# ============================
+def _summary_fields(parsed):
+    return {
+        'one_liner': parsed.get("one_liner", ""),
+        'easy_explain': parsed.get("easy_explain", ""),
+        'key_points': parsed.get("key_points", []),
+        'cautions': parsed.get("cautions", []),
+        'when_to_see_doctor': parsed.get("when_to_see_doctor", []),
+    }
+
+
+def save_summary(drug, parsed):
+    """
+    GPT 결과를 DrugAiSummary 로 저장 (이미 있으면 덮어씀)
+    """
+    summary, _ = DrugAiSummary.objects.update_or_create(
+        drug=drug,
+        defaults=_summary_fields(parsed),
+    )
+    return summary
+
+
+def summary_payload(summary, cached):
+    # API 응답용 요약 dict
+    return {
+        "one_liner": summary.one_liner,
+        "easy_explain": summary.easy_explain,
+        "key_points": summary.key_points,
+        "cautions": summary.cautions,
+        "when_to_see_doctor": summary.when_to_see_doctor,
+        "cached": cached,
+        "updated_at": summary.updated_at,
+    }
+
+
+# ============================
+# 백그라운드 작업 큐
+# ============================
+# LLM 호출(최대 수십 초)을 요청 스레드에서 기다리지 않도록
+# 크기가 고정된 스레드 풀에서 처리하고, 상태는 DB(DrugAiSummaryJob)에 남긴다.
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.AI_SUMMARY_WORKERS,
+            thread_name_prefix='ai-summary',
+        )
+    return _executor
+
+
+def _run_in_worker(job_id):
+    try:
+        run_summary_job(job_id)
+    except Exception:
+        logger.exception(f"AI 요약 작업 오류 (job={job_id})")
+    finally:
+        # 워커 스레드의 DB 연결 정리
+        connection.close()
+
+
+def _submit(job_id):
+    _get_executor().submit(_run_in_worker, job_id)
+
+
+def _active_job(drug):
+    return (
+        DrugAiSummaryJob.objects
+        .filter(drug=drug, status__in=ACTIVE_STATUSES)
+        .first()
+    )
+
+
+def enqueue_summary_job(drug):
+    """
+    요약 생성 작업을 등록하고 작업 객체 반환 (의약품마다 single-flight)
+    - 이미 대기 / 진행 중인 작업이 있으면 그 작업을 그대로 반환
+    - 동시에 등록을 시도하면 부분 unique 제약으로 한 요청만 성공하고
+      나머지는 먼저 등록된 작업을 함께 기다림
+    - 오래 갱신되지 않은 작업(프로세스 종료 등)은 실패 처리 후 새로 등록
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.AI_SUMMARY_JOB_TIMEOUT)
+    DrugAiSummaryJob.objects.filter(
+        drug=drug,
+        status__in=ACTIVE_STATUSES,
+        updated_at__lt=stale_before,
+    ).update(
+        status=DrugAiSummaryJob.STATUS_FAILED,
+        error='timeout',
+        updated_at=timezone.now(),
+    )
+
+    job = _active_job(drug)
+    if job is not None:
+        return job
+
+    try:
+        with transaction.atomic():
+            job = DrugAiSummaryJob.objects.create(drug=drug)
+    except IntegrityError:
+        # 다른 요청이 먼저 등록함 (그 사이 끝났으면 마지막 작업)
+        return _active_job(drug) or DrugAiSummaryJob.objects.filter(drug=drug).latest('id')
+
+    # 작업 행이 커밋된 뒤에 워커가 읽도록 함
+    transaction.on_commit(lambda: _submit(job.id))
+    return job
+
+
+def run_summary_job(job_id):
+    """
+    워커 스레드에서 실행: GPT 호출 → 저장, 실패 시 지수 백오프로 재시도
+    """
+    # 대기 상태인 작업만 가져감 (이미 다른 워커가 잡았으면 종료)
+    claimed = DrugAiSummaryJob.objects.filter(
+        pk=job_id,
+        status=DrugAiSummaryJob.STATUS_PENDING,
+    ).update(
+        status=DrugAiSummaryJob.STATUS_RUNNING,
+        updated_at=timezone.now(),
+    )
+    if not claimed:
+        return
+
+    job = DrugAiSummaryJob.objects.select_related('drug').get(pk=job_id)
+
+    # 직전 작업이 이미 요약을 저장했으면 GPT 를 다시 부르지 않음
+    if DrugAiSummary.objects.filter(drug_id=job.drug_id).exists():
+        DrugAiSummaryJob.objects.filter(pk=job_id).update(
+            status=DrugAiSummaryJob.STATUS_DONE,
+            updated_at=timezone.now(),
+        )
+        return
+
+    max_attempts = settings.AI_SUMMARY_MAX_ATTEMPTS
+
+    for attempt in range(1, max_attempts + 1):
+        DrugAiSummaryJob.objects.filter(pk=job_id).update(
+            attempts=attempt,
+            updated_at=timezone.now(),
+        )
+        try:
+            parsed = call_gpt_for_drug_summary(job.drug)
+            save_summary(job.drug, parsed)
+        except Exception as e:
+            logger.warning(f"AI 요약 생성 실패 (drug={job.drug_id}, {attempt}/{max_attempts}): {e}")
+            if attempt == max_attempts:
+                DrugAiSummaryJob.objects.filter(pk=job_id).update(
+                    status=DrugAiSummaryJob.STATUS_FAILED,
+                    error=str(e),
+                    updated_at=timezone.now(),
+                )
+                return
+            time.sleep(settings.AI_SUMMARY_RETRY_BACKOFF * 2 ** (attempt - 1))
+        else:
+            DrugAiSummaryJob.objects.filter(pk=job_id).update(
+                status=DrugAiSummaryJob.STATUS_DONE,
+                error='',
+                updated_at=timezone.now(),
+            )
+            return
+
+
+def job_payload(job):
+    """
+    작업 상태 응답 dict (완료 시 요약 포함)
+    """
+    data = {
+        "job_id": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "poll_url": reverse('drug-ai-summary-job', args=[job.drug_id, job.id]),
+        "retry_after": settings.AI_SUMMARY_POLL_INTERVAL,
+    }
+    if job.status == DrugAiSummaryJob.STATUS_FAILED:
+        data["error"] = job.error
+    if job.status == DrugAiSummaryJob.STATUS_DONE:
+        summary = DrugAiSummary.objects.filter(drug_id=job.drug_id).first()
+        if summary:
+            data["summary"] = summary_payload(summary, cached=True)
+    return data
+
+
+# ============================
+# 일괄 사전 생성 (generate_ai_summaries 커맨드)
+# ============================
+class RateLimiter:
+    """
+    초당 rate 회를 넘지 않도록 호출 시작 간격을 맞춤 (스레드 안전)
+    - rate 가 0 / None 이면 제한 없음
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + self.interval
+        time.sleep(start - now)
+
+
+def drugs_missing_summary():
+    """
+    요약이 없고 생성 중인 작업도 없는 의약품 (조회수 많은 순)
+    """
+    return (
+        Drug.objects
+        .filter(ai_summary__isnull=True, removed_at__isnull=True)
+        .exclude(ai_summary_jobs__status__in=ACTIVE_STATUSES)
+        .order_by('-view_count', '-id')
+    )
+
+
+def _generate(drug, limiter):
+    # 워커 스레드에서는 GPT 호출만 (DB 접근 없음)
+    limiter.wait()
+    try:
+        return call_gpt_for_drug_summary(drug)
+    except Exception as e:
+        logger.warning(f"AI 요약 사전 생성 실패 (drug={drug.pk}): {e}")
+        return None
+
+
+def generate_missing_summaries(workers=None, rate=None, batch_size=20, limit=None, progress=None):
+    """
+    요약이 없는 의약품의 요약을 조회수 순으로 미리 생성
+    - GPT 호출은 workers 개 스레드에서 병렬로, 전체 호출 속도는 rate(회/초) 이하
+    - batch_size 건마다 한 트랜잭션으로 저장 → 중단돼도 저장된 건은 남고,
+      다시 실행하면 남은 의약품부터 이어서 진행
+    - 이번 실행에서 실패한 의약품은 건너뛰고 다음 실행 때 다시 시도
+    - 생성하는 사이 조회 요청으로 이미 요약이 생긴 의약품은 existed 로 따로 셈
+    - progress(generated, failed, total, elapsed, existed) 를 배치마다 호출
+
+    반환값: {'generated', 'existed', 'failed', 'total', 'elapsed'}
+    """
+    workers = workers or settings.AI_SUMMARY_WORKERS
+    limiter = RateLimiter(rate)
+    queryset = drugs_missing_summary().only('id', 'name', 'effect', 'usage', 'warning')
+
+    total = queryset.count()
+    if limit is not None:
+        total = min(total, limit)
+
+    generated = existed = failed = 0
+    skipped = set()
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ai-summary-bulk') as pool:
+        while generated + existed + failed < total:
+            size = min(batch_size, total - generated - existed - failed)
+            drugs = list(queryset.exclude(pk__in=skipped)[:size])
+            if not drugs:
+                break
+
+            results = list(pool.map(lambda d: _generate(d, limiter), drugs))
+
+            summaries = []
+            for drug, parsed in zip(drugs, results):
+                if parsed is None:
+                    skipped.add(drug.pk)
+                    continue
+                summaries.append(DrugAiSummary(drug=drug, **_summary_fields(parsed)))
+
+            # 그 사이 조회 요청으로 생성된 요약은 그대로 두고 실제로 추가한 행만 셈
+            with transaction.atomic():
+                present = set(
+                    DrugAiSummary.objects
+                    .filter(drug_id__in=[summary.drug_id for summary in summaries])
+                    .values_list('drug_id', flat=True)
+                )
+                new = [summary for summary in summaries if summary.drug_id not in present]
+                DrugAiSummary.objects.bulk_create(new, ignore_conflicts=True)
+
+            generated += len(new)
+            existed += len(summaries) - len(new)
+            failed += len(drugs) - len(summaries)
+            if progress:
+                progress(generated, failed, total, time.monotonic() - started, existed)
+
+    return {
+        'generated': generated,
+        'existed': existed,
+        'failed': failed,
+        'total': total,
+        'elapsed': time.monotonic() - started,
+    }
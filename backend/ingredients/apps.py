@@ -6,5 +6,8 @@ class IngredientsConfig(AppConfig):
     name = 'ingredients'
 
     def ready(self):
-        from .utils import cache_drugs_on_startup
-        cache_drugs_on_startup()
+        # 댓글 / 반응 삭제 시 통계 차감 시그널 등록
+        from . import signals  # noqa: F401
+
+        # 여기서는 DB / 네트워크에 접근하지 않음 (migrate / shell / test / 워커 시작마다 실행됨)
+        # 빈 DB 적재는 load_drugs 커맨드 또는 DRUG_AUTOLOAD (ingest.start_catalog_bootstrap)
@@ -0,0 +1,112 @@
+# ingredients/chat.py
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+
+from . import http_client
+
+logger = logging.getLogger(__name__)
+
+
+class ChatUpstreamError(Exception):
+    """
+    챗봇 모델 호출 실패 (HTTP 오류 응답)
+    """
+
+
+SYSTEM_PROMPT = """
+너는 의약품 정보를 친절하게 설명해주는 AI 어시스턴트야.
+전문 용어는 최대한 쉽게 풀어서 설명해 줘.
+이 약과 직접 관련 없는 내용은 추측하지 말고,
+의학적 판단이나 처방이 필요한 경우에는
+자연스럽게 의료진 상담을 권장해 줘.
+"""
+
+def build_context(drug):
+    return f"""
+다음은 특정 의약품에 대한 공식 정보입니다.
+이 정보는 참고용 컨텍스트입니다.
+
+약 이름: {drug.name}
+효능: {drug.effect or "정보 없음"}
+복용 방법: {drug.usage or "정보 없음"}
+주의사항: {drug.warning or "정보 없음"}
+"""
+
+
+
+def extract_reply_from_response(data):
+    try:
+        for item in data.get("output", []):
+            if item.get("role") == "assistant":
+                for c in item.get("content", []):
+                    if c.get("type") == "output_text":
+                        return c.get("text")
+    except Exception as e:
+        logger.error(f"❌ 응답 파싱 실패: {e}")
+    return None
+
+
+
+# 회로 차단 / 마감 초과 등으로 모델을 부를 수 없을 때 바로 돌려주는 답변
+CHAT_UNAVAILABLE_REPLY = "AI 상담이 일시적으로 원활하지 않습니다. 잠시 후 다시 시도해 주세요.\n※ 의료적 판단/처방이 아닌 정보 제공 목적입니다."
+
+CHAT_SUGGESTIONS = ["효능", "복용법", "주의사항", "부작용"]
+
+
+def build_chat_payload(drug, user_msg):
+    return {
+        "model": "gpt-5-nano",
+        "instructions": SYSTEM_PROMPT,
+        "input": f"""
+    {build_context(drug)}
+
+    사용자 질문:
+    {user_msg}
+    """.strip(),
+        "reasoning": {"effort": "low"},
+    }
+
+
+def chat_content_version(drug):
+    """
+    답변에 영향을 주는 입력(모델 / 프롬프트 / 의약품 정보)의 해시
+    - 의약품 정보나 프롬프트가 바뀌면 이전 답변 캐시는 더 이상 쓰지 않음
+    """
+    raw = json.dumps(build_chat_payload(drug, ''), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def chat_request(drug, user_msg):
+    """
+    /responses 호출 인자 (url, payload, headers)
+    """
+    url = f"{settings.OPENAI_BASE_URL}/responses"
+    headers = {
+        "Authorization": f"Bearer {settings.GMS_KEY}",
+        "Content-Type": "application/json",
+    }
+    return url, build_chat_payload(drug, user_msg), headers
+
+
+def request_chat_reply(drug, user_msg):
+    """
+    챗봇 답변 생성 (블로킹)
+
+    반환값: 답변 문자열, 응답에 텍스트가 없으면 None
+    """
+    url, payload, headers = chat_request(drug, user_msg)
+    r = http_client.post('openai', url, json=payload, headers=headers)
+
+    if r.status_code != 200:
+        logger.error(f"❌ OpenAI Error {r.status_code}: {r.text}")
+        raise ChatUpstreamError(r.status_code)
+
+    data = r.json()
+    reply = extract_reply_from_response(data)
+
+    if not reply:
+        logger.error(f"❌ 빈 응답 수신: {json.dumps(data, ensure_ascii=False)}")
+    return reply
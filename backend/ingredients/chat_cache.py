@@ -0,0 +1,171 @@
+# ingredients/chat_cache.py
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .ai_summary import RateLimiter
+from .chat import CHAT_SUGGESTIONS, chat_content_version, request_chat_reply
+from .keyword_cache import normalize_query
+from .models import DrugChatAnswer
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# 조회 / 저장
+# ============================
+# 추천 질문 칩("효능", "복용법" ...)처럼 같은 약에 같은 질문이 반복되므로
+# (의약품, 정보 버전, 정규화된 질문의 해시) 단위로 답변을 보관한다.
+# 의약품 정보나 프롬프트가 바뀌면 버전이 달라져 자연히 새 답변을 만든다.
+def question_key(message):
+    """
+    질문 → (정규화된 질문, sha256) (빈 질문이면 (None, None))
+    - 해시는 자르지 않은 전체 질문으로 계산
+    """
+    question = normalize_query(message, max_length=None)
+    if not question:
+        return None, None
+    return question, hashlib.sha256(question.encode()).hexdigest()
+
+
+def get_cached_answer(drug, message, touch=True):
+    """
+    캐시된 답변 (없거나 만료되면 None)
+    - touch=True 면 적중 횟수 / 마지막 사용 시각 갱신
+    """
+    _, question_hash = question_key(message)
+    if not question_hash:
+        return None
+
+    now = timezone.now()
+    row = (
+        DrugChatAnswer.objects
+        .filter(
+            drug=drug,
+            version=chat_content_version(drug),
+            question_hash=question_hash,
+            expires_at__gt=now,
+        )
+        .values_list('id', 'answer')
+        .first()
+    )
+    if row is None:
+        return None
+
+    pk, answer = row
+    if touch:
+        DrugChatAnswer.objects.filter(pk=pk).update(hits=F('hits') + 1, last_used_at=now)
+    return answer
+
+
+def store_answer(drug, message, answer):
+    """
+    답변 저장
+    - 같은 약의 이전 버전 답변은 삭제
+    - CHAT_ANSWER_CACHE_EVICT_INTERVAL 초마다 한 번 만료 / 초과 답변 정리
+    """
+    question, question_hash = question_key(message)
+    if not question_hash or not answer:
+        return
+
+    now = timezone.now()
+    version = chat_content_version(drug)
+
+    DrugChatAnswer.objects.update_or_create(
+        drug=drug,
+        version=version,
+        question_hash=question_hash,
+        defaults={
+            'question': question[:255],
+            'answer': answer,
+            'hits': 0,
+            'last_used_at': now,
+            'expires_at': now + timedelta(seconds=settings.CHAT_ANSWER_CACHE_TTL),
+        },
+    )
+    DrugChatAnswer.objects.filter(drug=drug).exclude(version=version).delete()
+    _evict_if_due()
+
+
+_evict_lock = threading.Lock()
+_last_evict = 0.0
+
+
+def _evict_if_due():
+    global _last_evict
+    with _evict_lock:
+        now = time.monotonic()
+        if now - _last_evict < settings.CHAT_ANSWER_CACHE_EVICT_INTERVAL:
+            return
+        _last_evict = now
+    evict_answers()
+
+
+def evict_answers(max_entries=None):
+    """
+    만료된 답변 삭제 후, 남은 수가 max_entries 를 넘으면 오래 안 쓴 순으로 삭제
+
+    반환값: 삭제된 답변 수
+    """
+    max_entries = max_entries or settings.CHAT_ANSWER_CACHE_MAX_ENTRIES
+    deleted, _ = DrugChatAnswer.objects.filter(expires_at__lte=timezone.now()).delete()
+
+    overflow = DrugChatAnswer.objects.count() - max_entries
+    if overflow > 0:
+        oldest = list(
+            DrugChatAnswer.objects
+            .order_by('last_used_at', 'id')
+            .values_list('id', flat=True)[:overflow]
+        )
+        deleted += DrugChatAnswer.objects.filter(pk__in=oldest).delete()[0]
+
+    return deleted
+
+
+# ============================
+# 추천 질문 미리 생성
+# ============================
+def _reply(drug, question, limiter):
+    # 워커 스레드에서는 모델 호출만 (DB 접근 없음)
+    limiter.wait()
+    try:
+        return request_chat_reply(drug, question)
+    except Exception as e:
+        logger.warning(f"챗봇 답변 미리 생성 실패 (drug={drug.pk}, {question}): {e}")
+        return None
+
+
+def prewarm_answers(drugs, questions=CHAT_SUGGESTIONS, workers=4, rate=None):
+    """
+    의약품별 추천 질문 답변 중 캐시에 없는 것만 생성해 저장
+
+    반환값: {'generated', 'cached', 'failed'}
+    """
+    limiter = RateLimiter(rate)
+    result = {'generated': 0, 'cached': 0, 'failed': 0}
+
+    todo = []
+    for drug in drugs:
+        for question in questions:
+            if get_cached_answer(drug, question, touch=False) is None:
+                todo.append((drug, question))
+            else:
+                result['cached'] += 1
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chat-prewarm') as pool:
+        replies = pool.map(lambda item: _reply(*item, limiter), todo)
+        for (drug, question), reply in zip(todo, replies):
+            if reply:
+                store_answer(drug, question, reply)
+                result['generated'] += 1
+            else:
+                result['failed'] += 1
+
+    return result
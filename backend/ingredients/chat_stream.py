@@ -0,0 +1,156 @@
+# ingredients/chat_stream.py
+import contextvars
+import json
+import logging
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from . import http_client
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# SSE 인코딩
+# ============================
+def sse_event(event, data):
+    """
+    Server-Sent Events 한 건 (event: / data: JSON)
+    """
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+# ============================
+# /responses 스트림 파싱
+# ============================
+def iter_output_deltas(response):
+    """
+    stream=true 로 요청한 /responses 응답에서 출력 텍스트 조각만 순서대로 꺼냄
+    - data: {"type": "response.output_text.delta", "delta": "..."} 형식
+    - response.failed / error 이벤트를 받으면 RuntimeError
+    """
+    # chunk_size=None: 받은 청크 단위로 바로 처리 (512바이트씩 모으지 않음)
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line or not line.startswith('data:'):
+            continue
+
+        raw = line[len('data:'):].strip()
+        if raw == '[DONE]':
+            return
+
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            logger.warning(f"⚠️ 스트림 이벤트 파싱 실패: {raw[:200]}")
+            continue
+
+        kind = event.get('type')
+        if kind == 'response.output_text.delta':
+            yield event.get('delta', '')
+        elif kind in ('response.failed', 'error'):
+            raise RuntimeError(json.dumps(event, ensure_ascii=False)[:500])
+        elif kind == 'response.completed':
+            return
+
+
+# ============================
+# 챗봇 스트리밍 응답
+# ============================
+def _closing_events(suggestions, drug_meta):
+    yield sse_event('suggestions', suggestions)
+    yield sse_event('drug', drug_meta)
+    yield sse_event('done', {})
+
+
+def stream_chat_events(url, payload, headers, suggestions, drug_meta, on_complete=None, deadline=None):
+    """
+    상류 출력 조각을 delta 이벤트로 그대로 전달하고
+    마지막에 suggestions / drug / done 이벤트를 보냄
+    - 오류 없이 끝나면 on_complete(전체 답변) 호출
+    - deadline(초): 첫 응답까지 / 조각 사이 최대 대기 시간
+    """
+    parts = []
+    try:
+        with http_client.deadline(deadline or settings.CHAT_DEADLINE), http_client.post(
+            'openai',
+            url,
+            json={**payload, 'stream': True},
+            headers=headers,
+            stream=True,
+        ) as r:
+            if r.status_code != 200:
+                logger.error(f"❌ OpenAI Error {r.status_code}: {r.text}")
+                yield sse_event('error', {'reply': 'AI 응답 생성 실패'})
+            else:
+                for delta in iter_output_deltas(r):
+                    if delta:
+                        parts.append(delta)
+                        yield sse_event('delta', {'text': delta})
+    except (requests.RequestException, RuntimeError) as e:
+        logger.error(f"❌ 스트리밍 실패: {e}")
+        yield sse_event('error', {'reply': 'AI 응답 생성 실패'})
+    else:
+        if not parts:
+            yield sse_event('delta', {'text': '답변을 생성하지 못했습니다.'})
+        elif on_complete:
+            on_complete(''.join(parts))
+
+    yield from _closing_events(suggestions, drug_meta)
+
+
+def unavailable_chat_events(reply, suggestions, drug_meta):
+    """
+    모델을 부를 수 없을 때 바로 끝나는 스트림
+    """
+    yield sse_event('error', {'reply': reply})
+    yield from _closing_events(suggestions, drug_meta)
+
+
+def cached_chat_events(answer, suggestions, drug_meta):
+    """
+    캐시된 답변을 delta 한 번으로 보내는 스트림 (상류 호출 없음)
+    """
+    yield sse_event('delta', {'text': answer})
+    yield from _closing_events(suggestions, drug_meta)
+
+
+# ASGI 에서 StreamingHttpResponse 는 동기 이터레이터를 끝까지 모은 뒤에 보내므로
+# (스트리밍이 아니게 됨) 이벤트를 한 건씩 꺼내는 비동기 이터레이터로 감싼다.
+# - next() 는 sync_to_async 기본값(thread_sensitive)으로 한 스레드에서만 실행되어
+#   상류 연결 / DB 연결이 스레드 사이를 옮겨 다니지 않는다.
+# - sync_to_async 는 호출마다 컨텍스트를 복사하므로 제너레이터 안의 ContextVar
+#   (http_client.deadline) 가 단계마다 달라지지 않도록 하나의 컨텍스트에서 실행한다.
+async def _async_events(events):
+    iterator = iter(events)
+    context = contextvars.copy_context()
+    done = object()
+    try:
+        while True:
+            event = await sync_to_async(context.run)(next, iterator, done)
+            if event is done:
+                return
+            yield event
+    finally:
+        # 클라이언트가 끊으면 상류 스트림도 닫음
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(context.run)(close)
+
+
+def sse_response(request, events):
+    """
+    이벤트 스트림을 text/event-stream 응답으로 (WSGI / ASGI 모두 이벤트 단위로 전송)
+    """
+    # DRF Request 면 원래 HttpRequest 로 판단
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        events = _async_events(events)
+
+    response = StreamingHttpResponse(events, content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    # nginx 등 프록시가 응답을 모아서 보내지 않도록
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,139 @@
+# ingredients/circuit.py
+import threading
+import time
+from collections import deque
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    회로가 열려 있어 upstream 호출을 시도하지 않음
+    (requests.RequestException 하위 클래스라 기존 네트워크 오류 처리에 그대로 걸림)
+    """
+
+
+# ============================
+# 회로 차단기
+# ============================
+# upstream 이 느려지거나 실패하기 시작하면 호출을 바로 거절해서
+# 워커가 15 ~ 30초짜리 호출에 묶여 다른 API 까지 느려지는 것을 막는다.
+#
+#   closed ──(최근 호출 중 실패 / 느린 호출 비율 ≥ 기준)──▶ open
+#   open ──(open_seconds 경과)──▶ half_open (시험 호출 몇 건만 허용)
+#   half_open ──(시험 호출 성공)──▶ closed / ──(실패)──▶ open
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(self, name, window=20, min_calls=5, failure_rate=0.5,
+                 slow_call_seconds=10.0, open_seconds=30.0, half_open_calls=1):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)   # True = 실패 또는 느린 호출
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        # open 상태에서 대기 시간이 지나면 half_open 으로 전환
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def before_call(self):
+        """
+        호출 전 확인 (열려 있으면 CircuitOpenError)
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == OPEN:
+                raise CircuitOpenError(f'{self.name} circuit open')
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    raise CircuitOpenError(f'{self.name} circuit half-open (probe in flight)')
+                self._probes += 1
+
+    def record(self, ok, elapsed):
+        """
+        호출 결과 기록 (느린 호출은 실패로 취급)
+        """
+        failed = not ok or elapsed >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(upstream):
+    """
+    upstream 별 회로 차단기
+    - settings.CIRCUIT_BREAKER 에 HTTP_UPSTREAMS[upstream]['circuit'] 값을 덮어써서 생성
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            options = settings.HTTP_UPSTREAMS.get(upstream, {}).get('circuit', {})
+            breaker = _breakers[upstream] = CircuitBreaker(upstream, **{**settings.CIRCUIT_BREAKER, **options})
+        return breaker
+
+
+def is_available(upstream):
+    """
+    지금 호출을 시도할 수 있는지 (open 이면 False)
+    """
+    return get_breaker(upstream).state != OPEN
+
+
+def breaker_states():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.state for b in breakers}
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting in ('CIRCUIT_BREAKER', 'HTTP_UPSTREAMS'):
+        reset_breakers()
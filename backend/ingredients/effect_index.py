@@ -0,0 +1,375 @@
+# ingredients/effect_index.py
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.dispatch import receiver
+
+from .locks import file_lock
+from .models import Drug
+from .search import chunks
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# 효능 텍스트 벡터 색인 (TF-IDF, 문자 n-gram)
+# ============================
+# Drug.effect 를 문자 2 ~ 3-gram TF-IDF 벡터로 만들어 두고
+# 증상 키워드와의 코사인 유사도 상위 k 개를 NumPy 로 한 번에 계산한다.
+#
+# 색인은 열(n-gram) 기준 희소 행렬(CSC)로 디스크에 저장하고 mmap 으로 읽는다.
+#   EFFECT_INDEX_DIR/
+#     current.json        ← 현재 색인 정보 (os.replace 로 원자적으로 교체)
+#     stale               ← 카탈로그가 바뀌었다는 표시 (mtime 비교)
+#     build.lock          ← 색인 생성 잠금 (여러 프로세스가 동시에 만들지 않도록)
+#     <build_id>/
+#       drug_ids.npy      행 번호 → Drug.id
+#       col_ptr.npy       n-gram 열마다 postings 시작 위치
+#       rows.npy          postings 의 행 번호
+#       weights.npy       postings 의 정규화된 TF-IDF 값
+#       idf.npy           n-gram 별 idf
+#       vocab.json        n-gram → 열 번호
+#
+# 질의 벡터는 n-gram 이 몇 개뿐이라, 해당 열의 postings 만 모아
+# np.bincount 로 문서별 점수를 더하면 코사인 유사도가 된다 (행 정규화 완료 상태).
+NGRAM_RANGE = (2, 3)
+
+CURRENT_FILE = 'current.json'
+STALE_FILE = 'stale'
+LOCK_FILE = 'build.lock'
+
+
+def ngrams(text):
+    """
+    문자 n-gram 목록 (단어 앞뒤에 공백을 붙여 단어 경계도 특징으로 사용)
+      "두통" → " 두", "두통", "통 ", " 두통", "두통 "
+    """
+    grams = []
+    low, high = NGRAM_RANGE
+    for chunk in chunks(text):
+        padded = f' {chunk} '
+        for n in range(low, high + 1):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _tf(count):
+    # 같은 n-gram 이 여러 번 나와도 점수가 과하게 커지지 않도록 로그 스케일
+    return 1.0 + math.log(count)
+
+
+def _index_dir():
+    return Path(settings.EFFECT_INDEX_DIR)
+
+
+def catalog_signature():
+    """
+    카탈로그 변화 감지용 값 (의약품 수 / 최대 id)
+    (내용만 바뀌는 저장은 시그널에서 mark_stale 로 알림)
+    """
+    agg = Drug.objects.filter(removed_at__isnull=True).aggregate(count=Count('id'), max_id=Max('id'))
+    return f"{agg['count']}:{agg['max_id'] or 0}"
+
+
+# ============================
+# 색인 생성
+# ============================
+def build_lock(blocking=True):
+    """
+    프로세스 간 색인 생성 잠금 (ingest.catalog_lock 과 같은 파일 잠금)
+    """
+    return file_lock(_index_dir() / LOCK_FILE, blocking=blocking)
+
+
+def build_effect_index(batch_size=1000):
+    """
+    전체 Drug.effect 로 색인을 새로 만들어 current 로 교체
+    - 다른 프로세스가 만드는 중이면 끝날 때까지 기다렸다가 만듦
+
+    반환값: 색인 정보 dict (build_id / drugs / terms / seconds)
+    """
+    with build_lock():
+        return _build(batch_size)
+
+
+def _build(batch_size=1000):
+    started = time.time()
+    signature = catalog_signature()
+
+    vocab = {}
+    drug_ids, rows, cols, tfs = [], [], [], []
+    # e약은요 목록에서 사라진 의약품은 검색 대상에서 제외
+    queryset = Drug.objects.filter(removed_at__isnull=True).only('id', 'effect').order_by('id')
+    for row, drug in enumerate(queryset.iterator(chunk_size=batch_size)):
+        drug_ids.append(drug.pk)
+        for gram, count in Counter(ngrams(drug.effect)).items():
+            col = vocab.setdefault(gram, len(vocab))
+            rows.append(row)
+            cols.append(col)
+            tfs.append(_tf(count))
+
+    n_docs, n_terms = len(drug_ids), len(vocab)
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int32)
+
+    # idf = log((1 + N) / (1 + df)) + 1
+    df = np.bincount(cols, minlength=n_terms)
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+    # 행(의약품) 단위 L2 정규화 → 내적이 곧 코사인 유사도
+    weights = np.asarray(tfs, dtype=np.float32) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+    norms[norms == 0] = 1
+    weights = (weights / norms[rows]).astype(np.float32)
+
+    # 열 순서로 정렬해 CSC 형태로 저장
+    order = np.argsort(cols, kind='stable')
+    col_ptr = np.zeros(n_terms + 1, dtype=np.int64)
+    np.cumsum(df, out=col_ptr[1:])
+
+    build_id = f'{time.time_ns()}-{os.getpid()}'
+    root = _index_dir()
+    target = root / build_id
+    target.mkdir(parents=True)
+    np.save(target / 'drug_ids.npy', np.asarray(drug_ids, dtype=np.int64))
+    np.save(target / 'col_ptr.npy', col_ptr)
+    np.save(target / 'rows.npy', rows[order])
+    np.save(target / 'weights.npy', weights[order])
+    np.save(target / 'idf.npy', idf)
+    (target / 'vocab.json').write_text(json.dumps(vocab, ensure_ascii=False), encoding='utf-8')
+
+    meta = {
+        'build_id': build_id,
+        'signature': signature,
+        'started_at': started,
+        'drugs': n_docs,
+        'terms': n_terms,
+        'seconds': round(time.time() - started, 3),
+    }
+    tmp = root / f'{CURRENT_FILE}.{build_id}.tmp'
+    tmp.write_text(json.dumps(meta), encoding='utf-8')
+    os.replace(tmp, root / CURRENT_FILE)
+
+    _remove_old_builds(root, current=build_id)
+    logger.info(f"효능 색인 생성: {n_docs} drugs / {n_terms} terms / {meta['seconds']}s")
+    return meta
+
+
+def _remove_old_builds(root, current):
+    """
+    최근 EFFECT_INDEX_KEEP_BUILDS 개만 남기고 이전 색인 디렉터리 삭제
+    - 다른 프로세스는 EFFECT_INDEX_CHECK_INTERVAL 초 동안 이전 색인을 계속 읽을 수 있으므로
+      current 하나만 남기지 않고 몇 개를 더 둠
+    """
+    builds = sorted(
+        (path for path in root.iterdir() if path.is_dir() and path.name != current),
+        key=lambda path: path.name.split('-')[0].zfill(20),
+        reverse=True,
+    )
+    for path in builds[max(settings.EFFECT_INDEX_KEEP_BUILDS - 1, 0):]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _read_meta():
+    try:
+        return json.loads((_index_dir() / CURRENT_FILE).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _stale_since():
+    try:
+        return (_index_dir() / STALE_FILE).stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+# ============================
+# 검색
+# ============================
+class EffectIndex:
+    def __init__(self, meta):
+        path = _index_dir() / meta['build_id']
+        self.meta = meta
+        self.drug_ids = np.load(path / 'drug_ids.npy', mmap_mode='r')
+        self.col_ptr = np.load(path / 'col_ptr.npy', mmap_mode='r')
+        self.rows = np.load(path / 'rows.npy', mmap_mode='r')
+        self.weights = np.load(path / 'weights.npy', mmap_mode='r')
+        self.idf = np.load(path / 'idf.npy', mmap_mode='r')
+        self.vocab = json.loads((path / 'vocab.json').read_text(encoding='utf-8'))
+
+    def query_vector(self, terms):
+        """
+        검색어들 → (열 번호 배열, 정규화된 가중치 배열)
+        """
+        counts = Counter()
+        for term in terms:
+            counts.update(g for g in ngrams(term) if g in self.vocab)
+        if not counts:
+            return None, None
+
+        cols = np.fromiter((self.vocab[g] for g in counts), dtype=np.int64, count=len(counts))
+        weights = np.fromiter((_tf(c) for c in counts.values()), dtype=np.float32, count=len(counts))
+        weights *= self.idf[cols]
+        weights /= np.linalg.norm(weights)
+        return cols, weights
+
+    def search(self, terms, top_k, min_score=0.0):
+        """
+        코사인 유사도 상위 top_k 개
+
+        반환값: [(drug_id, score), ...] (점수 내림차순)
+        """
+        cols, q = self.query_vector(terms)
+        if cols is None or not len(self.drug_ids):
+            return []
+
+        starts, ends = self.col_ptr[cols], self.col_ptr[cols + 1]
+        rows = np.concatenate([self.rows[s:e] for s, e in zip(starts, ends)])
+        contrib = np.concatenate([
+            self.weights[s:e] * w for s, e, w in zip(starts, ends, q)
+        ])
+        scores = np.bincount(rows, weights=contrib, minlength=len(self.drug_ids))
+
+        candidates = np.flatnonzero(scores > min_score)
+        if len(candidates) > top_k:
+            part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = candidates[part]
+        # 점수 내림차순, 같으면 최신(id 큰) 의약품 먼저
+        ids = self.drug_ids[candidates]
+        order = np.lexsort((-ids, -scores[candidates]))
+        return [(int(ids[i]), float(scores[candidates[i]])) for i in order]
+
+
+_lock = threading.Lock()
+_index = None
+_checked_at = 0.0
+_dirty = False
+_rebuild_thread = None
+
+
+def _needs_rebuild(meta):
+    return meta['signature'] != catalog_signature() or _stale_since() >= meta['started_at']
+
+
+def get_index():
+    """
+    현재 색인 (필요하면 디스크에서 다시 읽음)
+    - EFFECT_INDEX_CHECK_INTERVAL 초마다 다른 프로세스의 재생성 / 카탈로그 변화를 확인
+    - 이 프로세스에서 mark_stale 이 불렸거나 재생성이 끝났으면 바로 확인
+    - 색인이 오래됐으면 새 색인은 백그라운드에서 만들고 그동안은 마지막 색인으로 검색
+      (색인이 아예 없을 때만 요청 안에서 만듦)
+    """
+    global _index, _checked_at, _dirty
+    now = time.monotonic()
+    if _index is not None and not _dirty and now - _checked_at < settings.EFFECT_INDEX_CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        if _index is not None and not _dirty and now - _checked_at < settings.EFFECT_INDEX_CHECK_INTERVAL:
+            return _index
+
+        _dirty = False
+        meta = _read_meta()
+        if meta is None:
+            # 다른 프로세스가 첫 색인을 만드는 중이면 기다렸다가 그 색인을 사용
+            with build_lock():
+                meta = _read_meta() or _build()
+        elif _needs_rebuild(meta):
+            if settings.EFFECT_INDEX_BACKGROUND_REBUILD:
+                _start_rebuild()
+            else:
+                meta = build_effect_index()
+
+        if _index is None or _index.meta['build_id'] != meta['build_id']:
+            _index = EffectIndex(meta)
+        _checked_at = time.monotonic()
+        return _index
+
+
+def _run_rebuild():
+    global _dirty
+    try:
+        with build_lock(blocking=False) as acquired:
+            # 다른 프로세스가 만드는 중이면 맡겨 두고 다음 확인 때 그 색인을 읽음
+            if not acquired:
+                return
+            meta = _read_meta()
+            if meta is None or _needs_rebuild(meta):
+                _build()
+        # 다음 검색에서 새 색인을 읽음
+        _dirty = True
+    except Exception:
+        logger.exception('효능 색인 재생성 실패')
+    finally:
+        connection.close()
+
+
+def _start_rebuild():
+    """
+    백그라운드 스레드에서 색인 재생성 (이미 진행 중이면 그대로 둠)
+    """
+    global _rebuild_thread
+    if _rebuild_thread is None or not _rebuild_thread.is_alive():
+        _rebuild_thread = threading.Thread(target=_run_rebuild, name='effect-index-rebuild', daemon=True)
+        _rebuild_thread.start()
+    return _rebuild_thread
+
+
+def _touch_stale():
+    global _dirty
+    root = _index_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    (root / STALE_FILE).touch()
+    _dirty = True
+
+
+def mark_stale():
+    """
+    카탈로그가 바뀌었음을 표시 (다음 검색 때 백그라운드에서 색인 재생성)
+    - bulk_create / update() 처럼 시그널이 없는 경로에서는 직접 호출
+    """
+    _touch_stale()
+    # 커밋 전에 다른 프로세스가 이전 데이터로 색인을 만들었을 수 있으므로 커밋 후 한 번 더 표시
+    transaction.on_commit(_touch_stale)
+
+
+def reset_index():
+    """
+    프로세스에 읽어 둔 색인을 버림 (설정 변경 / 테스트용)
+    """
+    global _index, _checked_at, _dirty
+    with _lock:
+        _index, _checked_at, _dirty = None, 0.0, False
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith('EFFECT_INDEX_'):
+        reset_index()
+
+
+def search_effects(terms, top_k=None):
+    """
+    증상 키워드 → [(drug_id, score), ...] (관련도 순, 최대 top_k 개)
+    """
+    terms = [t for t in terms if t and t.strip()]
+    if not terms:
+        return []
+    return get_index().search(
+        terms,
+        top_k or settings.EFFECT_INDEX_TOP_K,
+        settings.EFFECT_INDEX_MIN_SCORE,
+    )
@@ -0,0 +1,241 @@
+# ingredients/http_client.py
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .circuit import breaker_states, get_breaker
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# upstream 별 공유 세션
+# ============================
+# 외부 API(GMS / e약은요 / 이미지 서버)마다 Session 하나를 공유해
+# 호스트별 커넥션 풀과 keep-alive 를 재사용한다 (매 호출 TCP + TLS 핸드셰이크 제거).
+# - 429 / 5xx / 연결 오류는 지수 백오프로 재시도 (Retry-After 헤더 존중)
+#   요청이 서버에 전달됐을 수 있는 POST 는 429 / 5xx / 읽기 오류를 재시도하지 않음
+# - 타임아웃은 settings.HTTP_UPSTREAMS 의 upstream 별 값으로 통일
+# - upstream 별 회로 차단기(circuit.py)가 열려 있으면 호출하지 않고 CircuitOpenError
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _upstream_config(upstream):
+    try:
+        return settings.HTTP_UPSTREAMS[upstream]
+    except KeyError:
+        raise ValueError(f'알 수 없는 upstream: {upstream}')
+
+
+def _build_session(upstream, retries):
+    config = _upstream_config(upstream)
+    retry = Retry(
+        total=config.get('retries', settings.HTTP_RETRY_TOTAL) if retries else 0,
+        backoff_factor=settings.HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        # GET 등 멱등 메서드만 재시도 (POST 는 연결 실패만 재시도)
+        # 모델 호출 POST 는 재시도마다 과금되므로 재시도 여부를 호출하는 쪽에서 정함
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # 재시도 후에도 실패면 마지막 응답을 그대로 반환
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(upstream, retries=True):
+    """
+    upstream 공유 세션 (retries=False 면 재시도 없는 세션, 마감 시간이 있는 요청용)
+    """
+    key = (upstream, retries)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _build_session(upstream, retries)
+        return session
+
+
+def reset_sessions():
+    """
+    모든 세션을 닫고 다음 호출 때 설정으로 다시 만듦 (설정 변경 / 테스트용)
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    # override_settings 등으로 HTTP_* 설정이 바뀌면 세션을 새로 만듦
+    if setting.startswith('HTTP_'):
+        reset_sessions()
+
+
+# ============================
+# upstream 별 지연 시간 지표 (프로세스 단위)
+# ============================
+# 최근 N 건의 지연 시간으로 p50 / p95 를 계산하고 누적 호출 / 오류 수를 센다.
+# (stream=True 호출은 응답 헤더를 받을 때까지의 시간)
+_metrics_lock = threading.Lock()
+_metrics = {}
+
+
+def _new_metric():
+    return {
+        'calls': 0,
+        'errors': 0,
+        'total_seconds': 0.0,
+        'recent': deque(maxlen=settings.HTTP_METRICS_WINDOW),
+    }
+
+
+def _record(upstream, elapsed, ok):
+    with _metrics_lock:
+        metric = _metrics.setdefault(upstream, _new_metric())
+        metric['calls'] += 1
+        metric['total_seconds'] += elapsed
+        metric['recent'].append(elapsed)
+        if not ok:
+            metric['errors'] += 1
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def upstream_metrics():
+    """
+    {upstream: {calls, errors, avg_ms, p50_ms, p95_ms, max_ms, circuit}}
+    """
+    with _metrics_lock:
+        snapshot = {
+            name: (m['calls'], m['errors'], m['total_seconds'], sorted(m['recent']))
+            for name, m in _metrics.items()
+        }
+
+    result = {}
+    for name, (calls, errors, total, recent) in snapshot.items():
+        result[name] = {
+            'calls': calls,
+            'errors': errors,
+            'avg_ms': _ms(total / calls) if calls else None,
+            'p50_ms': _ms(_percentile(recent, 0.5)),
+            'p95_ms': _ms(_percentile(recent, 0.95)),
+            'max_ms': _ms(recent[-1] if recent else None),
+        }
+    for name, state in breaker_states().items():
+        result.setdefault(name, {})['circuit'] = state
+    return result
+
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+# ============================
+# 요청 마감 시간
+# ============================
+# with deadline(8): 안의 모든 upstream 호출은 남은 시간 안에 끝나야 한다.
+# - 타임아웃을 남은 시간으로 줄이고 재시도는 하지 않음
+# - 이미 시간이 지났으면 호출 없이 DeadlineExceeded
+class DeadlineExceeded(requests.Timeout):
+    """
+    요청 마감 시간 초과
+    """
+
+
+_deadline = contextvars.ContextVar('http_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    ends = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(ends if current is None else min(current, ends))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _timeout_and_retries(upstream, timeout):
+    timeout = timeout or tuple(_upstream_config(upstream)['timeout'])
+    ends = _deadline.get()
+    if ends is None:
+        return timeout, True
+
+    remaining = ends - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded(f'{upstream} deadline exceeded')
+
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return (min(connect, remaining), min(read, remaining)), False
+
+
+# ============================
+# 요청
+# ============================
+def request(upstream, method, url, **kwargs):
+    """
+    upstream 공유 세션으로 요청 (재시도 / 타임아웃 / 회로 차단 / 지표 기록)
+    - timeout 을 주지 않으면 upstream 기본값 사용
+    - 연결 실패 / 재시도 초과 / 회로 열림 / 마감 초과 시 requests.RequestException
+    """
+    kwargs['timeout'], retries = _timeout_and_retries(upstream, kwargs.get('timeout'))
+
+    breaker = get_breaker(upstream)
+    breaker.before_call()
+    session = get_session(upstream, retries=retries)
+
+    started = time.monotonic()
+    try:
+        response = session.request(method, url, **kwargs)
+    except requests.RequestException:
+        elapsed = time.monotonic() - started
+        _record(upstream, elapsed, ok=False)
+        breaker.record(False, elapsed)
+        raise
+
+    elapsed = time.monotonic() - started
+    _record(upstream, elapsed, ok=response.status_code < 400)
+    # 4xx 는 요청 쪽 문제라 upstream 장애로 세지 않음 (429 제외)
+    breaker.record(response.status_code < 500 and response.status_code != 429, elapsed)
+    logger.debug(f'{upstream} {method} {response.status_code} {elapsed * 1000:.0f}ms')
+    return response
+
+
+def get(upstream, url, **kwargs):
+    return request(upstream, 'GET', url, **kwargs)
+
+
+def post(upstream, url, **kwargs):
+    return request(upstream, 'POST', url, **kwargs)
@@ -0,0 +1,354 @@
+# ingredients/ingest.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import http_client
+from .effect_index import mark_stale
+from .locks import file_lock
+from .models import Drug
+from .search import index_drugs
+from .stats import create_stats
+from .utils import iter_drug_pages
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# 의약품 목록 적재 파이프라인
+# ============================
+#   iter_drug_pages (페이지 스트림)
+#     → drug_from_item (API 항목 → Drug 객체)
+#     → batched (batch_size 개씩)
+#     → bulk_create (배치마다 트랜잭션 1번)
+# 이미지 다운로드는 적재가 끝난 뒤 fetch_missing_images 단계에서 따로 처리한다.
+# 어느 단계도 전체 목록을 메모리에 모으지 않으므로 카탈로그 크기와 상관없이
+# 메모리 사용량은 (동시 조회 페이지 수 + 배치 크기) 만큼으로 유지된다.
+
+# API 항목에서 가져오는 필드 (content_hash 계산 대상)
+SYNC_FIELDS = ('name', 'effect', 'usage', 'warning', 'image_url')
+
+
+def _item_fields(item):
+    return {
+        'name': (item.get("itemName") or "")[:100],
+        'effect': item.get("efcyQesitm") or "",
+        'usage': item.get("useMethodQesitm") or "",
+        'warning': item.get("atpnWarnQesitm") or "",
+        'image_url': item.get("itemImage"),
+    }
+
+
+def content_hash(fields):
+    raw = json.dumps([fields[name] for name in SYNC_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def drug_from_item(item):
+    """
+    e약은on API 항목 → 저장 전 Drug 객체
+    """
+    fields = _item_fields(item)
+    return Drug(
+        item_seq=item.get("itemSeq") or None,
+        content_hash=content_hash(fields),
+        **fields,
+    )
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def ingest_drugs(pages=None, batch_size=None, progress=None):
+    """
+    페이지 스트림을 Drug 로 변환해 batch_size 개씩 bulk_create
+    - pages: 항목 리스트를 내보내는 iterable (기본 iter_drug_pages())
+    - 배치마다 트랜잭션 하나 (행마다 커밋하지 않음)
+    - bulk_create 는 시그널이 없으므로 검색 색인 / 통계 행은 여기서 직접 맞춤
+    - progress(적재된 수) 를 주면 배치마다 호출
+
+    반환값: {drugs, batches, seconds}
+    """
+    started = time.monotonic()
+    pages = iter_drug_pages() if pages is None else pages
+    drugs = (drug_from_item(item) for items in pages for item in items)
+
+    count = batches = 0
+    for batch in batched(drugs, batch_size or settings.DRUG_INGEST_BATCH_SIZE):
+        with transaction.atomic():
+            created = Drug.objects.bulk_create(batch)
+            create_stats(drug.pk for drug in created)
+            index_drugs(created)
+        count += len(created)
+        batches += 1
+        if progress:
+            progress(count)
+
+    if count:
+        mark_stale()
+
+    result = {'drugs': count, 'batches': batches, 'seconds': round(time.monotonic() - started, 3)}
+    logger.info(f"의약품 적재: {count} drugs / {batches} batches / {result['seconds']}s")
+    return result
+
+
+# ============================
+# 증분 동기화
+# ============================
+# itemSeq 로 기존 행을 찾아 content_hash 가 다른 행만 갱신하고, 없는 행만 추가한다.
+# - 배치마다 기존 행 조회 1번 (item_seq 고유 색인) + 바뀐 행만 INSERT / UPDATE
+# - 받은 itemSeq 수가 totalCount 와 같을 때(전체 목록을 끝까지 받았을 때)만
+#   목록에서 사라진 행에 removed_at 표시
+# - itemSeq 없이 적재된 예전 행은 이름이 같은 항목과 한 번 연결 (댓글 / 반응 유지)
+#   끝까지 연결되지 않은 예전 행도 목록에 없는 것이므로 같이 removed_at 표시
+def _legacy_rows_by_name():
+    return {
+        name: {'id': pk, 'content_hash': None, 'image_url': image_url, 'removed_at': None}
+        for name, pk, image_url in (
+            Drug.objects
+            .filter(item_seq__isnull=True)
+            .order_by('-id')
+            .values_list('name', 'id', 'image_url')
+        )
+    }
+
+
+def _sync_batch(items, legacy):
+    """
+    항목 한 배치를 반영
+
+    반환값: (inserted, updated, unchanged)
+    """
+    incoming = {}
+    for item in items:
+        drug = drug_from_item(item)
+        if drug.item_seq:
+            incoming[drug.item_seq] = drug
+
+    existing = {
+        row['item_seq']: row
+        for row in Drug.objects
+        .filter(item_seq__in=list(incoming))
+        .values('id', 'item_seq', 'content_hash', 'image_url', 'removed_at')
+    }
+
+    to_create, to_update, image_changed = [], [], []
+    unchanged = 0
+    for seq, drug in incoming.items():
+        row = existing.get(seq) or legacy.pop(drug.name, None)
+        if row is None:
+            to_create.append(drug)
+        elif row['content_hash'] == drug.content_hash and row['removed_at'] is None:
+            unchanged += 1
+        else:
+            drug.pk = row['id']
+            # 이미지 주소가 바뀌면 비워 두고 이미지 단계에서 다시 받음
+            if row['image_url'] != drug.image_url:
+                drug.image = ''
+                image_changed.append(drug)
+            else:
+                to_update.append(drug)
+
+    fields = [*SYNC_FIELDS, 'item_seq', 'content_hash', 'removed_at']
+    with transaction.atomic():
+        created = Drug.objects.bulk_create(to_create)
+        create_stats(drug.pk for drug in created)
+        Drug.objects.bulk_update(to_update, fields)
+        Drug.objects.bulk_update(image_changed, fields + ['image'])
+        index_drugs(created + to_update + image_changed)
+
+    return len(created), len(to_update) + len(image_changed), unchanged
+
+
+def sync_drugs(pages=None, batch_size=None, now=None, stats=None):
+    """
+    e약은on 목록과 Drug 테이블을 itemSeq 기준으로 맞춤
+    - pages 를 직접 주는 경우 stats 에 그 목록의 total(totalCount) 이 채워져 있어야 삭제 표시를 함
+      (iter_drug_pages(stats=stats) 를 넘기면 자동으로 채워짐)
+
+    반환값: {inserted, updated, unchanged, removed, complete, seconds}
+    """
+    started = time.monotonic()
+    now = now or timezone.now()
+    if pages is None:
+        stats = {} if stats is None else stats
+        pages = iter_drug_pages(stats=stats)
+    legacy = _legacy_rows_by_name()
+    has_legacy = bool(legacy)
+
+    result = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+    seen = set()
+    items = (item for page in pages for item in page)
+    for batch in batched(items, batch_size or settings.DRUG_INGEST_BATCH_SIZE):
+        seen.update(item.get("itemSeq") for item in batch if item.get("itemSeq"))
+        inserted, updated, unchanged = _sync_batch(batch, legacy)
+        result['inserted'] += inserted
+        result['updated'] += updated
+        result['unchanged'] += unchanged
+
+    # 일부 페이지만 받았거나 빈 목록을 받았을 때 나머지가 삭제 처리되지 않도록
+    total = (stats or {}).get('total')
+    result['complete'] = bool(seen) and len(seen) == total
+    if result['complete']:
+        active = set(
+            Drug.objects
+            .filter(item_seq__isnull=False, removed_at__isnull=True)
+            .values_list('item_seq', flat=True)
+        )
+        gone = list(active - seen)
+        with transaction.atomic():
+            for chunk in batched(gone, 500):
+                result['removed'] += Drug.objects.filter(item_seq__in=chunk).update(removed_at=now)
+            # 어느 항목과도 연결되지 않은 예전 행
+            if has_legacy:
+                result['removed'] += (
+                    Drug.objects
+                    .filter(item_seq__isnull=True, removed_at__isnull=True)
+                    .update(removed_at=now)
+                )
+    else:
+        logger.warning(
+            f"의약품 동기화: 받은 항목 {len(seen)}건이 전체 {total}건과 달라 삭제 표시를 건너뜁니다"
+        )
+
+    if result['inserted'] or result['updated'] or result['removed']:
+        mark_stale()
+
+    result['seconds'] = round(time.monotonic() - started, 3)
+    logger.info(
+        f"의약품 동기화: 추가 {result['inserted']} / 변경 {result['updated']} / "
+        f"유지 {result['unchanged']} / 삭제 {result['removed']} / {result['seconds']}s"
+    )
+    return result
+
+
+# ============================
+# 이미지 단계
+# ============================
+def download_image(image_url):
+    """
+    이미지 URL → 바이트 (실패 시 None)
+    """
+    try:
+        res = http_client.get('image', image_url)
+    except Exception as e:
+        logger.warning(f"이미지 다운로드 실패: {image_url} ({e})")
+        return None
+    return res.content if res.status_code == 200 else None
+
+
+def _missing_images():
+    return (
+        Drug.objects
+        .exclude(Q(image_url__isnull=True) | Q(image_url=''))
+        .filter(Q(image__isnull=True) | Q(image=''))
+        .only('id', 'name', 'image_url', 'image')
+        .order_by('id')
+    )
+
+
+def fetch_missing_images(workers=None, batch_size=None, limit=None, progress=None):
+    """
+    image_url 은 있지만 이미지 파일이 없는 의약품의 이미지를 받아 저장
+    - 다운로드는 스레드 풀(workers 개)로 동시에, 파일 저장 / DB 반영은 현재 스레드에서
+    - batch_size 개씩 id 순으로 진행하고 배치마다 bulk_update 1번
+
+    반환값: {saved, failed}
+    """
+    batch_size = batch_size or settings.DRUG_INGEST_BATCH_SIZE
+    saved = failed = 0
+    last_id = 0
+
+    with ThreadPoolExecutor(
+        max_workers=workers or settings.DRUG_IMAGE_WORKERS,
+        thread_name_prefix='drug-image',
+    ) as pool:
+        while limit is None or saved + failed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - saved - failed)
+            batch = list(_missing_images().filter(id__gt=last_id)[:size])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+
+            updated = []
+            for drug, content in zip(batch, pool.map(download_image, [d.image_url for d in batch])):
+                if content is None:
+                    failed += 1
+                    continue
+                filename = drug.image_url.split('/')[-1] + '.jpg'
+                drug.image.save(filename, ContentFile(content), save=False)
+                updated.append(drug)
+
+            with transaction.atomic():
+                Drug.objects.bulk_update(updated, ['image'])
+            saved += len(updated)
+            if progress:
+                progress(saved, failed)
+
+    return {'saved': saved, 'failed': failed}
+
+
+# ============================
+# 빈 DB 초기 적재 (1회성)
+# ============================
+# 앱 시작(AppConfig.ready)에서는 DB / 네트워크에 접근하지 않는다.
+# 빈 DB 를 채우는 방법
+#   1. python manage.py load_drugs (권장)
+#   2. DRUG_AUTOLOAD=1 로 실행하면 WSGI / ASGI 워커가 뜬 뒤 백그라운드 스레드에서 1번
+# 여러 워커 / 커맨드가 동시에 시작해도 파일 잠금을 잡은 프로세스 하나만 적재한다.
+def catalog_lock():
+    """
+    프로세스 간 적재 잠금 (잡았으면 True, 다른 프로세스가 잡고 있으면 False)
+    """
+    return file_lock(settings.DRUG_AUTOLOAD_LOCK)
+
+
+def bootstrap_catalog():
+    """
+    Drug 테이블이 비어 있으면 목록 적재 → 이미지 단계
+
+    반환값: 적재 결과 dict (이미 데이터가 있거나 다른 프로세스가 적재 중이면 None)
+    """
+    with catalog_lock() as acquired:
+        if not acquired:
+            logger.info("다른 프로세스가 의약품 목록을 적재 중입니다")
+            return None
+        if Drug.objects.exists():
+            return None
+
+        logger.info("🚀 e약은on 의약품 목록 초기 적재 시작")
+        result = ingest_drugs()
+        result['images'] = fetch_missing_images()
+        return result
+
+
+def _run_bootstrap():
+    try:
+        bootstrap_catalog()
+    except Exception:
+        logger.exception("의약품 목록 초기 적재 실패")
+    finally:
+        connection.close()
+
+
+def start_catalog_bootstrap():
+    """
+    백그라운드 스레드에서 bootstrap_catalog 실행
+    (DRUG_AUTOLOAD 가 켜져 있을 때 wsgi.py / asgi.py 에서 호출, 요청 처리를 막지 않음)
+    """
+    thread = threading.Thread(target=_run_bootstrap, name='drug-bootstrap', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,145 @@
+# ingredients/keyword_cache.py
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import SymptomQueryCache
+
+
+# ============================
+# 검색어 정규화
+# ============================
+# "머리가 아파요", "머리가아파요!!", "머리가 아파요ㅠㅠ" 를 같은 키로 본다.
+# - NFKC: 전각 문자 / 호환 자모(ㄱ, ㅏ)를 표준 형태로 바꾸고 분리된 자모를 음절로 합침
+# - 공백 / 구두점 / 밑줄 제거
+# - 덩어리 끝에 붙은 낱자모(ㅠㅠ, ㅋㅋ) 제거 (중간의 낱자모는 다른 말이 될 수 있어 유지)
+_SPLIT_RE = re.compile(r'[\W_]+')
+_JAMO_TAIL_RE = re.compile(r'[\u1100-\u11ff\u3130-\u318f\ua960-\ua97f\ud7b0-\ud7ff]+$')
+
+
+def normalize_query(text, max_length=255):
+    # max_length=None 이면 자르지 않음 (긴 질문을 해시로 구분할 때)
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    chunks = (_JAMO_TAIL_RE.sub('', c) for c in _SPLIT_RE.split(text))
+    return ''.join(chunks)[:max_length]
+
+
+# ============================
+# 적중 / 실패 카운터 (프로세스 단위)
+# ============================
+_stats_lock = threading.Lock()
+_stats = Counter()
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def cache_stats():
+    """
+    {'local_hit', 'db_hit', 'miss'} 누적 횟수
+    """
+    with _stats_lock:
+        return {key: _stats[key] for key in ('local_hit', 'db_hit', 'miss')}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+# ============================
+# 1차: 프로세스 내 LRU
+# ============================
+_local_lock = threading.Lock()
+_local = OrderedDict()   # query → (symptoms, 만료 monotonic 시각)
+
+
+def _local_get(query):
+    with _local_lock:
+        entry = _local.get(query)
+        if entry is None:
+            return None
+        symptoms, expires = entry
+        if expires <= time.monotonic():
+            del _local[query]
+            return None
+        _local.move_to_end(query)
+        return symptoms
+
+
+def _local_set(query, symptoms, ttl):
+    with _local_lock:
+        _local[query] = (symptoms, time.monotonic() + ttl)
+        _local.move_to_end(query)
+        while len(_local) > settings.KEYWORD_CACHE_LOCAL_SIZE:
+            _local.popitem(last=False)
+
+
+def clear_local_cache():
+    with _local_lock:
+        _local.clear()
+
+
+# ============================
+# 조회 / 저장 (LRU → DB)
+# ============================
+def get_cached_symptoms(query):
+    """
+    정규화된 검색어의 증상 리스트 (없거나 만료되면 None)
+    - LRU 에 없으면 DB 를 보고, DB 에 있으면 LRU 에도 올림
+    """
+    if not query:
+        return None
+
+    symptoms = _local_get(query)
+    if symptoms is not None:
+        _count('local_hit')
+        return symptoms
+
+    now = timezone.now()
+    row = (
+        SymptomQueryCache.objects
+        .filter(query=query, expires_at__gt=now)
+        .values_list('symptoms', 'expires_at')
+        .first()
+    )
+    if row is None:
+        _count('miss')
+        return None
+
+    symptoms, expires_at = row
+    SymptomQueryCache.objects.filter(query=query).update(hits=F('hits') + 1)
+    _local_set(
+        query,
+        symptoms,
+        min(settings.KEYWORD_CACHE_LOCAL_TTL, (expires_at - now).total_seconds()),
+    )
+    _count('db_hit')
+    return symptoms
+
+
+def store_symptoms(query, symptoms):
+    """
+    증상 리스트를 DB / LRU 양쪽에 저장 (만료된 행은 덮어씀)
+    """
+    if not query:
+        return
+
+    SymptomQueryCache.objects.update_or_create(
+        query=query,
+        defaults={
+            'symptoms': symptoms,
+            'hits': 0,
+            'expires_at': timezone.now() + timedelta(seconds=settings.KEYWORD_CACHE_TTL),
+        },
+    )
+    _local_set(query, symptoms, settings.KEYWORD_CACHE_LOCAL_TTL)
@@ -0,0 +1,175 @@
+# ingredients/loadtest.py
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+
+# ============================
+# AI API 부하 테스트
+# ============================
+# 실행 중인 서버(보통 목 upstream 에 연결된 runserver)에 동시 요청을 보내고
+# 시나리오별 지연 시간 백분위와 처리량을 잰다.
+SCENARIOS = ('summary', 'chat', 'chat-stream', 'ai-search')
+
+CHAT_QUESTIONS = ['효능', '복용법', '주의사항', '부작용']
+SEARCH_QUERIES = [
+    '머리가 아파요',
+    '열이 나요',
+    '속이 더부룩해요',
+    '밥 먹고 나면 명치가 답답해요',
+    '목이 칼칼하고 기침이 나요',
+    '허리디스크 약',
+]
+
+
+def percentile(values, q):
+    """
+    nearest-rank 백분위 (values 는 정렬된 리스트)
+    """
+    if not values:
+        return None
+    rank = max(1, min(len(values), math.ceil(q / 100 * len(values))))
+    return values[rank - 1]
+
+
+class Recorder:
+    """
+    지표 이름별 지연 시간 / 상태 코드 기록 (스레드 안전)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def add(self, name, elapsed, status):
+        with self._lock:
+            self.statuses[name][status] += 1
+            if elapsed is not None:
+                self.latencies[name].append(elapsed)
+
+    def summary(self, name, wall_seconds):
+        values = sorted(self.latencies[name])
+        statuses = self.statuses[name]
+        total = sum(statuses.values())
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            'requests': total,
+            'ok': sum(n for status, n in statuses.items() if isinstance(status, int) and status < 400),
+            'statuses': dict(statuses),
+            'p50_ms': ms(percentile(values, 50)),
+            'p95_ms': ms(percentile(values, 95)),
+            'p99_ms': ms(percentile(values, 99)),
+            'throughput': round(total / wall_seconds, 2) if wall_seconds else None,
+        }
+
+
+class LoadTest:
+    def __init__(self, base_url, drug_ids, unique=False, poll_summary=True, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.origin = '{0.scheme}://{0.netloc}'.format(urlsplit(self.base_url))
+        self.drug_ids = drug_ids
+        self.unique = unique
+        self.poll_summary = poll_summary
+        self.timeout = timeout
+        self.recorder = Recorder()
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        # 스레드마다 keep-alive 세션 하나
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _drug(self, i):
+        return self.drug_ids[i % len(self.drug_ids)]
+
+    def _question(self, i, choices):
+        question = choices[i % len(choices)]
+        # unique: 답변 / 키워드 캐시를 피하도록 질문마다 번호를 붙임
+        return f'{question} {i}번째 질문' if self.unique else question
+
+    # ---------- 시나리오 ----------
+    def summary(self, i):
+        started = time.monotonic()
+        r = self.session.get(f'{self.base_url}/drugs/{self._drug(i)}/ai-summary/', timeout=self.timeout)
+        self.recorder.add('summary', time.monotonic() - started, r.status_code)
+
+        if r.status_code != 202 or not self.poll_summary:
+            return
+
+        # 202 → 작업이 끝날 때까지 폴링, 요약을 받기까지 걸린 시간 기록
+        data = r.json()
+        while data.get('status') in ('pending', 'running'):
+            time.sleep(data.get('retry_after') or 1)
+            data = self.session.get(self.origin + data['poll_url'], timeout=self.timeout).json()
+        self.recorder.add('summary (ready)', time.monotonic() - started, data.get('status'))
+
+    def chat(self, i):
+        started = time.monotonic()
+        r = self.session.post(
+            f'{self.base_url}/drugs/{self._drug(i)}/chat/',
+            json={'message': self._question(i, CHAT_QUESTIONS)},
+            timeout=self.timeout,
+        )
+        self.recorder.add('chat', time.monotonic() - started, r.status_code)
+
+    def chat_stream(self, i):
+        started = time.monotonic()
+        first = None
+        with self.session.post(
+            f'{self.base_url}/drugs/{self._drug(i)}/chat/?stream=1',
+            json={'message': self._question(i, CHAT_QUESTIONS)},
+            timeout=self.timeout,
+            stream=True,
+        ) as r:
+            for line in r.iter_lines(chunk_size=None, decode_unicode=True):
+                if first is None and line and line.startswith('event: delta'):
+                    first = time.monotonic() - started
+            status = r.status_code
+
+        self.recorder.add('chat-stream (ttft)', first, status)
+        self.recorder.add('chat-stream (total)', time.monotonic() - started, status)
+
+    def ai_search(self, i):
+        started = time.monotonic()
+        r = self.session.get(
+            f'{self.base_url}/drugs/ai-search/',
+            params={'q': self._question(i, SEARCH_QUERIES), 'fields': 'id,name'},
+            timeout=self.timeout,
+        )
+        self.recorder.add('ai-search', time.monotonic() - started, r.status_code)
+
+    # ---------- 실행 ----------
+    def _call(self, fn, name, i):
+        try:
+            fn(i)
+        except requests.RequestException as e:
+            self.recorder.add(name, None, type(e).__name__)
+
+    def run(self, scenario, requests_count, concurrency):
+        """
+        시나리오 하나를 requests_count 번, concurrency 동시성으로 실행
+
+        반환값: {지표 이름: 요약}
+        """
+        fn = getattr(self, scenario.replace('-', '_'))
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda i: self._call(fn, scenario, i), range(requests_count)))
+        wall = time.monotonic() - started
+
+        return {
+            name: self.recorder.summary(name, wall)
+            for name in list(self.recorder.statuses)
+            if name == scenario or name.startswith(scenario + ' ')
+        }
@@ -0,0 +1,32 @@
+# ingredients/locks.py
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# ============================
+# 프로세스 간 파일 잠금
+# ============================
+# 워커 / 관리 커맨드가 여러 프로세스로 떠 있을 때 한 곳에서만 해야 하는 작업
+# (빈 DB 초기 적재, 효능 색인 생성) 을 직렬화한다.
+# 파일을 닫으면 잠금도 풀리므로 프로세스가 죽어도 잠금이 남지 않는다.
+@contextmanager
+def file_lock(path, blocking=False):
+    """
+    잠금을 잡았으면 True, 다른 프로세스가 잡고 있으면 False
+    - blocking=True 면 풀릴 때까지 기다림
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a+') as handle:
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        yield True
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.effect_index import build_effect_index
+
+
+class Command(BaseCommand):
+    help = '의약품 효능 텍스트 벡터 색인(TF-IDF 문자 n-gram)을 다시 만듭니다'
+
+    def handle(self, *args, **options):
+        meta = build_effect_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Effect index built ({meta['drugs']} drugs, {meta['terms']} terms, {meta['seconds']}s)"
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.ingest import fetch_missing_images
+
+
+class Command(BaseCommand):
+    help = 'image_url 은 있지만 이미지 파일이 없는 의약품의 이미지를 받아 저장합니다 (다시 실행하면 이어서 진행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='동시 다운로드 수 (기본 settings.DRUG_IMAGE_WORKERS)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='이번 실행에서 처리할 최대 의약품 수',
+        )
+
+    def handle(self, *args, **options):
+        result = fetch_missing_images(
+            workers=options['workers'],
+            limit=options['limit'],
+            progress=lambda saved, failed: self.stdout.write(f'{saved} saved · {failed} failed'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Drug images saved ({result['saved']} saved, {result['failed']} failed)"
+        ))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.ai_summary import generate_missing_summaries
+
+
+class Command(BaseCommand):
+    help = 'AI 요약이 없는 의약품의 요약을 조회수 순으로 미리 생성합니다 (중단 후 다시 실행하면 이어서 진행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='동시 GPT 호출 수 (기본 settings.AI_SUMMARY_WORKERS)',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=1.0,
+            help='초당 최대 GPT 호출 수 (0 이면 제한 없음, 기본 1)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='한 번에 저장(커밋)할 요약 수 (기본 20)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='이번 실행에서 처리할 최대 의약품 수',
+        )
+
+    def report(self, generated, failed, total, elapsed, existed=0):
+        done = generated + existed + failed
+        rate = done / elapsed if elapsed else 0
+        eta = (total - done) / rate if rate else 0
+        self.stdout.write(
+            f'{done}/{total} ({done / total:.1%}) · 생성 {generated} · 이미 있음 {existed} · 실패 {failed} · '
+            f'{rate:.2f} drugs/s · 남은 시간 약 {eta / 60:.1f}분'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result = generate_missing_summaries(
+                workers=options['workers'],
+                rate=options['rate'],
+                batch_size=options['batch_size'],
+                limit=options['limit'],
+                progress=self.report,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('⚠️ 중단됨 (저장된 배치는 유지, 다시 실행하면 이어서 진행)'))
+            return
+
+        elapsed = result['elapsed']
+        rate = result['generated'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ AI summaries generated ({result['generated']}/{result['total']}, "
+            f"already existed {result['existed']}, failed {result['failed']}, "
+            f"{elapsed:.1f}s, {rate:.2f} drugs/s)"
+        ))
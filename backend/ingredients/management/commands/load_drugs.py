@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ingredients.ingest import catalog_lock, fetch_missing_images, ingest_drugs
+from ingredients.models import Drug
+from ingredients.utils import iter_drug_pages
+
+
+class Command(BaseCommand):
+    help = 'e약은on API 의약품 목록을 페이지 스트림 → 배치 bulk_create 로 적재한 뒤 이미지를 받습니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='동시 페이지 조회 수 (기본 settings.E_DRUG_API_FETCH_WORKERS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='한 번에 저장(커밋)할 의약품 수 (기본 settings.DRUG_INGEST_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--skip-images',
+            action='store_true',
+            help='이미지 단계 생략 (나중에 fetch_drug_images 로 실행)',
+        )
+
+    def handle(self, *args, **options):
+        # DRUG_AUTOLOAD 워커 / 다른 load_drugs 와 동시에 적재하지 않도록 같은 잠금 사용
+        with catalog_lock() as acquired:
+            if not acquired:
+                raise CommandError('다른 프로세스가 의약품 목록을 적재 중입니다.')
+            self.load(options)
+
+    def load(self, options):
+        if Drug.objects.exists():
+            raise CommandError('이미 의약품 데이터가 있습니다. 변경 사항 반영은 sync_drugs, 이미지만 받으려면 fetch_drug_images 를 실행하세요.')
+
+        stats = {}
+        result = ingest_drugs(
+            pages=iter_drug_pages(workers=options['workers'], stats=stats),
+            batch_size=options['batch_size'],
+            progress=lambda count: self.stdout.write(f'{count} drugs saved'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Drugs loaded ({result['drugs']} drugs, {result['batches']} batches, {result['seconds']}s, "
+            f"{stats.get('pages')} pages @ {stats.get('pages_per_second')} pages/s)"
+        ))
+
+        if options['skip_images']:
+            return
+
+        images = fetch_missing_images(progress=lambda saved, failed: self.stdout.write(f'{saved} images saved'))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Drug images saved ({images['saved']} saved, {images['failed']} failed)"
+        ))
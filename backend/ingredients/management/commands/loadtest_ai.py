@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ingredients.loadtest import SCENARIOS, LoadTest
+from ingredients.models import Drug
+
+
+class Command(BaseCommand):
+    help = (
+        'AI API(요약 / 챗봇 / 챗봇 스트리밍 / AI 검색)에 동시 요청을 보내 '
+        'p50 / p95 / p99 지연 시간과 처리량을 측정합니다 (mock_upstream 과 함께 사용)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000/api', help='대상 서버 API 주소')
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            choices=SCENARIOS,
+            dest='scenarios',
+            help='실행할 시나리오 (여러 번 지정 가능, 기본 전체)',
+        )
+        parser.add_argument('--requests', type=int, default=50, help='시나리오별 요청 수 (기본 50)')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수 (기본 8)')
+        parser.add_argument('--drugs', type=int, default=20, help='요청에 돌려 쓸 의약품 수 (조회수 상위, 기본 20)')
+        parser.add_argument('--unique', action='store_true', help='질문 / 검색어를 매번 다르게 해서 캐시를 피함')
+        parser.add_argument('--no-poll', action='store_true', help='요약 202 응답 후 완료까지 폴링하지 않음')
+
+    def handle(self, *args, **options):
+        drug_ids = list(
+            Drug.objects.order_by('-view_count', '-id').values_list('id', flat=True)[:options['drugs']]
+        )
+        if not drug_ids:
+            raise CommandError('의약품이 없습니다. 먼저 의약품 데이터를 불러오세요.')
+
+        test = LoadTest(
+            options['base_url'],
+            drug_ids,
+            unique=options['unique'],
+            poll_summary=not options['no_poll'],
+        )
+
+        header = f"{'metric':<22}{'n':>6}{'ok':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}  statuses"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for scenario in options['scenarios'] or SCENARIOS:
+            results = test.run(scenario, options['requests'], options['concurrency'])
+            for name, r in results.items():
+                self.stdout.write(
+                    f"{name:<22}{r['requests']:>6}{r['ok']:>6}"
+                    f"{r['p50_ms'] or '-':>10}{r['p95_ms'] or '-':>10}{r['p99_ms'] or '-':>10}"
+                    f"{r['throughput'] or '-':>9}  {r['statuses']}"
+                )
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.mock_upstream import MockUpstreamConfig, start_mock_upstream
+
+
+class Command(BaseCommand):
+    help = (
+        'GMS(/chat/completions, /responses) 와 e약은요 목록 API 를 흉내 내는 로컬 목 서버를 띄웁니다 '
+        '(OPENAI_BASE_URL=http://127.0.0.1:<port>/v1, E_DRUG_API_URL=http://127.0.0.1:<port>/getDrbEasyDrugList)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8900)
+        parser.add_argument('--latency', type=float, default=0.5, help='응답 전 대기 시간(초, 기본 0.5)')
+        parser.add_argument('--jitter', type=float, default=0.0, help='대기 시간에 더할 무작위 범위(초)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='500 / 429 응답 비율 (0 ~ 1)')
+        parser.add_argument('--stream-chunks', type=int, default=20, help='챗봇 답변 조각 수')
+        parser.add_argument('--chunk-delay', type=float, default=0.05, help='조각 사이 대기 시간(초)')
+        parser.add_argument('--drugs', type=int, default=1000, help='목록 API 전체 의약품 수')
+
+    def handle(self, *args, **options):
+        config = MockUpstreamConfig(
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            stream_chunks=options['stream_chunks'],
+            chunk_delay=options['chunk_delay'],
+            drugs=options['drugs'],
+        )
+        server = start_mock_upstream(options['host'], options['port'], config, background=False)
+        base = f"http://{options['host']}:{server.server_port}"
+        self.stdout.write(self.style.SUCCESS(f'🚀 Mock upstream listening on {base}'))
+        self.stdout.write(f'   OPENAI_BASE_URL={base}/v1')
+        self.stdout.write(f'   E_DRUG_API_URL={base}/getDrbEasyDrugList')
+        self.stdout.write(f'   {config}')
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
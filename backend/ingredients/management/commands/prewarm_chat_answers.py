@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.chat import CHAT_SUGGESTIONS
+from ingredients.chat_cache import evict_answers, prewarm_answers
+from ingredients.models import Drug
+
+
+class Command(BaseCommand):
+    help = '조회수 상위 의약품의 추천 질문(효능 / 복용법 / 주의사항 / 부작용) 챗봇 답변을 미리 만들어 캐시합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--drug',
+            type=int,
+            action='append',
+            dest='drug_ids',
+            help='특정 의약품 id 만 처리 (여러 번 지정 가능)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=100,
+            help='조회수 상위 몇 개 의약품을 처리할지 (기본 100, --drug 지정 시 무시)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='동시 모델 호출 수 (기본 4)',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=1.0,
+            help='초당 최대 모델 호출 수 (0 이면 제한 없음, 기본 1)',
+        )
+
+    def handle(self, *args, **options):
+        # 만료 / 초과 답변 먼저 정리
+        evicted = evict_answers()
+
+        drugs = Drug.objects.only('id', 'name', 'effect', 'usage', 'warning')
+        if options['drug_ids']:
+            drugs = drugs.filter(pk__in=options['drug_ids'])
+        else:
+            drugs = drugs.order_by('-view_count', '-id')[:options['top']]
+
+        result = prewarm_answers(
+            list(drugs),
+            questions=CHAT_SUGGESTIONS,
+            workers=options['workers'],
+            rate=options['rate'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Chat answers prewarmed (generated {result['generated']}, "
+            f"already cached {result['cached']}, failed {result['failed']}, evicted {evicted})"
+        ))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.stats import rebuild_drug_stats
+
+
+class Command(BaseCommand):
+    help = '댓글 / 반응 테이블로부터 DrugStats 를 다시 계산합니다 (복구 / 백필)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--drug',
+            type=int,
+            action='append',
+            dest='drug_ids',
+            help='특정 의약품 id 만 재계산 (여러 번 지정 가능)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='bulk upsert 배치 크기 (기본 500)',
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_drug_stats(
+            drug_ids=options['drug_ids'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ DrugStats rebuilt ({count} drugs)'))
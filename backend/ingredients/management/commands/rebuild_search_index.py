@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.search import fts_available, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = '의약품 이름 / 효능 전문 검색(FTS5) 색인을 다시 만듭니다'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING('⚠️ FTS5 색인을 사용할 수 없는 DB 입니다 (icontains 검색 사용)'))
+            return
+
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'✅ Search index rebuilt ({count} drugs)'))
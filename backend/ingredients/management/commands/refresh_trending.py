@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from ingredients.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = '기간별(24h / 7d / 30d) 인기 의약품 TOP-K 를 다시 계산합니다 (cron 등 주기 실행용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=None,
+            help='기간별 저장할 순위 수 (기본 settings.TRENDING_TOP_K)',
+        )
+        parser.add_argument(
+            '--no-prune',
+            action='store_true',
+            help='오래된 시간별 조회수 버킷을 삭제하지 않음',
+        )
+
+    def handle(self, *args, **options):
+        result = refresh_trending(k=options['top_k'], prune=not options['no_prune'])
+        summary = ', '.join(f'{window}={count}' for window, count in result.items())
+        self.stdout.write(self.style.SUCCESS(f'✅ Trending refreshed ({summary})'))
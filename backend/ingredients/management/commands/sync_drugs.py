@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ingredients.ingest import catalog_lock, fetch_missing_images, sync_drugs
+from ingredients.utils import iter_drug_pages
+
+
+class Command(BaseCommand):
+    help = 'e약은on 목록과 의약품 테이블을 itemSeq 기준으로 동기화합니다 (바뀐 행만 추가 / 갱신, 사라진 행은 removed_at 표시)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='동시 페이지 조회 수 (기본 settings.E_DRUG_API_FETCH_WORKERS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='한 번에 비교 / 저장할 항목 수 (기본 settings.DRUG_INGEST_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--skip-images',
+            action='store_true',
+            help='새로 추가되거나 주소가 바뀐 이미지 받기 생략',
+        )
+
+    def handle(self, *args, **options):
+        # 초기 적재(DRUG_AUTOLOAD 워커 / load_drugs) 나 다른 sync_drugs 와 겹치지 않도록 같은 잠금 사용
+        with catalog_lock() as acquired:
+            if not acquired:
+                raise CommandError('다른 프로세스가 의약품 목록을 적재 / 동기화 중입니다.')
+            self.sync(options)
+
+    def sync(self, options):
+        stats = {}
+        result = sync_drugs(
+            pages=iter_drug_pages(workers=options['workers'], stats=stats),
+            batch_size=options['batch_size'],
+            stats=stats,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Drugs synced (inserted {result['inserted']}, updated {result['updated']}, "
+            f"unchanged {result['unchanged']}, removed {result['removed']}, {result['seconds']}s)"
+        ))
+        if not result['complete']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ 전체 목록({stats.get('total')}건)을 다 받지 못해 삭제 표시를 건너뛰었습니다"
+            ))
+
+        if options['skip_images'] or not (result['inserted'] or result['updated']):
+            return
+
+        images = fetch_missing_images()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Drug images saved ({images['saved']} saved, {images['failed']} failed)"
+        ))
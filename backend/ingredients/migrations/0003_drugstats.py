@@ -0,0 +1,72 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_drug_stats(apps, schema_editor):
+    # 기존 댓글 / 반응으로 통계 행 채우기
+    Drug = apps.get_model('ingredients', 'Drug')
+    DrugComment = apps.get_model('ingredients', 'DrugComment')
+    DrugReaction = apps.get_model('ingredients', 'DrugReaction')
+    DrugStats = apps.get_model('ingredients', 'DrugStats')
+
+    comments = {
+        row['drug_id']: row
+        for row in DrugComment.objects.values('drug_id').annotate(
+            comment_count=models.Count('id'),
+            rating_sum=models.Sum('rating', default=0),
+            rating_count=models.Count('rating'),
+        )
+    }
+    reactions = {}
+    for row in DrugReaction.objects.values('drug_id', 'reaction').annotate(count=models.Count('id')):
+        reactions.setdefault(row['drug_id'], {})[row['reaction']] = row['count']
+
+    stats = []
+    for drug_id in Drug.objects.values_list('pk', flat=True):
+        c = comments.get(drug_id, {})
+        r = reactions.get(drug_id, {})
+        rating_sum = c.get('rating_sum', 0)
+        rating_count = c.get('rating_count', 0)
+        helpful = r.get('helpful', 0)
+        unhelpful = r.get('unhelpful', 0)
+        stats.append(DrugStats(
+            drug_id=drug_id,
+            comment_count=c.get('comment_count', 0),
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            avg_rating=rating_sum / rating_count if rating_count else None,
+            helpful_count=helpful,
+            unhelpful_count=unhelpful,
+            helpful_ratio=100.0 * helpful / (helpful + unhelpful) if helpful + unhelpful else None,
+        ))
+    DrugStats.objects.bulk_create(stats, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0002_drug_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrugStats',
+            fields=[
+                ('drug', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='ingredients.drug')),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('avg_rating', models.FloatField(blank=True, null=True)),
+                ('helpful_count', models.PositiveIntegerField(default=0)),
+                ('unhelpful_count', models.PositiveIntegerField(default=0)),
+                ('helpful_ratio', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-helpful_ratio', '-drug'], name='drugstats_helpful_idx'), models.Index(fields=['-avg_rating', '-drug'], name='drugstats_rating_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_drug_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'ingredients_drug_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    # FTS5 는 SQLite 전용 (다른 DB 에서는 icontains 검색으로 대체)
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    from ingredients.search import to_ngrams
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(name, effect, tokenize='unicode61 remove_diacritics 0')"
+    )
+
+    Drug = apps.get_model('ingredients', 'Drug')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, effect) VALUES (%s, %s, %s)',
+            [
+                (pk, to_ngrams(name), to_ngrams(effect))
+                for pk, name, effect in Drug.objects.values_list('id', 'name', 'effect')
+            ],
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0003_drugstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0004_drug_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrugViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('drug', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='ingredients.drug')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='drugviewbucket_hour_idx')],
+                'unique_together': {('drug', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingDrug',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=8)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+                ('drug', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_entries', to='ingredients.drug')),
+            ],
+            options={
+                'unique_together': {('window', 'rank')},
+            },
+        ),
+    ]
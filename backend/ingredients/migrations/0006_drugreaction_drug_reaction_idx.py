@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0005_trending'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drugreaction',
+            index=models.Index(fields=['drug', 'reaction'], name='drugreaction_drug_reaction_idx'),
+        ),
+    ]
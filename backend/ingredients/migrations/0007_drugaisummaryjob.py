@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0006_drugreaction_drug_reaction_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrugAiSummaryJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '생성 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('drug', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ai_summary_jobs', to='ingredients.drug')),
+            ],
+        ),
+    ]
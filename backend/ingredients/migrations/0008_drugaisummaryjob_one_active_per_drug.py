@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0007_drugaisummaryjob'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='drugaisummaryjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('drug',), name='drugaisummaryjob_one_active_per_drug'),
+        ),
+    ]
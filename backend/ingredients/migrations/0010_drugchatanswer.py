@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0009_symptomquerycache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrugChatAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=16)),
+                ('question', models.CharField(max_length=255)),
+                ('answer', models.TextField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_used_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField()),
+                ('drug', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_answers', to='ingredients.drug')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='drugchatanswer_used_idx')],
+                'unique_together': {('drug', 'version', 'question')},
+            },
+        ),
+    ]
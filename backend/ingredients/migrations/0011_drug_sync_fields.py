@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0010_drugchatanswer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drug',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='drug',
+            name='item_seq',
+            field=models.CharField(blank=True, max_length=20, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='drug',
+            name='removed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
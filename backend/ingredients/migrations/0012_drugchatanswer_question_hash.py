@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:12
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_question_hash(apps, schema_editor):
+    # 255자보다 짧은 질문은 잘리지 않은 전체 질문이므로 그대로 해시
+    # 255자에 걸린 질문은 원래 질문을 알 수 없어 삭제 (다음 질문 때 새로 생성)
+    DrugChatAnswer = apps.get_model('ingredients', 'DrugChatAnswer')
+    DrugChatAnswer.objects.filter(question__regex=r'^.{255}$').delete()
+    for answer in DrugChatAnswer.objects.only('id', 'question').iterator():
+        answer.question_hash = hashlib.sha256(answer.question.encode()).hexdigest()
+        answer.save(update_fields=['question_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0011_drug_sync_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drugchatanswer',
+            name='question_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_question_hash, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='drugchatanswer',
+            unique_together={('drug', 'version', 'question_hash')},
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+
+def drop_all_window_snapshot(apps, schema_editor):
+    # 전체 기간(all) 은 이제 Drug.view_count 로 바로 읽으므로 예전 스냅샷 삭제
+    TrendingDrug = apps.get_model('ingredients', 'TrendingDrug')
+    TrendingDrug.objects.filter(window='all').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0012_drugchatanswer_question_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='drug',
+            index=models.Index(fields=['view_count', 'id'], name='drug_view_count_idx'),
+        ),
+        migrations.RunPython(drop_all_window_snapshot, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:05
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def create_missing_stats(apps, schema_editor):
+    # 목록 정렬이 DrugStats 를 INNER JOIN 하므로 통계 행이 없던 의약품(일괄 적재분)에 행 생성
+    # 관리자 화면 등으로 들어간 댓글 / 반응이 있을 수 있어 0 이 아니라 실제 개수로 채움
+    Drug = apps.get_model('ingredients', 'Drug')
+    DrugComment = apps.get_model('ingredients', 'DrugComment')
+    DrugReaction = apps.get_model('ingredients', 'DrugReaction')
+    DrugStats = apps.get_model('ingredients', 'DrugStats')
+
+    missing = Drug.objects.filter(stats__isnull=True).values('pk')
+
+    comments = {
+        row['drug_id']: row
+        for row in DrugComment.objects.filter(drug_id__in=missing).values('drug_id').annotate(
+            comment_count=Count('id'),
+            rating_sum=Sum('rating', default=0),
+            rating_count=Count('rating'),
+        )
+    }
+    reactions = {}
+    for row in DrugReaction.objects.filter(drug_id__in=missing).values('drug_id', 'reaction').annotate(count=Count('id')):
+        reactions.setdefault(row['drug_id'], {})[row['reaction']] = row['count']
+
+    stats = []
+    for drug_id in missing.values_list('pk', flat=True).iterator():
+        c = comments.get(drug_id, {})
+        r = reactions.get(drug_id, {})
+        rating_sum = c.get('rating_sum', 0)
+        rating_count = c.get('rating_count', 0)
+        helpful = r.get('helpful', 0)
+        unhelpful = r.get('unhelpful', 0)
+        stats.append(DrugStats(
+            drug_id=drug_id,
+            comment_count=c.get('comment_count', 0),
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            avg_rating=rating_sum / rating_count if rating_count else None,
+            helpful_count=helpful,
+            unhelpful_count=unhelpful,
+            helpful_ratio=100.0 * helpful / (helpful + unhelpful) if helpful + unhelpful else None,
+        ))
+
+    DrugStats.objects.bulk_create(stats, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredients', '0013_drug_view_count_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,237 @@
+# ingredients/mock_upstream.py
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+
+# ============================
+# 로컬 목 upstream 서버
+# ============================
+# 실제 GMS 프록시 / e약은요 API 대신 띄워 두고 부하 테스트에 쓴다.
+#   OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+#   E_DRUG_API_URL=http://127.0.0.1:8900/getDrbEasyDrugList
+# - POST .../chat/completions : AI 요약 / 증상 키워드 추출 응답 형태
+# - POST .../responses        : 챗봇 응답 (stream=true 면 SSE)
+# - GET  .../getDrbEasyDrugList : 의약품 목록 페이지 (pageNo / numOfRows)
+# - GET  /images/<n>.jpg      : 의약품 이미지
+@dataclass
+class MockUpstreamConfig:
+    latency: float = 0.5         # 응답 전 대기 시간 (초)
+    jitter: float = 0.0          # 대기 시간에 더할 무작위 범위 (0 ~ jitter 초)
+    error_rate: float = 0.0      # 이 비율만큼 500 / 429 응답
+    stream_chunks: int = 20      # 스트리밍 답변 조각 수
+    chunk_delay: float = 0.05    # 조각 사이 대기 시간 (초)
+    drugs: int = 1000            # 목록 API 전체 의약품 수
+    image_every: int = 3         # n 번째 의약품마다 이미지 URL 포함 (0 이면 없음)
+
+
+_EFFECTS = [
+    '두통, 치통, 발열, 생리통의 완화',
+    '소화불량, 식욕감퇴, 과식, 체함, 소화촉진',
+    '감기의 제증상(콧물, 코막힘, 재채기, 기침, 가래, 오한, 발열, 두통, 인후통, 근육통)의 완화',
+    '위산과다, 속쓰림, 위부불쾌감, 위통',
+    '설사, 복통, 배탈',
+    '근육통, 관절통, 요통, 타박상',
+]
+
+_SYMPTOMS = ['두통', '발열', '복통', '소화불량', '기침', '인후통', '근육통', '속쓰림']
+
+
+def _jpeg():
+    # 1x1 흰색 JPEG
+    buffer = BytesIO()
+    Image.new('RGB', (1, 1), 'white').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+_IMAGE = _jpeg()
+
+
+def drug_item(n, host, config):
+    """
+    목록 API 의 n 번째(1부터) 의약품
+    """
+    return {
+        'itemSeq': str(200000000 + n),
+        'itemName': f'모의약품{n}정',
+        'efcyQesitm': f'이 약은 {_EFFECTS[n % len(_EFFECTS)]}에 사용합니다.',
+        'useMethodQesitm': '성인 1회 1정, 1일 3회 식후에 복용합니다.',
+        'atpnWarnQesitm': '복용 전 의사 또는 약사와 상의하십시오.',
+        'itemImage': (
+            f'http://{host}/images/{n}.jpg'
+            if config.image_every and n % config.image_every == 0 else None
+        ),
+    }
+
+
+def make_handler(config):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        # ---------- 공통 ----------
+        def _wait(self):
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+
+        def _maybe_fail(self):
+            if config.error_rate and random.random() < config.error_rate:
+                status = random.choice([500, 429])
+                self._send_json({'error': {'message': 'mock failure'}}, status=status)
+                return True
+            return False
+
+        def _send_json(self, data, status=200):
+            body = json.dumps(data, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        # ---------- 라우팅 ----------
+        def do_GET(self):
+            url = urlparse(self.path)
+            try:
+                if url.path.endswith('/getDrbEasyDrugList'):
+                    self._drug_list(parse_qs(url.query))
+                elif re.fullmatch(r'/images/\d+\.jpg', url.path):
+                    self._image()
+                else:
+                    self._send_json({'error': 'not found'}, status=404)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            try:
+                body = self._read_json()
+                if path.endswith('/chat/completions'):
+                    self._chat_completions(body)
+                elif path.endswith('/responses'):
+                    self._responses(body)
+                else:
+                    self._send_json({'error': 'not found'}, status=404)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        # ---------- e약은요 ----------
+        def _drug_list(self, query):
+            self._wait()
+            if self._maybe_fail():
+                return
+
+            page = int(query.get('pageNo', ['1'])[0])
+            rows = int(query.get('numOfRows', ['10'])[0])
+            start = (page - 1) * rows + 1
+            end = min(config.drugs, start + rows - 1)
+            host = self.headers.get('Host', '127.0.0.1')
+
+            self._send_json({
+                'header': {'resultCode': '00', 'resultMsg': 'NORMAL SERVICE.'},
+                'body': {
+                    'pageNo': page,
+                    'numOfRows': rows,
+                    'totalCount': config.drugs,
+                    'items': [drug_item(n, host, config) for n in range(start, end + 1)],
+                },
+            })
+
+        def _image(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(_IMAGE)))
+            self.end_headers()
+            self.wfile.write(_IMAGE)
+
+        # ---------- /chat/completions ----------
+        def _chat_completions(self, body):
+            self._wait()
+            if self._maybe_fail():
+                return
+
+            prompt = ' '.join(m.get('content', '') for m in body.get('messages', []))
+            if 'one_liner' in prompt:
+                content = {
+                    'one_liner': '목 서버가 만든 요약입니다.',
+                    'easy_explain': '부하 테스트용 설명입니다.',
+                    'key_points': ['식후 복용'],
+                    'cautions': ['과다 복용 주의'],
+                    'when_to_see_doctor': ['증상이 계속될 때'],
+                }
+            else:
+                content = {'symptoms': random.sample(_SYMPTOMS, 2)}
+
+            self._send_json({
+                'object': 'chat.completion',
+                'model': body.get('model'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': json.dumps(content, ensure_ascii=False)},
+                    'finish_reason': 'stop',
+                }],
+            })
+
+        # ---------- /responses ----------
+        def _responses(self, body):
+            chunks = [f'목 답변 {i + 1}. ' for i in range(config.stream_chunks)]
+
+            if not body.get('stream'):
+                # 블로킹 호출은 전체 생성 시간만큼 기다림
+                self._wait()
+                time.sleep(config.chunk_delay * len(chunks))
+                if self._maybe_fail():
+                    return
+                self._send_json({'output': [{
+                    'type': 'message',
+                    'role': 'assistant',
+                    'content': [{'type': 'output_text', 'text': ''.join(chunks)}],
+                }]})
+                return
+
+            self._wait()
+            if self._maybe_fail():
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            events = [{'type': 'response.output_text.delta', 'delta': c} for c in chunks]
+            events.append({'type': 'response.completed'})
+            for i, event in enumerate(events):
+                if i:
+                    time.sleep(config.chunk_delay)
+                data = f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode()
+                self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+
+    return Handler
+
+
+def start_mock_upstream(host='127.0.0.1', port=0, config=None, background=True):
+    """
+    목 서버 시작
+
+    반환값: ThreadingHTTPServer (server.server_port 로 포트 확인, shutdown() 으로 종료)
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(config or MockUpstreamConfig()))
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -28,6 +28,21 @@ class Drug(models.Model):
     # 조회수
     view_count = models.PositiveIntegerField(default=0)
 
+    # e약은요 품목기준코드 (itemSeq, 동기화 기준 키)
+    item_seq = models.CharField(max_length=20, unique=True, null=True, blank=True)
+
+    # 동기화 대상 필드 해시 (바뀐 행만 갱신)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+
+    # e약은요 목록에서 사라진 시각 (목록 / 검색에서 제외)
+    removed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # 전체 기간 인기순(조회수, id 내림차순) TOP-K 조회용 인덱스
+        indexes = [
+            models.Index(fields=['view_count', 'id'], name='drug_view_count_idx'),
+        ]
+
     def __str__(self):
         # 관리자/쉘에서 의약품 이름으로 표시
         return self.name
@@ -94,6 +109,10 @@ class DrugReaction(models.Model):
     class Meta:
         # 한 사용자는 하나의 의약품에 하나의 반응만 가능
         unique_together = ('user', 'drug')
+        # 의약품별 반응 개수 재계산용 인덱스
+        indexes = [
+            models.Index(fields=['drug', 'reaction'], name='drugreaction_drug_reaction_idx'),
+        ]
 
 
 # ==================================================
@@ -124,3 +143,208 @@ class DrugAiSummary(models.Model):
 
     # 마지막 업데이트 시각
     updated_at = models.DateTimeField(auto_now=True)
+
+
+# ==================================================
+# ⭐ 의약품 통계 모델 (댓글 / 별점 / 반응 집계)
+# ==================================================
+class DrugStats(models.Model):
+    # 의약품과 1:1 관계 (drug_id 를 그대로 PK 로 사용)
+    drug = models.OneToOneField(
+        Drug,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+
+    # 댓글 수
+    comment_count = models.PositiveIntegerField(default=0)
+
+    # 별점 합계 / 별점이 있는 댓글 수
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+
+    # 별점 평균 (rating_sum / rating_count, 별점이 없으면 NULL)
+    avg_rating = models.FloatField(null=True, blank=True)
+
+    # 도움됨 / 도움 안됨 개수
+    helpful_count = models.PositiveIntegerField(default=0)
+    unhelpful_count = models.PositiveIntegerField(default=0)
+
+    # 도움 비율 (0~100, 반응이 없으면 NULL)
+    helpful_ratio = models.FloatField(null=True, blank=True)
+
+    # 마지막 갱신 시각
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # 목록 정렬(도움순 / 평점순)용 인덱스
+        indexes = [
+            models.Index(fields=['-helpful_ratio', '-drug'], name='drugstats_helpful_idx'),
+            models.Index(fields=['-avg_rating', '-drug'], name='drugstats_rating_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.drug_id} stats'
+
+
+# ==================================================
+# ⭐ 의약품 시간별 조회수 (트렌딩 집계용)
+# ==================================================
+class DrugViewBucket(models.Model):
+    # 조회 대상 의약품
+    drug = models.ForeignKey(
+        Drug,
+        on_delete=models.CASCADE,
+        related_name='view_buckets'
+    )
+
+    # 시간 단위로 내림한 시각 (예: 13:00)
+    hour = models.DateTimeField()
+
+    # 해당 시간대 조회수
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # 의약품 + 시간대마다 한 행
+        unique_together = ('drug', 'hour')
+        indexes = [
+            models.Index(fields=['hour'], name='drugviewbucket_hour_idx'),
+        ]
+
+
+# ==================================================
+# ⭐ 기간별 인기 의약품 TOP-K (주기 작업으로 미리 계산)
+# ==================================================
+class TrendingDrug(models.Model):
+    # 집계 기간 ('24h', '7d', '30d', 'all')
+    window = models.CharField(max_length=8)
+
+    # 순위 (1부터)
+    rank = models.PositiveSmallIntegerField()
+
+    # 의약품
+    drug = models.ForeignKey(
+        Drug,
+        on_delete=models.CASCADE,
+        related_name='trending_entries'
+    )
+
+    # 기간 내 조회수
+    views = models.PositiveIntegerField(default=0)
+
+    # 계산 시각
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        # 기간마다 순위는 하나
+        unique_together = ('window', 'rank')
+
+
+# ==================================================
+# ⭐ 의약품 AI 요약 생성 작업 (백그라운드 처리 상태)
+# ==================================================
+class DrugAiSummaryJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    # 요약을 생성할 의약품
+    drug = models.ForeignKey(
+        Drug,
+        on_delete=models.CASCADE,
+        related_name='ai_summary_jobs'
+    )
+
+    # 작업 상태
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (STATUS_PENDING, '대기'),
+            (STATUS_RUNNING, '생성 중'),
+            (STATUS_DONE, '완료'),
+            (STATUS_FAILED, '실패'),
+        ],
+        default=STATUS_PENDING
+    )
+
+    # 시도 횟수 (재시도 포함)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    # 마지막 실패 메시지
+    error = models.TextField(blank=True, default='')
+
+    # 생성 / 마지막 갱신 시각
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # 의약품마다 대기 / 생성 중인 작업은 하나 (동시 요청이 GPT 를 중복 호출하지 않도록)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['drug'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='drugaisummaryjob_one_active_per_drug',
+            ),
+        ]
+
+
+# ==================================================
+# ⭐ 증상 키워드 추출 캐시 (정규화된 검색어 → 증상 리스트)
+# ==================================================
+class SymptomQueryCache(models.Model):
+    # 정규화된 검색어 (공백 / 구두점 제거, 자모 정규화)
+    query = models.CharField(max_length=255, unique=True)
+
+    # AI 가 추출한 증상 키워드 리스트
+    symptoms = models.JSONField(default=list)
+
+    # 캐시 적중 횟수
+    hits = models.PositiveIntegerField(default=0)
+
+    # 생성 / 만료 시각
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.query} → {self.symptoms}'
+
+
+# ==================================================
+# ⭐ 챗봇 답변 캐시 (의약품 + 정보 버전 + 정규화된 질문 → 답변)
+# ==================================================
+class DrugChatAnswer(models.Model):
+    drug = models.ForeignKey(
+        Drug,
+        on_delete=models.CASCADE,
+        related_name='chat_answers'
+    )
+
+    # 답변을 만들 때의 의약품 정보 / 프롬프트 해시
+    version = models.CharField(max_length=16)
+
+    # 정규화된 질문 (앞 255자, 표시용)
+    question = models.CharField(max_length=255)
+
+    # 정규화된 질문 전체의 sha256 (캐시 키, 앞부분이 같은 긴 질문끼리 섞이지 않도록)
+    question_hash = models.CharField(max_length=64)
+
+    answer = models.TextField()
+
+    # 캐시 적중 횟수 / 마지막 사용 시각 (오래 안 쓴 답변부터 정리)
+    hits = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField()
+
+    # 생성 / 만료 시각
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('drug', 'version', 'question_hash')
+        indexes = [
+            models.Index(fields=['last_used_at'], name='drugchatanswer_used_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.drug_id} {self.question}'
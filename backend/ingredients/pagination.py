@@ -0,0 +1,95 @@
+# ingredients/pagination.py
+import base64
+import json
+
+from django.db.models import F, Q
+
+
+class InvalidCursor(Exception):
+    """커서 문자열을 해석할 수 없을 때 발생"""
+
+
+# ============================
+# 커서 인코딩 / 디코딩
+# ============================
+def encode_cursor(value, pk):
+    """
+    마지막 행의 (정렬 값, id)를 URL-safe 문자열로 변환
+    """
+    raw = json.dumps([value, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    encode_cursor 로 만든 문자열을 (정렬 값, id) 로 복원
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+    if not isinstance(pk, int) or not (value is None or isinstance(value, (int, float))):
+        raise InvalidCursor(cursor)
+
+    return value, pk
+
+
+# ============================
+# 키셋 정렬 / 페이지네이션
+# ============================
+def keyset_order_by(order_field=None, pk_field='id'):
+    """
+    (정렬 필드 DESC NULLS LAST, pk_field DESC) 정렬식
+    - id 를 항상 보조 정렬로 두어 같은 값끼리도 순서가 고정됨
+    - 정렬 필드가 JOIN 한 테이블에 있으면 pk_field 로 그 테이블의 키를 주어야
+      (값, 키) 인덱스 순서대로 읽고 따로 정렬하지 않음
+    """
+    if order_field is None:
+        return [f'-{pk_field}']
+    return [F(order_field).desc(nulls_last=True), f'-{pk_field}']
+
+
+def _after(order_field, value, pk, pk_field='id'):
+    before_pk = Q(**{f'{pk_field}__lt': pk})
+
+    # 정렬 필드가 없으면 id 만으로 다음 위치를 결정
+    if order_field is None:
+        return before_pk
+
+    # NULL 은 맨 뒤에 오므로 NULL 구간 안에서는 id 로만 이어짐
+    if value is None:
+        return Q(**{f'{order_field}__isnull': True}) & before_pk
+
+    return (
+        Q(**{f'{order_field}__lt': value})
+        | (Q(**{order_field: value}) & before_pk)
+        | Q(**{f'{order_field}__isnull': True})
+    )
+
+
+def keyset_paginate(queryset, order_field=None, cursor=None, page_size=20, pk_field='id'):
+    """
+    OFFSET 없이 (정렬 값, id) 위치 이후의 한 페이지만 조회
+    - pk_field 는 keyset_order_by 와 같음 (값은 항상 행의 id 와 같아야 함)
+
+    반환값: (해당 페이지 객체 리스트, 다음 페이지 커서 또는 None)
+    """
+    queryset = queryset.order_by(*keyset_order_by(order_field, pk_field))
+
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(_after(order_field, value, pk, pk_field))
+
+    # 한 건 더 가져와서 다음 페이지 존재 여부 판단
+    rows = list(queryset[:page_size + 1])
+    page = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last = page[-1]
+        value = getattr(last, order_field) if order_field else None
+        next_cursor = encode_cursor(value, last.pk)
+
+    return page, next_cursor
@@ -0,0 +1,66 @@
+# ingredients/querysets.py
+from django.db.models import F, Prefetch
+
+from .models import DrugComment
+
+
+# Prefetch 결과를 담는 속성 이름 (잘라낸 queryset 은 to_attr 로만 prefetch 가능)
+PREFETCHED_COMMENTS = 'latest_comments'
+
+
+# ============================
+# 댓글 Prefetch 계획
+# ============================
+def comments_prefetch(limit=None):
+    """
+    의약품 댓글 + 작성자를 의약품 수와 상관없이 쿼리 1번으로 가져오는 Prefetch
+    - 작성자는 select_related 로 같은 쿼리에서 JOIN (UserSerializer 필드만)
+    - limit 이 있으면 의약품별 최신 limit 개만 (ROW_NUMBER 윈도 함수)
+    """
+    comments = (
+        DrugComment.objects
+        .select_related('author')
+        .only(
+            'id',
+            'drug',
+            'content',
+            'rating',
+            'created_at',
+            'author__id',
+            'author__username',
+            'author__nickname',
+        )
+        .order_by('-created_at', '-id')
+    )
+    if limit:
+        comments = comments[:limit]
+
+    return Prefetch('comments', queryset=comments, to_attr=PREFETCHED_COMMENTS)
+
+
+def parse_comments_limit(query_params):
+    """
+    ?comments_limit=N → 양의 정수 또는 None (전체)
+    """
+    try:
+        limit = int(query_params.get('comments_limit', ''))
+    except ValueError:
+        return None
+    return limit if limit > 0 else None
+
+
+# ============================
+# 통계 컬럼
+# ============================
+def with_stats(queryset):
+    """
+    DrugStats 에 미리 계산된 별점 / 반응 통계를 붙임 (집계 없이 1:1 JOIN)
+    - 모든 의약품에 통계 행이 있으므로 INNER JOIN
+      (도움순 / 평점순 정렬 때 DrugStats 인덱스 순서대로 읽을 수 있음)
+    """
+    return queryset.filter(stats__isnull=False).annotate(
+        avg_rating=F('stats__avg_rating'),
+        helpful_count=F('stats__helpful_count'),
+        unhelpful_count=F('stats__unhelpful_count'),
+        helpful_ratio=F('stats__helpful_ratio'),
+    )
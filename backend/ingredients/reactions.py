@@ -0,0 +1,89 @@
+# ingredients/reactions.py
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Drug, DrugReaction
+from .stats import recount_reactions
+
+
+_REACTION_TABLE = DrugReaction._meta.db_table
+_DRUG_TABLE = Drug._meta.db_table
+
+# 반응 upsert (문장 1개)
+# - 의약품이 없으면 SELECT 결과가 없어 아무것도 삽입되지 않음 → 빈 결과로 404 판단
+# - (user_id, drug_id) unique_together 충돌 시 reaction 만 교체
+_UPSERT_SQL = (
+    f'INSERT INTO {_REACTION_TABLE} (user_id, drug_id, reaction, created_at) '
+    f'SELECT %s, id, %s, %s FROM {_DRUG_TABLE} WHERE id = %s '
+    f'ON CONFLICT (user_id, drug_id) DO UPDATE SET reaction = excluded.reaction '
+    f'RETURNING id, reaction, created_at'
+)
+
+_DELETE_SQL = (
+    f'DELETE FROM {_REACTION_TABLE} WHERE user_id = %s AND drug_id = %s '
+    f'RETURNING reaction'
+)
+
+
+@contextmanager
+def _write_transaction():
+    """
+    반응 쓰기용 atomic (SQLite 에서는 BEGIN IMMEDIATE)
+    - 시작할 때 바로 쓰기 잠금을 잡아 같은 반응을 동시에 누를 때 잠금 승격 교착을 피함
+    - 다른 트랜잭션에는 영향 없음 (연결의 transaction_mode 는 BEGIN 직후 되돌림)
+    - 이미 트랜잭션 안이면 일반 atomic (savepoint)
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic():
+            yield
+        return
+
+    connection.ensure_connection()
+    mode = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic():
+            connection.transaction_mode = mode
+            yield
+    finally:
+        connection.transaction_mode = mode
+
+
+def set_reaction(user, drug_id, reaction):
+    """
+    반응 저장 (INSERT ... ON CONFLICT DO UPDATE) + 통계 갱신을 한 트랜잭션으로 처리
+
+    반환값: 저장된 DrugReaction, 의약품이 없으면 None
+    """
+    with _write_transaction():
+        rows = list(DrugReaction.objects.raw(
+            _UPSERT_SQL,
+            [user.pk, reaction, timezone.now(), drug_id],
+        ))
+        if not rows:
+            return None
+
+        recount_reactions(drug_id)
+
+    return rows[0]
+
+
+def clear_reaction(user, drug_id):
+    """
+    반응 취소 (DELETE ... RETURNING) + 통계 갱신
+
+    반환값: 지워진 반응 값, 없었으면 None
+    """
+    with _write_transaction():
+        with connection.cursor() as cursor:
+            cursor.execute(_DELETE_SQL, [user.pk, drug_id])
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        recount_reactions(drug_id)
+
+    return row[0]
@@ -0,0 +1,186 @@
+# ingredients/search.py
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Drug
+
+
+FTS_TABLE = 'ingredients_drug_fts'
+
+# 단어 경계로 쓰는 문자 (공백 / 구두점 / 밑줄)
+_SPLIT_RE = re.compile(r'[\W_]+')
+
+_fts_available = None
+
+
+# ============================
+# 문자 n-gram 토큰화
+# ============================
+# 한국어는 띄어쓰기만으로 단어를 나눌 수 없어서("머리두통약", "두통·발열")
+# 2글자 단위(bigram)로 잘라 색인한다.
+# 덩어리마다 마지막 글자를 한 글자 토큰으로 더 넣어 두면
+# 모든 글자가 어떤 토큰의 첫 글자가 되므로 한 글자 검색도 접두사 검색으로 처리된다.
+#   "타이레놀" → "타이 이레 레놀 놀"
+def chunks(text):
+    """
+    NFKC 정규화 + 소문자 후 단어 경계로 나눈 덩어리 목록
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return [c for c in _SPLIT_RE.split(text) if c]
+
+
+def to_ngrams(text):
+    """
+    색인용 문자열 생성 (bigram + 덩어리 끝 글자)
+    """
+    tokens = []
+    for chunk in chunks(text):
+        tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+        tokens.append(chunk[-1])
+    return ' '.join(tokens)
+
+
+def _phrase(chunk):
+    # 한 글자는 접두사 검색, 두 글자 이상은 bigram 을 연속 구문으로 검색
+    if len(chunk) == 1:
+        return f'"{chunk}"*'
+    return '"' + ' '.join(chunk[i:i + 2] for i in range(len(chunk) - 1)) + '"'
+
+
+def build_match_query(text, column=None):
+    """
+    검색어 → FTS5 MATCH 식
+    - 공백으로 나뉜 덩어리는 AND 로 결합
+    - column 을 주면 해당 컬럼만 검색
+    """
+    parts = chunks(text)
+    if not parts:
+        return None
+
+    expr = ' AND '.join(_phrase(c) for c in parts)
+    if column:
+        return f'{column} : ({expr})'
+    return expr
+
+
+# ============================
+# 색인 사용 가능 여부
+# ============================
+def fts_available():
+    """
+    SQLite + FTS5 색인 테이블이 있을 때만 True
+    (그 외 DB 에서는 icontains 검색으로 대체)
+    """
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _fts_available
+
+
+# ============================
+# 색인 동기화
+# ============================
+def index_drugs(drugs):
+    """
+    Drug 객체들의 색인 행을 교체 (삭제 후 삽입)
+    """
+    if not fts_available():
+        return
+
+    rows = [
+        (d.pk, to_ngrams(d.name), to_ngrams(d.effect))
+        for d in drugs
+    ]
+    if not rows:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(pk,) for pk, _, _ in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, effect) VALUES (%s, %s, %s)',
+            rows,
+        )
+
+
+def unindex_drug(pk):
+    if not fts_available():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def rebuild_search_index(batch_size=500):
+    """
+    전체 Drug 로 색인을 다시 만듦
+
+    반환값: 색인된 의약품 수
+    """
+    if not fts_available():
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    count = 0
+    batch = []
+    for drug in Drug.objects.only('id', 'name', 'effect').iterator(chunk_size=batch_size):
+        batch.append(drug)
+        if len(batch) >= batch_size:
+            index_drugs(batch)
+            count += len(batch)
+            batch = []
+
+    index_drugs(batch)
+    return count + len(batch)
+
+
+# ============================
+# 검색
+# ============================
+def filter_drugs(queryset, text, column='name'):
+    """
+    queryset 을 검색어가 포함된 의약품으로 제한 (정렬은 유지)
+    """
+    if not fts_available():
+        return queryset.filter(**{f'{column}__icontains': text})
+
+    match = build_match_query(text, column)
+    if match is None:
+        return queryset
+
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        [match],
+    ))
+
+
+def rank_drugs(queryset, text, column='name'):
+    """
+    filter_drugs 로 거른 결과에 BM25 관련도를 search_score 로 붙임
+    - search_score 는 클수록 관련도 높음 (전문 검색을 못 쓰면 NULL)
+    - 정렬은 호출하는 쪽에서 (키셋 페이지네이션 정렬 필드로 사용)
+    """
+    queryset = filter_drugs(queryset, text, column)
+
+    match = build_match_query(text, column) if fts_available() else None
+    if match is None:
+        return queryset.annotate(search_score=Value(None, output_field=FloatField()))
+
+    # bm25() 는 값이 작을수록 관련도가 높으므로 부호를 뒤집어 사용
+    return queryset.annotate(search_score=RawSQL(
+        f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {Drug._meta.db_table}.id',
+        [match],
+        output_field=FloatField(),
+    ))
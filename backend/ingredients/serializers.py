@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from .models import Drug, DrugComment, DrugReaction
 from accounts.serializers import UserSerializer
-from django.db.models import Avg, Count
+from .querysets import PREFETCHED_COMMENTS
 
 
 class DrugCommentSerializer(serializers.ModelSerializer):
@@ -19,8 +19,78 @@ class DrugCommentSerializer(serializers.ModelSerializer):
         )
 
 
-class DrugSerializer(serializers.ModelSerializer):
+class DrugCommentsField(serializers.Field):
+    """
+    의약품 댓글 목록
+    - comments_prefetch() 로 미리 가져온 목록이 있으면 추가 쿼리 없이 사용
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, drug):
+        comments = getattr(drug, PREFETCHED_COMMENTS, None)
+        if comments is None:
+            comments = drug.comments.select_related('author').order_by('-created_at', '-id')
+        return DrugCommentSerializer(comments, many=True).data
+
+
+class SparseFieldsMixin:
+    """
+    ?fields= / ?expand= 로 직렬화할 필드를 고르는 Mixin
+    - context['selected_fields'] 에 담긴 필드만 남김
+    - 지정이 없으면 Meta.default_fields (목록용 기본 형태) 사용
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get('selected_fields')
+        if selected is None:
+            selected = self.select_fields()
+
+        for name in set(self.fields) - set(selected):
+            self.fields.pop(name)
+
+    @classmethod
+    def select_fields(cls, query_params=None):
+        """
+        쿼리 파라미터 → 직렬화할 필드 이름 목록
+        - fields=id,name,effect : 지정한 필드만 (알 수 없는 이름은 무시)
+        - expand=comments       : 확장 필드 추가
+        """
+        query_params = query_params or {}
+        meta = cls.Meta
+        expandable = getattr(meta, 'expandable_fields', ())
+
+        requested = query_params.get('fields')
+        if requested:
+            names = [n.strip() for n in requested.split(',')]
+            selected = [n for n in meta.fields if n in names and n not in expandable]
+        else:
+            selected = list(getattr(meta, 'default_fields', meta.fields))
+
+        expand = query_params.get('expand', '')
+        selected += [n for n in expand.split(',') if n in expandable and n not in selected]
+
+        # id 는 항상 포함
+        if 'id' not in selected:
+            selected.insert(0, 'id')
+        return selected
+
+    @classmethod
+    def model_columns(cls, selected):
+        """
+        선택된 필드 중 실제 모델 컬럼만 반환 (queryset.only() 용)
+        """
+        concrete = {f.name for f in cls.Meta.model._meta.concrete_fields}
+        return [n for n in selected if n in concrete]
+
+
+class DrugSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # 의약품 목록/요약 조회용 Serializer
+    # - 기본은 카드용 가벼운 형태, 긴 텍스트 / 댓글은 ?fields= / ?expand= 로 요청
 
     # 주석: 아래 필드들은 queryset에서 annotate로 계산된 값
     avg_rating = serializers.FloatField(read_only=True)
@@ -28,8 +98,11 @@ class DrugSerializer(serializers.ModelSerializer):
     unhelpful_count = serializers.IntegerField(read_only=True)
     helpful_ratio = serializers.FloatField(read_only=True)
 
+    # 검색 관련도 점수 (전문 검색 결과에만 포함)
+    search_score = serializers.FloatField(read_only=True)
+
     # 의약품에 달린 댓글 목록
-    comments = DrugCommentSerializer(many=True, read_only=True)
+    comments = DrugCommentsField()
 
     class Meta:
         model = Drug
@@ -42,24 +115,37 @@ class DrugSerializer(serializers.ModelSerializer):
             'helpful_count',
             'unhelpful_count',
             'helpful_ratio',
+            'search_score',
             'comments',
             'effect',
             'usage',
             'warning',
         )
 
+        # 목록 카드에 필요한 기본 필드
+        default_fields = (
+            'id',
+            'name',
+            'image',
+            'image_url',
+            'avg_rating',
+            'helpful_count',
+            'unhelpful_count',
+            'helpful_ratio',
+            'search_score',
+        )
+
+        # ?expand= 로만 포함되는 필드
+        expandable_fields = ('comments',)
+
 
 class DrugDetailSerializer(serializers.ModelSerializer):
     # 의약품 상세 조회용 Serializer
 
-    comments = DrugCommentSerializer(many=True, read_only=True)
-
-    # 댓글 별점 평균을 계산해서 반환
-    avg_rating = serializers.SerializerMethodField()
+    comments = DrugCommentsField()
 
-    def get_avg_rating(self, obj):
-        # 해당 의약품에 달린 댓글의 rating 평균
-        return obj.comments.aggregate(avg=Avg('rating'))['avg']
+    # 댓글 별점 평균 (queryset 에서 DrugStats 값을 annotate)
+    avg_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Drug
@@ -0,0 +1,64 @@
+# ingredients/signals.py
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .effect_index import mark_stale
+from .models import Drug, DrugComment, DrugReaction
+from .search import index_drugs, unindex_drug
+from .stats import apply_comment_delta, apply_reaction_change, create_stats
+
+
+# ============================
+# 삭제 시 통계 차감
+# ============================
+# 회원탈퇴 등으로 댓글 / 반응이 CASCADE 삭제될 때도 DrugStats 를 맞춰 줌.
+# 생성 / 변경은 뷰에서 같은 트랜잭션 안에서 직접 반영한다.
+@receiver(post_delete, sender=DrugComment)
+def drug_comment_deleted(sender, instance, **kwargs):
+    apply_comment_delta(instance.drug_id, instance.rating, sign=-1, create=False)
+
+
+@receiver(post_delete, sender=DrugReaction)
+def drug_reaction_deleted(sender, instance, **kwargs):
+    apply_reaction_change(instance.drug_id, instance.reaction, None, create=False)
+
+
+# ============================
+# 검색 색인 동기화
+# ============================
+# bulk_create / update() 처럼 시그널이 없는 경로는
+# search.index_drugs() 또는 rebuild_search_index 커맨드로 맞추고
+# 효능 벡터 색인은 effect_index.mark_stale() 로 재생성을 알린다.
+def _indexed_values(drug):
+    # 지연 로딩(only / defer)된 필드를 읽느라 쿼리가 나가지 않도록 __dict__ 에서 꺼냄
+    return drug.__dict__.get('name'), drug.__dict__.get('effect')
+
+
+@receiver(post_init, sender=Drug)
+def drug_initialized(sender, instance, **kwargs):
+    # 저장할 때 이름 / 효능이 실제로 바뀌었는지 비교할 원래 값
+    instance._indexed_values = _indexed_values(instance)
+
+
+@receiver(post_save, sender=Drug)
+def drug_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    if created:
+        create_stats([instance.pk])
+
+    # 조회수 / 이미지만 바뀐 저장은 색인 대상 아님
+    if update_fields and not {'name', 'effect'} & set(update_fields):
+        return
+    previous, current = instance._indexed_values, _indexed_values(instance)
+    if not created and previous == current:
+        return
+    instance._indexed_values = current
+
+    index_drugs([instance])
+    if created or previous[1] != current[1]:
+        mark_stale()
+
+
+@receiver(post_delete, sender=Drug)
+def drug_deleted(sender, instance, **kwargs):
+    unindex_drug(instance.pk)
+    mark_stale()
@@ -0,0 +1,238 @@
+# ingredients/stats.py
+from django.db import transaction
+from django.db.models import (
+    Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+from .models import Drug, DrugComment, DrugReaction, DrugStats
+
+
+# ============================
+# 평균 / 비율 계산식
+# ============================
+def _ratio(numerator, denominator, scale=1.0):
+    """
+    denominator 가 0 이면 NULL, 아니면 scale * numerator / denominator
+    """
+    return Case(
+        When(
+            GreaterThan(denominator, 0),
+            then=Value(scale) * Cast(numerator, FloatField()) / denominator,
+        ),
+        default=None,
+        output_field=FloatField(),
+    )
+
+
+def _ensure_stats(drug_id):
+    # 통계 행이 없으면 0 으로 초기화된 행 생성
+    DrugStats.objects.get_or_create(drug_id=drug_id)
+
+
+def create_stats(drug_ids):
+    """
+    새 의약품들의 통계 행을 0 으로 한 번에 생성 (이미 있는 행은 그대로)
+    - 목록 정렬이 DrugStats 를 INNER JOIN 하므로 모든 의약품에 행이 있어야 함
+    """
+    DrugStats.objects.bulk_create(
+        [DrugStats(drug_id=drug_id) for drug_id in drug_ids],
+        ignore_conflicts=True,
+    )
+
+
+# ============================
+# 증분 갱신
+# ============================
+# UPDATE 문의 우변은 갱신 전 값을 참조하므로
+# 평균/비율 식에도 증감분을 포함한 값을 넘긴다.
+def apply_comment_delta(drug_id, rating, sign=1, create=True):
+    """
+    댓글 1개 추가(sign=1) / 삭제(sign=-1)를 통계에 반영
+    """
+    if create:
+        _ensure_stats(drug_id)
+
+    has_rating = int(rating is not None)
+    rating_sum = F('rating_sum') + sign * (rating or 0)
+    rating_count = F('rating_count') + sign * has_rating
+
+    DrugStats.objects.filter(drug_id=drug_id).update(
+        comment_count=F('comment_count') + sign,
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        avg_rating=_ratio(rating_sum, rating_count),
+    )
+
+
+def apply_reaction_change(drug_id, old, new, create=True):
+    """
+    사용자 반응이 old → new 로 바뀐 것을 통계에 반영
+    - old / new 는 'helpful', 'unhelpful' 또는 None(반응 없음)
+    """
+    if old == new:
+        return
+
+    if create:
+        _ensure_stats(drug_id)
+
+    helpful = F('helpful_count') + (int(new == 'helpful') - int(old == 'helpful'))
+    unhelpful = F('unhelpful_count') + (int(new == 'unhelpful') - int(old == 'unhelpful'))
+
+    DrugStats.objects.filter(drug_id=drug_id).update(
+        helpful_count=helpful,
+        unhelpful_count=unhelpful,
+        helpful_ratio=_ratio(helpful, helpful + unhelpful, scale=100.0),
+    )
+
+
+# 반응 upsert 처럼 이전 값을 모르는 쓰기 경로에서는
+# 해당 의약품 반응 수를 같은 트랜잭션 안에서 다시 센다.
+def _reaction_count(reaction):
+    # 해당 의약품의 반응 개수 (drug, reaction) 인덱스만으로 계산
+    return Coalesce(
+        Subquery(
+            DrugReaction.objects
+            .filter(drug_id=OuterRef('drug_id'), reaction=reaction)
+            .order_by()
+            .values('drug_id')
+            .annotate(c=Count('*'))
+            .values('c'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def recount_reactions(drug_id):
+    """
+    해당 의약품의 도움됨 / 도움안됨 개수를 반응 테이블에서 다시 세어 UPDATE 1번으로 반영
+    - 같은 트랜잭션 안에서 실행되므로 방금 쓴 반응까지 정확히 반영됨
+    """
+    helpful = _reaction_count('helpful')
+    unhelpful = _reaction_count('unhelpful')
+
+    def update():
+        return DrugStats.objects.filter(drug_id=drug_id).update(
+            helpful_count=helpful,
+            unhelpful_count=unhelpful,
+            helpful_ratio=_ratio(helpful, helpful + unhelpful, scale=100.0),
+        )
+
+    # 통계 행이 아직 없는 의약품이면 만들고 다시 반영
+    if not update():
+        _ensure_stats(drug_id)
+        update()
+
+
+# ============================
+# 반응 요약 조회
+# ============================
+def reaction_summaries(drug_ids, user=None):
+    """
+    여러 의약품의 도움됨 / 도움안됨 개수 + 내 반응을 한 번에 조회
+    - 개수 1쿼리(DrugStats JOIN) + 로그인 시 내 반응 1쿼리
+    - 존재하지 않는 의약품 id 는 결과에서 빠짐
+
+    반환값: {drug_id: {'helpful', 'unhelpful', 'my_reaction'}}
+    """
+    rows = (
+        Drug.objects
+        .filter(pk__in=drug_ids)
+        .values_list('pk', 'stats__helpful_count', 'stats__unhelpful_count')
+    )
+    result = {
+        pk: {
+            'helpful': helpful or 0,
+            'unhelpful': unhelpful or 0,
+            'my_reaction': None,
+        }
+        for pk, helpful, unhelpful in rows
+    }
+
+    if result and user is not None and user.is_authenticated:
+        mine = (
+            DrugReaction.objects
+            .filter(user=user, drug_id__in=result)
+            .values_list('drug_id', 'reaction')
+        )
+        for drug_id, reaction in mine:
+            result[drug_id]['my_reaction'] = reaction
+
+    return result
+
+
+# ============================
+# 전체 재계산 (복구 / 백필)
+# ============================
+def rebuild_drug_stats(drug_ids=None, batch_size=500):
+    """
+    댓글 / 반응 테이블에서 통계를 다시 계산해 DrugStats 에 덮어씀
+    - 댓글과 반응을 따로 GROUP BY 해서 JOIN 으로 인한 행 곱셈을 피함
+    - drug_ids 가 없으면 전체 의약품 대상
+
+    반환값: 갱신된 통계 행 수
+    """
+    drugs = Drug.objects.all()
+    comments = DrugComment.objects.all()
+    reactions = DrugReaction.objects.all()
+
+    if drug_ids is not None:
+        drugs = drugs.filter(pk__in=drug_ids)
+        comments = comments.filter(drug_id__in=drug_ids)
+        reactions = reactions.filter(drug_id__in=drug_ids)
+
+    comment_rows = {
+        row['drug_id']: row
+        for row in comments.values('drug_id').annotate(
+            comment_count=Count('id'),
+            rating_sum=Sum('rating', default=0),
+            rating_count=Count('rating'),
+        )
+    }
+
+    reaction_rows = {}
+    for row in reactions.values('drug_id', 'reaction').annotate(count=Count('id')):
+        reaction_rows.setdefault(row['drug_id'], {})[row['reaction']] = row['count']
+
+    stats = []
+    for drug_id in drugs.values_list('pk', flat=True).iterator():
+        c = comment_rows.get(drug_id, {})
+        r = reaction_rows.get(drug_id, {})
+
+        rating_sum = c.get('rating_sum', 0)
+        rating_count = c.get('rating_count', 0)
+        helpful = r.get('helpful', 0)
+        unhelpful = r.get('unhelpful', 0)
+
+        stats.append(DrugStats(
+            drug_id=drug_id,
+            comment_count=c.get('comment_count', 0),
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            avg_rating=rating_sum / rating_count if rating_count else None,
+            helpful_count=helpful,
+            unhelpful_count=unhelpful,
+            helpful_ratio=100.0 * helpful / (helpful + unhelpful) if helpful + unhelpful else None,
+        ))
+
+    with transaction.atomic():
+        DrugStats.objects.bulk_create(
+            stats,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['drug'],
+            update_fields=[
+                'comment_count',
+                'rating_sum',
+                'rating_count',
+                'avg_rating',
+                'helpful_count',
+                'unhelpful_count',
+                'helpful_ratio',
+                'updated_at',
+            ],
+        )
+
+    return len(stats)
@@ -0,0 +1,180 @@
+# ingredients/symptom_lexicon.py
+import re
+from collections import deque, namedtuple
+from itertools import product
+
+from django.conf import settings
+
+from .keyword_cache import normalize_query
+
+
+# ============================
+# 증상 사전
+# ============================
+# 자주 들어오는 일상 표현 → 표준 증상 용어
+# 검색어는 normalize_query 로 공백 / 구두점을 없앤 뒤 매칭하므로 패턴도 붙여 씀
+class _Subject(str):
+    """
+    부위 + 서술어 패턴 ("목이아파")
+    공백을 없애고 매칭하므로 "발목이 아파요" 의 "목이아파" 처럼 다른 말 안에서 찾히지 않도록
+    검색어의 덩어리(공백 / 구두점으로 나뉜 단위) 첫 글자에서 시작할 때만 인정
+    """
+
+
+def _combine(subjects, predicates):
+    return [_Subject(s + p) for s, p in product(subjects, predicates)]
+
+
+_PAIN = ['아파', '아프', '아퍼', '아픔', '쑤셔', '쑤시']
+
+SYMPTOM_LEXICON = {
+    '두통': ['두통', '편두통'] + _combine(['머리', '머리가', '머리도'], _PAIN + ['지끈', '띵', '욱신']),
+    '발열': ['발열', '고열', '미열', '열나', '열이나', '열이있', '열있', '열이높', '몸이뜨거', '몸에열'],
+    '오한': ['오한', '으슬으슬', '춥고떨려', '몸이떨려'],
+    '복통': ['복통', '배앓이'] + _combine(['배', '배가', '배도', '아랫배', '아랫배가'], _PAIN + ['살살']),
+    '오심': ['오심', '메스꺼', '메슥', '울렁', '속이울렁', '토할것같', '토할거같'],
+    '구토': ['구토', '토해', '토했', '토하', '게워'],
+    '설사': ['설사', '묽은변', '배탈'],
+    '변비': ['변비', '변이안나', '화장실을못가'],
+    '소화불량': ['소화불량', '소화가안', '소화안', '더부룩', '속이더부룩', '체했', '체한', '얹힌'],
+    '속쓰림': ['속쓰림', '속쓰려', '속이쓰려', '속이쓰리', '쓰린속', '위가쓰려'],
+    '기침': ['기침', '콜록'],
+    '가래': ['가래'],
+    '콧물': ['콧물', '코물', '코가흘러', '콧물이나'],
+    '코막힘': ['코막힘', '코막혀', '코가막혀', '코가막히'],
+    '재채기': ['재채기'],
+    '인후통': ['인후통'] + _combine(['목이', '목도', '목구멍', '목구멍이'], _PAIN + ['따가', '칼칼', '부었', '부어']),
+    '치통': ['치통', '잇몸'] + _combine(['이가', '이빨', '이빨이', '치아', '치아가'], _PAIN + ['시려', '시리']),
+    '생리통': ['생리통', '월경통', '생리할때아파', '생리중'],
+    '근육통': ['근육통', '몸살', '온몸이쑤', '온몸이아파', '뭉쳤', '담걸', '담이걸'],
+    '관절통': ['관절통'] + _combine(['관절', '관절이', '무릎', '무릎이', '손목', '손목이'], _PAIN + ['시큰']),
+    '요통': ['요통'] + _combine(['허리', '허리가'], _PAIN + ['삐끗']),
+    '어지러움': ['어지러', '어지럼', '현기증', '빙빙돌'],
+    '불면': ['불면', '잠이안와', '잠이안오', '잠을못', '못자', '잠들기어려'],
+    '가려움': ['가려', '가렵', '간지러', '간지럽', '가려움'],
+    '두드러기': ['두드러기', '발진', '뾰루지'],
+    '피로': ['피로', '피곤', '기운이없', '나른'],
+}
+
+# 증상은 아니지만 검색어에 흔히 붙는 말 (매칭 확신도 계산에만 사용)
+FILLER_WORDS = [
+    '요', '고', '서', '해', '해요', '하고', '해서', '네요', '어요', '아요', '거려', '거려요', '거리고',
+    '려요', '려서', '고요', '있어요', '나요', '요즘', '오늘', '어제', '아침', '밤에', '자꾸', '계속',
+    '너무', '좀', '많이', '조금', '약간', '살짝', '심하게', '심해', '그리고', '랑', '이랑', '도',
+    '가', '이', '은', '는', '을', '를', '에', '약', '약추천', '먹을', '뭐먹', '같아요', '것같아요',
+    '거같아요', '같고', '나고', '프고', '파요', '파서', '파고', '퍼요', '려', '워', '워요', '워서',
+]
+
+
+# 덩어리 경계 (공백 / 구두점 / 밑줄)
+_CHUNK_RE = re.compile(r'[\W_]+')
+
+SymptomMatch = namedtuple('SymptomMatch', ['symptoms', 'confidence'])
+
+
+# ============================
+# Aho-Corasick 자동자
+# ============================
+# 사전 패턴 수와 무관하게 검색어 길이에 비례하는 시간으로 모든 패턴 위치를 찾는다.
+class AhoCorasick:
+    def __init__(self, patterns):
+        """
+        patterns: {패턴 문자열: 값}
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node].append((len(pattern), value))
+
+        # 실패 링크 (BFS)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """
+        (시작, 끝, 값) 을 모든 매칭 위치에 대해 생성
+        """
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                yield i + 1 - length, i + 1, value
+
+
+def _build_matcher():
+    # 값: (증상, 덩어리 첫 글자에서만 인정하는지) (조사 / 어미는 증상 None)
+    patterns = {normalize_query(w): (None, False) for w in FILLER_WORDS}
+    for symptom, phrases in SYMPTOM_LEXICON.items():
+        for phrase in phrases:
+            patterns[normalize_query(phrase)] = (symptom, isinstance(phrase, _Subject))
+    return AhoCorasick(patterns)
+
+
+_matcher = _build_matcher()
+
+
+# ============================
+# 매칭
+# ============================
+def match_symptoms(text):
+    """
+    검색어에서 사전에 있는 증상 표현을 찾음
+
+    - 겹치는 매칭은 왼쪽부터, 같은 위치면 긴 패턴 우선
+    - 부위 + 서술어 패턴은 덩어리 첫 글자에서 시작할 때만 ("가슴이 아파요" ≠ 치통)
+    - confidence: 검색어 중 증상 / 조사·어미로 설명되는 글자 비율 (0 ~ 1)
+      (모르는 말이 많이 남을수록 낮음, 증상을 하나도 못 찾으면 0)
+    """
+    # 덩어리별로 정규화해 이어 붙이고 각 덩어리의 시작 위치를 기억
+    chunk_starts = set()
+    query = ''
+    for chunk in _CHUNK_RE.split(text or ''):
+        chunk_starts.add(len(query))
+        query += normalize_query(chunk, max_length=None)
+    query = query[:255]
+    if not query:
+        return SymptomMatch([], 0.0)
+
+    matches = sorted(_matcher.find_all(query), key=lambda m: (m[0], m[0] - m[1]))
+
+    symptoms = []
+    covered = 0
+    cursor = 0
+    for start, end, (symptom, subject) in matches:
+        if start < cursor or (subject and start not in chunk_starts):
+            continue
+        covered += end - start
+        cursor = end
+        if symptom and symptom not in symptoms:
+            symptoms.append(symptom)
+
+    if not symptoms:
+        return SymptomMatch([], 0.0)
+    return SymptomMatch(symptoms, covered / len(query))
+
+
+def is_confident(match):
+    return bool(match.symptoms) and match.confidence >= settings.SYMPTOM_LEXICON_MIN_CONFIDENCE
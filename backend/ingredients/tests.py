@@ -1,4 +1,80 @@
-from rest_framework.test import APITestCase
+import json
+import random
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import requests
+from asgiref.sync import async_to_sync
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, transaction
+from django.test import AsyncRequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from .ai_summary import call_gpt_for_drug_summary, generate_missing_summaries, run_summary_job
+from . import http_client
+from .chat import chat_request
+from .chat_stream import iter_output_deltas, sse_response, stream_chat_events
+from . import effect_index
+from .circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, get_breaker, reset_breakers
+from .ingest import bootstrap_catalog, catalog_lock, fetch_missing_images, ingest_drugs, sync_drugs
+from .keyword_cache import cache_stats, clear_local_cache, normalize_query, reset_cache_stats
+from .loadtest import percentile
+from .mock_upstream import MockUpstreamConfig, start_mock_upstream
+from .models import (
+    Drug,
+    DrugAiSummary,
+    DrugAiSummaryJob,
+    DrugChatAnswer,
+    DrugComment,
+    DrugReaction,
+    DrugStats,
+    DrugViewBucket,
+    SymptomQueryCache,
+    TrendingDrug,
+)
+from .stats import rebuild_drug_stats
+from .trending import record_hourly_views, refresh_trending
+from .symptom_lexicon import match_symptoms
+from .utils import extract_keywords_with_ai, score_symptom_match, fetch_all_drugs_from_api, request_keywords_from_ai
+from .view_counter import discard_views, flush_views, pending_views, start_periodic_flush, stop_periodic_flush
+
+User = get_user_model()
+
+
+# 효능 벡터 색인은 테스트 동안 임시 디렉터리에 만듦
+_effect_index_dir = None
+_effect_index_override = None
+
+
+def setUpModule():
+    global _effect_index_dir, _effect_index_override
+    _effect_index_dir = tempfile.TemporaryDirectory()
+    # 테스트 트랜잭션 안의 데이터는 다른 스레드에서 보이지 않으므로 색인은 요청 안에서 재생성
+    _effect_index_override = override_settings(
+        EFFECT_INDEX_DIR=_effect_index_dir.name,
+        EFFECT_INDEX_BACKGROUND_REBUILD=False,
+    )
+    _effect_index_override.enable()
+
+
+def tearDownModule():
+    # 다른 테스트에서 쌓인 조회수가 프로세스에 남지 않도록
+    discard_views()
+    _effect_index_override.disable()
+    _effect_index_dir.cleanup()
 
 
 class DrugAPITest(APITestCase):
@@ -9,3 +85,1866 @@ class DrugAPITest(APITestCase):
         # 에러 메시지가 있을 경우 data.error 포함
         if resp.status_code != 200:
             self.assertIn('error', resp.data)
+
+
+class DrugListPaginationTest(APITestCase):
+    """
+    커서 페이지네이션
+    - 정렬별로 페이지를 끝까지 넘겨도 중복/누락 없이 전체 목록과 순서가 같아야 함
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create_user(username=f'u{i}', password='pw', nickname=f'n{i}')
+            for i in range(3)
+        ]
+        for i in range(12):
+            drug = Drug.objects.create(name=f'약{i}', effect='두통')
+            # 일부 약만 댓글/반응을 두어 NULL 과 동점 값이 섞이도록 구성
+            if i % 3 == 0:
+                DrugComment.objects.create(drug=drug, author=users[0], content='c', rating=4)
+            if i % 4 == 0:
+                DrugReaction.objects.create(drug=drug, user=users[0], reaction='helpful')
+            if i % 6 == 0:
+                DrugReaction.objects.create(drug=drug, user=users[1], reaction='unhelpful')
+        rebuild_drug_stats()
+
+    def walk(self, **params):
+        ids = []
+        resp = self.client.get('/api/drugs/', {'page_size': 5, **params})
+        while True:
+            self.assertEqual(resp.status_code, 200)
+            self.assertLessEqual(len(resp.data['results']), 5)
+            ids += [d['id'] for d in resp.data['results']]
+            if not resp.data['next_cursor']:
+                return ids
+            resp = self.client.get(
+                '/api/drugs/',
+                {'page_size': 5, 'cursor': resp.data['next_cursor'], **params}
+            )
+
+    def test_pages_match_full_listing(self):
+        for order in (None, 'helpful', 'rating'):
+            params = {'order': order} if order else {}
+            full = [d['id'] for d in self.client.get('/api/drugs/', params).data]
+            self.assertEqual(self.walk(**params), full)
+            self.assertEqual(len(full), 12)
+
+    def test_stats_orderings_use_index(self):
+        # 도움순 / 평점순은 DrugStats 인덱스 순서대로 읽어야 함 (전체 스캔 + 임시 정렬 없음)
+        for order, index in (('helpful', 'drugstats_helpful_idx'), ('rating', 'drugstats_rating_idx')):
+            cursor = self.client.get('/api/drugs/', {'page_size': 5, 'order': order}).data['next_cursor']
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get('/api/drugs/', {'page_size': 5, 'order': order, 'cursor': cursor})
+            sql = next(q['sql'] for q in ctx.captured_queries if 'ORDER BY' in q['sql'])
+
+            with connection.cursor() as c:
+                c.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = [row[-1] for row in c.fetchall()]
+            self.assertTrue(any(index in step for step in plan), plan)
+            self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+            self.assertNotIn('SCAN ingredients_drug', plan)
+
+    def test_invalid_cursor_returns_400(self):
+        resp = self.client.get('/api/drugs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(resp.status_code, 400)
+
+
+class DrugStatsTest(APITestCase):
+    """
+    DrugStats 증분 갱신
+    - 댓글 / 반응 API 호출 결과가 전체 재계산 결과와 같아야 함
+    """
+
+    def setUp(self):
+        self.drug = Drug.objects.create(name='타이레놀', effect='두통, 발열')
+        self.alice = User.objects.create_user(username='alice', password='pw', nickname='alice')
+        self.bob = User.objects.create_user(username='bob', password='pw', nickname='bob')
+
+    def stats(self):
+        return DrugStats.objects.get(drug=self.drug)
+
+    def assert_matches_rebuild(self):
+        incremental = self.stats()
+        rebuild_drug_stats([self.drug.pk])
+        rebuilt = self.stats()
+        for field in (
+            'comment_count', 'rating_sum', 'rating_count', 'avg_rating',
+            'helpful_count', 'unhelpful_count', 'helpful_ratio',
+        ):
+            self.assertEqual(getattr(incremental, field), getattr(rebuilt, field), field)
+
+    def test_comment_updates_rating(self):
+        self.client.force_authenticate(self.alice)
+        url = f'/api/drugs/{self.drug.pk}/comments/'
+        self.client.post(url, {'content': '좋아요', 'rating': 5})
+        self.client.post(url, {'content': '보통', 'rating': 2})
+        self.client.post(url, {'content': '별점 없음'})
+
+        stats = self.stats()
+        self.assertEqual(stats.comment_count, 3)
+        self.assertEqual(stats.rating_count, 2)
+        self.assertEqual(stats.avg_rating, 3.5)
+        self.assert_matches_rebuild()
+
+    def test_reaction_change_and_cancel(self):
+        url = f'/api/drugs/{self.drug.pk}/reaction/'
+        self.client.force_authenticate(self.alice)
+        self.client.post(url, {'reaction': 'helpful'})
+        self.client.force_authenticate(self.bob)
+        self.client.post(url, {'reaction': 'helpful'})
+        self.client.post(url, {'reaction': 'unhelpful'})
+
+        stats = self.stats()
+        self.assertEqual((stats.helpful_count, stats.unhelpful_count), (1, 1))
+        self.assertEqual(stats.helpful_ratio, 50.0)
+
+        # 반응 취소 → 시그널로 차감
+        self.client.post(url, {}, format='json')
+        stats = self.stats()
+        self.assertEqual((stats.helpful_count, stats.unhelpful_count), (1, 0))
+        self.assertEqual(stats.helpful_ratio, 100.0)
+        self.assert_matches_rebuild()
+
+    def test_user_delete_cascades_into_stats(self):
+        DrugComment.objects.create(drug=self.drug, author=self.bob, content='c', rating=1)
+        DrugReaction.objects.create(drug=self.drug, user=self.bob, reaction='unhelpful')
+        rebuild_drug_stats()
+
+        self.bob.delete()
+        stats = self.stats()
+        self.assertEqual((stats.comment_count, stats.unhelpful_count), (0, 0))
+        self.assertIsNone(stats.avg_rating)
+        self.assertIsNone(stats.helpful_ratio)
+
+
+class DrugSearchTest(APITestCase):
+    """
+    FTS5 전문 검색
+    - 한국어 부분 문자열 / 한 글자 검색
+    - Drug 저장 / 삭제 시 색인 동기화
+    - 증상 키워드 BM25 정렬
+    """
+
+    def setUp(self):
+        self.tylenol = Drug.objects.create(name='타이레놀정500밀리그램', effect='두통, 치통, 발열')
+        self.gebo = Drug.objects.create(name='게보린정', effect='두통, 치통, 생리통')
+        self.gas = Drug.objects.create(name='까스활명수', effect='소화불량, 식욕감퇴')
+
+    def names(self, **params):
+        return {d['name'] for d in self.client.get('/api/drugs/', params).data}
+
+    def test_name_search(self):
+        self.assertEqual(self.names(search='레놀'), {self.tylenol.name})
+        self.assertEqual(self.names(search='정'), {self.tylenol.name, self.gebo.name})
+        self.assertEqual(self.names(search='없는약'), set())
+
+    def test_ranked_by_relevance(self):
+        # order 가 없으면 BM25 관련도순 (id 역순이었다면 긴 이름이 먼저 옴)
+        short = Drug.objects.create(name='타이레놀', effect='두통')
+        long = Drug.objects.create(name='우먼스타이레놀정500밀리그램', effect='생리통')
+
+        results = self.client.get('/api/drugs/', {'search': '타이레놀'}).data
+        self.assertEqual(results[0]['id'], short.pk)
+        self.assertEqual({d['id'] for d in results}, {short.pk, long.pk, self.tylenol.pk})
+        scores = [d['search_score'] for d in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertGreater(scores[0], scores[-1])
+
+        # 커서 페이지도 같은 순서
+        resp = self.client.get('/api/drugs/', {'search': '타이레놀', 'page_size': 2})
+        ids = [d['id'] for d in resp.data['results']]
+        resp = self.client.get('/api/drugs/', {'search': '타이레놀', 'page_size': 2, 'cursor': resp.data['next_cursor']})
+        ids += [d['id'] for d in resp.data['results']]
+        self.assertEqual(ids, [d['id'] for d in results])
+
+        # 정렬을 지정하면 그 정렬이 우선
+        results = self.client.get('/api/drugs/', {'search': '타이레놀', 'order': 'rating'}).data
+        self.assertEqual(len(results), 3)
+
+    def test_index_follows_writes(self):
+        self.gas.name = '베아제정'
+        self.gas.save()
+        self.assertEqual(self.names(search='베아제'), {'베아제정'})
+        self.assertEqual(self.names(search='까스'), set())
+
+        self.gebo.delete()
+        self.assertEqual(self.names(search='게보린'), set())
+
+    @mock.patch('ingredients.utils.extract_keywords_with_ai', return_value=['소화불량'])
+    def test_ai_search_uses_index(self, _):
+        resp = self.client.get('/api/drugs/ai-search/', {'q': '속이 더부룩해요'})
+        self.assertEqual(resp.data['count'], 1)
+        self.assertEqual(resp.data['results'][0]['name'], '까스활명수')
+        self.assertIn('search_score', resp.data['results'][0])
+
+
+class DrugFieldsetTest(APITestCase):
+    """
+    ?fields= / ?expand= 희소 필드셋
+    - 기본 목록은 카드용 필드만, 긴 텍스트 컬럼은 SELECT 에서도 빠져야 함
+    """
+
+    def setUp(self):
+        user = User.objects.create_user(username='alice', password='pw', nickname='alice')
+        self.drug = Drug.objects.create(name='타이레놀', effect='두통', usage='1정', warning='간 손상')
+        DrugComment.objects.create(drug=self.drug, author=user, content='좋아요', rating=5)
+
+    def test_default_is_compact(self):
+        with CaptureQueriesContext(connection) as ctx:
+            item = self.client.get('/api/drugs/').data[0]
+
+        self.assertIn('helpful_ratio', item)
+        for name in ('effect', 'usage', 'warning', 'comments'):
+            self.assertNotIn(name, item)
+        self.assertNotIn('"warning"', ctx.captured_queries[0]['sql'])
+
+    def test_fields_and_expand(self):
+        item = self.client.get('/api/drugs/', {'fields': 'name,effect', 'expand': 'comments'}).data[0]
+        self.assertEqual(set(item), {'id', 'name', 'effect', 'comments'})
+        self.assertEqual(item['comments'][0]['content'], '좋아요')
+
+
+class DrugQueryCountTest(APITestCase):
+    """
+    목록 / 상세 조회 쿼리 수가 의약품 / 댓글 수와 무관하게 일정해야 함 (N+1 방지)
+    """
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'u{i}', password='pw', nickname=f'n{i}')
+            for i in range(4)
+        ]
+
+    def add_drugs(self, count, comments_each):
+        drugs = []
+        for i in range(count):
+            drug = Drug.objects.create(name=f'약{Drug.objects.count()}', effect='두통')
+            for j in range(comments_each):
+                DrugComment.objects.create(
+                    drug=drug, author=self.users[j % len(self.users)], content='c', rating=3
+                )
+            drugs.append(drug)
+        rebuild_drug_stats()
+        return drugs
+
+    def test_list_query_count_is_constant(self):
+        self.add_drugs(2, 1)
+        # 목록 1 + 댓글(작성자 JOIN) 1
+        with self.assertNumQueries(2):
+            small = self.client.get('/api/drugs/', {'expand': 'comments'})
+
+        self.add_drugs(8, 4)
+        with self.assertNumQueries(2):
+            large = self.client.get('/api/drugs/', {'expand': 'comments'})
+
+        self.assertEqual(len(small.data), 2)
+        self.assertEqual(len(large.data), 10)
+        self.assertEqual(large.data[0]['comments'][0]['author']['nickname'], 'n3')
+
+        # 댓글을 요청하지 않으면 목록 쿼리 1번
+        with self.assertNumQueries(1):
+            self.client.get('/api/drugs/')
+
+    def test_latest_comments_window(self):
+        self.add_drugs(3, 4)
+        with self.assertNumQueries(2):
+            resp = self.client.get('/api/drugs/', {'expand': 'comments', 'comments_limit': 2})
+
+        for item in resp.data:
+            self.assertEqual(len(item['comments']), 2)
+            ids = [c['id'] for c in item['comments']]
+            self.assertEqual(ids, sorted(ids, reverse=True))
+
+    @override_settings(DRUG_VIEW_FLUSH_INTERVAL=3600)
+    def test_detail_query_count_is_constant(self):
+        flush_views()
+        few, many = self.add_drugs(1, 1) + self.add_drugs(1, 6)
+
+        # 상세 1 + 댓글 1 (조회수는 버퍼에 기록)
+        for drug in (few, many):
+            with self.assertNumQueries(2):
+                resp = self.client.get(f'/api/drugs/{drug.pk}/')
+            self.assertEqual(resp.data['avg_rating'], 3.0)
+
+        self.assertEqual(len(resp.data['comments']), 6)
+        self.assertEqual(resp.data['view_count'], 1)
+
+
+@override_settings(DRUG_VIEW_FLUSH_INTERVAL=3600, DRUG_VIEW_FLUSH_THRESHOLD=5)
+class DrugViewCountTest(APITestCase):
+    """
+    조회수 버퍼
+    - 응답은 버퍼 값을 포함한 조회수, DB 는 기준 건수마다 한 번에 반영
+    """
+
+    def setUp(self):
+        discard_views()
+        self.a = Drug.objects.create(name='타이레놀')
+        self.b = Drug.objects.create(name='게보린')
+
+    def tearDown(self):
+        discard_views()
+
+    def view(self, drug):
+        return self.client.get(f'/api/drugs/{drug.pk}/').data['view_count']
+
+    def test_buffered_then_flushed(self):
+        self.assertEqual([self.view(self.a) for _ in range(3)], [1, 2, 3])
+        self.assertEqual(self.view(self.b), 1)
+
+        # 아직 DB 에는 반영 전
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.view_count, 0)
+        self.assertEqual(pending_views(self.a.pk), 3)
+
+        # 5번째 조회에서 기준 건수 도달 → 한 번에 반영
+        self.assertEqual(self.view(self.b), 2)
+        self.a.refresh_from_db()
+        self.b.refresh_from_db()
+        self.assertEqual((self.a.view_count, self.b.view_count), (3, 2))
+        self.assertEqual(pending_views(self.a.pk), 0)
+
+        self.assertEqual(self.view(self.a), 4)
+
+    def test_flush_is_single_update(self):
+        for _ in range(2):
+            self.view(self.a)
+        self.view(self.b)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(flush_views(), 3)
+        updates = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('UPDATE "ingredients_drug"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE', updates[0])
+
+    def test_missing_drug_is_not_counted(self):
+        self.assertEqual(self.client.get('/api/drugs/999999/').status_code, 404)
+        self.assertEqual(pending_views(999999), 0)
+
+    @override_settings(DRUG_VIEW_FLUSH_INTERVAL=0.01)
+    def test_periodic_flush_without_requests(self):
+        # 조회가 더 들어오지 않아도 주기마다 반영됨
+        flushed = threading.Event()
+        with mock.patch('ingredients.view_counter.flush_views', side_effect=flushed.set):
+            try:
+                self.assertIs(start_periodic_flush(), start_periodic_flush())
+                self.assertTrue(flushed.wait(5))
+            finally:
+                stop_periodic_flush()
+
+
+class TrendingDrugTest(APITestCase):
+    """
+    기간별 인기 의약품
+    - 시간별 버킷 → 24h / 7d / 30d 집계 → 미리 계산된 TOP-K 조회
+    """
+
+    def setUp(self):
+        flush_views()
+        self.now = timezone.now()
+        self.old, self.recent, self.quiet = [
+            Drug.objects.create(name=name) for name in ('오래된 인기약', '요즘 인기약', '조용한 약')
+        ]
+        # 오래된 인기약: 20일 전 50회 / 요즘 인기약: 1시간 전 5회 + 3일 전 10회
+        record_hourly_views({self.old.pk: 50}, now=self.now - timedelta(days=20))
+        record_hourly_views({self.recent.pk: 5}, now=self.now - timedelta(hours=1))
+        record_hourly_views({self.recent.pk: 10}, now=self.now - timedelta(days=3))
+        record_hourly_views({self.old.pk: 1}, now=self.now - timedelta(days=40))
+        Drug.objects.filter(pk=self.old.pk).update(view_count=51)
+        Drug.objects.filter(pk=self.recent.pk).update(view_count=15)
+
+    def names(self, window):
+        resp = self.client.get('/api/drugs/popular/views/', {'window': window})
+        self.assertEqual(resp.status_code, 200)
+        return [d['name'] for d in resp.data]
+
+    def test_windows_after_refresh(self):
+        refresh_trending(now=self.now)
+
+        self.assertEqual(self.names('24h'), ['요즘 인기약'])
+        self.assertEqual(self.names('7d'), ['요즘 인기약'])
+        self.assertEqual(self.names('30d'), ['오래된 인기약', '요즘 인기약'])
+        self.assertEqual(self.names('all')[:2], ['오래된 인기약', '요즘 인기약'])
+
+        # 30일보다 오래된 버킷은 정리됨
+        self.assertEqual(DrugViewBucket.objects.filter(drug=self.old).count(), 1)
+
+    def test_precomputed_read_is_constant(self):
+        refresh_trending(now=self.now)
+        with self.assertNumQueries(1):
+            self.client.get('/api/drugs/popular/views/', {'window': '7d'})
+
+    def test_falls_back_before_first_refresh(self):
+        self.assertEqual(self.names('7d'), ['요즘 인기약'])
+
+    def test_all_window_is_live(self):
+        refresh_trending(now=self.now)
+        Drug.objects.filter(pk=self.quiet.pk).update(view_count=100)
+
+        self.assertEqual(self.names('all')[:2], ['조용한 약', '오래된 인기약'])
+        self.assertFalse(TrendingDrug.objects.filter(window='all').exists())
+        with self.assertNumQueries(1):
+            self.client.get('/api/drugs/popular/views/', {'window': 'all'})
+
+    def test_flush_fills_current_bucket(self):
+        with override_settings(DRUG_VIEW_FLUSH_THRESHOLD=2, DRUG_VIEW_FLUSH_INTERVAL=3600):
+            self.client.get(f'/api/drugs/{self.quiet.pk}/')
+            self.client.get(f'/api/drugs/{self.quiet.pk}/')
+
+        bucket = DrugViewBucket.objects.get(drug=self.quiet)
+        self.assertEqual(bucket.count, 2)
+
+    def test_invalid_window(self):
+        resp = self.client.get('/api/drugs/popular/views/', {'window': '1y'})
+        self.assertEqual(resp.status_code, 400)
+
+
+class DrugReactionBatchTest(APITestCase):
+    """
+    반응 일괄 조회
+    - 의약품 수와 무관하게 쿼리 2번 (개수 + 내 반응)
+    """
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='pw', nickname='alice')
+        self.bob = User.objects.create_user(username='bob', password='pw', nickname='bob')
+        self.drugs = [Drug.objects.create(name=f'약{i}') for i in range(5)]
+        for drug in self.drugs[:3]:
+            DrugReaction.objects.create(drug=drug, user=self.bob, reaction='helpful')
+        DrugReaction.objects.create(drug=self.drugs[0], user=self.alice, reaction='unhelpful')
+        rebuild_drug_stats()
+
+    def test_counts_and_my_reaction(self):
+        self.client.force_authenticate(self.alice)
+        ids = ','.join(str(d.pk) for d in self.drugs) + ',999999'
+
+        with self.assertNumQueries(2):
+            resp = self.client.get('/api/drugs/reactions/', {'ids': ids})
+
+        data = resp.data
+        self.assertEqual(len(data), 5)
+        first = data[str(self.drugs[0].pk)]
+        self.assertEqual(first, {'helpful': 1, 'unhelpful': 1, 'my_reaction': 'unhelpful'})
+        self.assertEqual(data[str(self.drugs[4].pk)], {'helpful': 0, 'unhelpful': 0, 'my_reaction': None})
+
+    def test_anonymous_single_query(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get('/api/drugs/reactions/', {'ids': f'{self.drugs[1].pk}'})
+        self.assertEqual(resp.data[str(self.drugs[1].pk)]['helpful'], 1)
+
+    def test_invalid_and_too_many_ids(self):
+        self.assertEqual(self.client.get('/api/drugs/reactions/', {'ids': '1,a'}).status_code, 400)
+        with override_settings(DRUG_REACTIONS_BATCH_MAX=2):
+            resp = self.client.get('/api/drugs/reactions/', {'ids': '1,2,3'})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_single_endpoint_matches(self):
+        resp = self.client.get(f'/api/drugs/{self.drugs[0].pk}/reaction/')
+        self.assertEqual(resp.data, {'helpful': 1, 'unhelpful': 1, 'my_reaction': None})
+        self.assertEqual(self.client.get('/api/drugs/999999/reaction/').status_code, 404)
+
+
+class DrugReactionUpsertTest(APITestCase):
+    """
+    반응 POST
+    - INSERT ... ON CONFLICT 1번으로 생성 / 변경, 없는 의약품은 404
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='pw', nickname='alice')
+        self.drug = Drug.objects.create(name='타이레놀')
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/drugs/{self.drug.pk}/reaction/'
+
+    def test_upsert_statement_count(self):
+        self.client.post(self.url, {'reaction': 'helpful'})
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(self.url, {'reaction': 'unhelpful'})
+
+        self.assertEqual(resp.data['reaction'], 'unhelpful')
+        writes = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE', 'SELECT'))
+        ]
+        # 반응 upsert 1 + 통계 UPDATE 1
+        self.assertEqual(len(writes), 2)
+        self.assertIn('ON CONFLICT', writes[0])
+        self.assertEqual(DrugReaction.objects.get().reaction, 'unhelpful')
+
+    def test_missing_drug(self):
+        resp = self.client.post('/api/drugs/999999/reaction/', {'reaction': 'helpful'})
+        self.assertEqual(resp.status_code, 404)
+        self.assertFalse(DrugReaction.objects.exists())
+
+        # 반응 취소도 없는 의약품이면 404, 있는 의약품이면 반응이 없어도 204
+        self.assertEqual(self.client.post('/api/drugs/999999/reaction/', {}).status_code, 404)
+        self.assertEqual(self.client.post(self.url, {}).status_code, 204)
+
+
+class DrugReactionConcurrencyTest(TransactionTestCase):
+    """
+    같은 (사용자, 의약품) 반응을 여러 스레드가 동시에 누를 때
+    - 오류 없이 처리되고, 반응은 최대 1개, 통계는 실제 반응과 일치해야 함
+    """
+
+    THREADS = 8
+    ROUNDS = 15
+
+    def test_hammer_same_pair(self):
+        user = User.objects.create_user(username='alice', password='pw', nickname='alice')
+        other = User.objects.create_user(username='bob', password='pw', nickname='bob')
+        drug = Drug.objects.create(name='타이레놀')
+        DrugReaction.objects.create(drug=drug, user=other, reaction='helpful')
+        rebuild_drug_stats()
+
+        url = f'/api/drugs/{drug.pk}/reaction/'
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker(seed):
+            rng = random.Random(seed)
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                for _ in range(self.ROUNDS):
+                    choice = rng.choice(['helpful', 'unhelpful', None])
+                    resp = client.post(url, {'reaction': choice}, format='json')
+                    if resp.status_code not in (200, 204):
+                        errors.append(resp.status_code)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(DrugReaction.objects.filter(user=user, drug=drug).count(), 1)
+
+        stats = DrugStats.objects.get(drug=drug)
+        actual = {
+            r: DrugReaction.objects.filter(drug=drug, reaction=r).count()
+            for r in ('helpful', 'unhelpful')
+        }
+        self.assertEqual(
+            (stats.helpful_count, stats.unhelpful_count),
+            (actual['helpful'], actual['unhelpful']),
+        )
+
+    def test_only_reaction_writes_begin_immediate(self):
+        user = User.objects.create_user(username='alice', password='pw', nickname='alice')
+        drug = Drug.objects.create(name='타이레놀')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            client.post(f'/api/drugs/{drug.pk}/reaction/', {'reaction': 'helpful'}, format='json')
+            with transaction.atomic():
+                Drug.objects.filter(pk=drug.pk).update(view_count=1)
+
+        begins = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('BEGIN')]
+        self.assertEqual(begins, ['BEGIN IMMEDIATE', 'BEGIN'])
+
+
+SUMMARY = {
+    'one_liner': '두통약',
+    'easy_explain': '머리가 아플 때 먹는 약',
+    'key_points': ['식후 복용'],
+    'cautions': [],
+    'when_to_see_doctor': [],
+}
+
+
+@override_settings(AI_SUMMARY_RETRY_BACKOFF=0, AI_SUMMARY_MAX_ATTEMPTS=3)
+class DrugAiSummaryJobTest(APITestCase):
+    """
+    AI 요약 비동기 생성
+    - 요약이 없으면 202 + 작업 조회 URL, 작업은 워커 풀에서 실행
+    - 작업 완료 후 폴링 / 재요청 시 저장된 요약 반환
+    """
+
+    def setUp(self):
+        self.drug = Drug.objects.create(name='타이레놀', effect='두통')
+        patcher = mock.patch('ingredients.ai_summary._submit')
+        self.submit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(f'/api/drugs/{self.drug.pk}/ai-summary/')
+
+    def test_miss_returns_202_and_poll_completes(self):
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', return_value=SUMMARY) as gpt:
+            resp = self.request_summary()
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(resp.data['status'], DrugAiSummaryJob.STATUS_PENDING)
+            self.assertIn('Retry-After', resp)
+            job_id = resp.data['job_id']
+            self.submit.assert_called_once_with(job_id)
+            gpt.assert_not_called()
+
+            poll = self.client.get(resp.data['poll_url'])
+            self.assertEqual(poll.data['status'], DrugAiSummaryJob.STATUS_PENDING)
+
+            run_summary_job(job_id)
+
+        poll = self.client.get(resp.data['poll_url'])
+        self.assertEqual(poll.data['status'], DrugAiSummaryJob.STATUS_DONE)
+        self.assertEqual(poll.data['summary']['one_liner'], '두통약')
+
+        # 이후 요청은 바로 200
+        resp = self.request_summary()
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.data['cached'])
+        self.assertEqual(self.submit.call_count, 1)
+
+    def test_pending_job_is_reused(self):
+        first = self.request_summary()
+        second = self.request_summary()
+        self.assertEqual(first.data['job_id'], second.data['job_id'])
+        self.assertEqual(DrugAiSummaryJob.objects.count(), 1)
+        self.submit.assert_called_once()
+
+    def test_retry_then_success(self):
+        job = DrugAiSummaryJob.objects.create(drug=self.drug)
+        side_effect = [RuntimeError('upstream 500'), SUMMARY]
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', side_effect=side_effect):
+            run_summary_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, DrugAiSummaryJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 2)
+        self.assertTrue(DrugAiSummary.objects.filter(drug=self.drug).exists())
+
+    def test_gives_up_after_max_attempts(self):
+        job = DrugAiSummaryJob.objects.create(drug=self.drug)
+        with mock.patch(
+            'ingredients.ai_summary.call_gpt_for_drug_summary',
+            side_effect=RuntimeError('upstream 500'),
+        ) as gpt:
+            run_summary_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(gpt.call_count, 3)
+        self.assertEqual(job.status, DrugAiSummaryJob.STATUS_FAILED)
+
+        # 실패한 작업 뒤에는 새 작업이 등록됨
+        resp = self.request_summary()
+        self.assertEqual(resp.status_code, 202)
+        self.assertNotEqual(resp.data['job_id'], job.id)
+
+
+@override_settings(AI_SUMMARY_RETRY_BACKOFF=0)
+class DrugAiSummarySingleFlightTest(TransactionTestCase):
+    """
+    요약이 없는 의약품에 여러 요청이 동시에 들어와도
+    - 작업은 하나만 등록되고 GPT 는 정확히 한 번 호출
+    - 모든 요청이 같은 작업의 결과를 받음
+    """
+
+    THREADS = 8
+
+    def test_concurrent_cold_requests_call_upstream_once(self):
+        drug = Drug.objects.create(name='타이레놀', effect='두통')
+        url = f'/api/drugs/{drug.pk}/ai-summary/'
+        calls = []
+
+        def slow_gpt(d):
+            calls.append(d.pk)
+            time.sleep(0.3)
+            return SUMMARY
+
+        responses = []
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def worker():
+            try:
+                barrier.wait()
+                responses.append(APIClient().get(url))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', side_effect=slow_gpt):
+            threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual({r.status_code for r in responses}, {202})
+            job_ids = {r.data['job_id'] for r in responses}
+            self.assertEqual(len(job_ids), 1)
+
+            # 워커 풀에서 작업이 끝날 때까지 대기
+            job_id = job_ids.pop()
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                job = DrugAiSummaryJob.objects.get(pk=job_id)
+                if job.status not in (DrugAiSummaryJob.STATUS_PENDING, DrugAiSummaryJob.STATUS_RUNNING):
+                    break
+                time.sleep(0.05)
+
+            self.assertEqual(job.status, DrugAiSummaryJob.STATUS_DONE)
+            self.assertEqual(APIClient().get(url).status_code, 200)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(DrugAiSummaryJob.objects.filter(drug=drug).count(), 1)
+
+
+class GenerateAiSummariesCommandTest(APITestCase):
+    """
+    generate_ai_summaries 커맨드
+    - 조회수 많은 순으로 생성, 이미 요약이 있는 약은 건너뜀
+    - 중간에 멈춰도 다시 실행하면 남은 약만 처리
+    """
+
+    def setUp(self):
+        self.drugs = [
+            Drug.objects.create(name=f'약{i}', effect='두통', view_count=views)
+            for i, views in enumerate([5, 50, 0, 20])
+        ]
+        DrugAiSummary.objects.create(drug=self.drugs[0], one_liner='기존')
+
+    def run_command(self, **options):
+        out = StringIO()
+        call_command('generate_ai_summaries', workers=1, rate=0, batch_size=2, stdout=out, **options)
+        return out.getvalue()
+
+    def test_most_viewed_first_and_resumable(self):
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', return_value=SUMMARY) as gpt:
+            self.run_command(limit=2)
+            first = [c.args[0].pk for c in gpt.call_args_list]
+            self.assertEqual(first, [self.drugs[1].pk, self.drugs[3].pk])
+
+            out = self.run_command()
+            rest = [c.args[0].pk for c in gpt.call_args_list[2:]]
+            self.assertEqual(rest, [self.drugs[2].pk])
+
+        self.assertIn('drugs/s', out)
+        self.assertEqual(DrugAiSummary.objects.count(), 4)
+        self.assertEqual(DrugAiSummary.objects.get(drug=self.drugs[0]).one_liner, '기존')
+
+    def test_failed_drug_is_skipped_and_retried_next_run(self):
+        def flaky(drug):
+            if drug.pk == self.drugs[1].pk:
+                raise RuntimeError('upstream 500')
+            return SUMMARY
+
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', side_effect=flaky):
+            self.run_command()
+        self.assertFalse(DrugAiSummary.objects.filter(drug=self.drugs[1]).exists())
+        self.assertEqual(DrugAiSummary.objects.count(), 3)
+
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', return_value=SUMMARY) as gpt:
+            self.run_command()
+        gpt.assert_called_once()
+        self.assertTrue(DrugAiSummary.objects.filter(drug=self.drugs[1]).exists())
+
+    def test_summary_created_meanwhile_is_not_counted(self):
+        # GPT 를 기다리는 사이 조회 요청으로 같은 약의 요약이 먼저 저장된 경우
+        def racing(drug):
+            if drug.pk == self.drugs[1].pk:
+                DrugAiSummary.objects.create(drug=drug, one_liner='조회 중 생성')
+            return SUMMARY
+
+        # 테스트 트랜잭션 안에서 저장하도록 GPT 호출을 현재 스레드에서 실행
+        inline_pool = mock.MagicMock()
+        inline_pool.return_value.__enter__.return_value.map = map
+        with mock.patch('ingredients.ai_summary.call_gpt_for_drug_summary', side_effect=racing), \
+                mock.patch('ingredients.ai_summary.ThreadPoolExecutor', inline_pool):
+            result = generate_missing_summaries(workers=1, rate=0, batch_size=3)
+        self.assertEqual((result['generated'], result['existed'], result['failed']), (2, 1, 0))
+        self.assertEqual(DrugAiSummary.objects.get(drug=self.drugs[1]).one_liner, '조회 중 생성')
+
+
+class KeywordCacheTest(APITestCase):
+    """
+    증상 키워드 추출 캐시
+    - 표현만 다른 같은 검색어는 AI 를 한 번만 호출
+    - LRU → DB 순으로 조회, 만료되면 다시 호출
+    """
+
+    def setUp(self):
+        clear_local_cache()
+        reset_cache_stats()
+        patcher = mock.patch('ingredients.utils.request_keywords_from_ai', return_value=['두통'])
+        self.ai = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalize_query(self):
+        key = normalize_query('머리가 아파요')
+        for text in ['머리가아파요!!', '  머리가 아파요ㅠㅠ', '머리가,아파요?']:
+            self.assertEqual(normalize_query(text), key)
+        self.assertNotEqual(normalize_query('머리가 아파'), key)
+
+    def test_repeat_queries_skip_network(self):
+        self.assertEqual(extract_keywords_with_ai('머리가 아파요'), ['두통'])
+        self.assertEqual(extract_keywords_with_ai('머리가아파요!!'), ['두통'])
+        self.ai.assert_called_once()
+        self.assertEqual(cache_stats(), {'local_hit': 1, 'db_hit': 0, 'miss': 1})
+
+        # 다른 프로세스(LRU 비어 있음) → DB 에서 적중
+        clear_local_cache()
+        with self.assertNumQueries(2):
+            self.assertEqual(extract_keywords_with_ai('머리가 아파요'), ['두통'])
+        self.ai.assert_called_once()
+        self.assertEqual(cache_stats()['db_hit'], 1)
+        self.assertEqual(SymptomQueryCache.objects.get().hits, 1)
+
+    def test_expired_entry_is_refreshed(self):
+        extract_keywords_with_ai('열나요')
+        clear_local_cache()
+        SymptomQueryCache.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.ai.return_value = ['발열']
+        self.assertEqual(extract_keywords_with_ai('열나요'), ['발열'])
+        self.assertEqual(self.ai.call_count, 2)
+        self.assertEqual(SymptomQueryCache.objects.get().symptoms, ['발열'])
+
+
+class SymptomLexiconTest(APITestCase):
+    """
+    증상 사전 빠른 경로
+    - 흔한 표현은 AI 호출 없이 사전으로 처리
+    - 모르는 말이 섞여 확신도가 낮으면 AI 로 넘김
+    """
+
+    def setUp(self):
+        self.tylenol = Drug.objects.create(name='타이레놀', effect='두통, 치통, 발열')
+        self.gas = Drug.objects.create(name='까스활명수', effect='소화불량, 식욕감퇴')
+
+    def test_match_symptoms(self):
+        match = match_symptoms('머리가 지끈거리고 열나요')
+        self.assertEqual(match.symptoms, ['두통', '발열'])
+        self.assertEqual(match.confidence, 1.0)
+
+        self.assertEqual(match_symptoms('속이 더부룩해요').symptoms, ['소화불량'])
+        self.assertEqual(match_symptoms('눈이 뻑뻑해요'), ([], 0.0))
+        self.assertLess(match_symptoms('머리가 아프고 눈이 침침해요').confidence, 0.8)
+
+    def test_body_part_must_start_a_word(self):
+        # 공백을 없애고 매칭해도 다른 부위 이름 속의 "이" / "목" 으로 치통 / 인후통이 되지 않음
+        for text in ['가슴이 아파요', '눈이 아파요', '팔이 아파요', '손이 아파요', '몸이 아파요', '발목이 아파요']:
+            with self.subTest(text=text):
+                self.assertEqual(match_symptoms(text), ([], 0.0))
+
+        self.assertEqual(match_symptoms('목이 아파요').symptoms, ['인후통'])
+        self.assertEqual(match_symptoms('열나고, 목이 칼칼해요').symptoms, ['발열', '인후통'])
+        self.assertEqual(match_symptoms('이가 시려요').symptoms, ['치통'])
+        self.assertEqual(match_symptoms('손목이 시큰해요').symptoms, ['관절통'])
+
+    @mock.patch('ingredients.utils.extract_keywords_with_ai')
+    def test_lexicon_path_skips_ai(self, ai):
+        resp = self.client.get('/api/drugs/ai-search/', {'q': '머리가 아파요'})
+        ai.assert_not_called()
+        self.assertEqual(resp.data['symptom_source'], 'lexicon')
+        self.assertEqual(resp.data['detected_symptoms'], ['두통'])
+        self.assertEqual(resp.data['results'][0]['name'], '타이레놀')
+
+    @mock.patch('ingredients.utils.extract_keywords_with_ai', return_value=['소화불량'])
+    def test_low_confidence_falls_back_to_ai(self, ai):
+        resp = self.client.get('/api/drugs/ai-search/', {'q': '밥 먹고 나면 명치가 답답해요'})
+        ai.assert_called_once()
+        self.assertEqual(resp.data['symptom_source'], 'ai')
+        self.assertEqual(resp.data['results'][0]['name'], '까스활명수')
+
+
+class _MockResponsesHandler(BaseHTTPRequestHandler):
+    """
+    /responses 목 서버
+    - stream=true 면 DELAY 간격으로 조각을 SSE(chunked)로 전송
+    - 아니면 전체 생성 시간만큼 기다린 뒤 JSON 한 번에 응답
+    """
+
+    CHUNKS = ['타이레놀은 ', '두통과 ', '발열에 ', '씁니다.']
+    DELAY = 0.1
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        try:
+            self.respond(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 마감 시간으로 먼저 끊은 경우
+            pass
+
+    def respond(self, body):
+
+        if not body.get('stream'):
+            time.sleep(self.DELAY * len(self.CHUNKS))
+            data = json.dumps({'output': [{
+                'role': 'assistant',
+                'content': [{'type': 'output_text', 'text': ''.join(self.CHUNKS)}],
+            }]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        events = [{'type': 'response.output_text.delta', 'delta': c} for c in self.CHUNKS]
+        events.append({'type': 'response.completed'})
+        for event in events:
+            time.sleep(self.DELAY)
+            line = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+            self.wfile.write(f'{len(line):x}\r\n'.encode() + line + b'\r\n')
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+
+class DrugChatStreamTest(APITestCase):
+    """
+    챗봇 SSE 스트리밍
+    - 답변 조각이 생성되는 대로 전달되어 첫 토큰까지 시간(TTFT)이 전체 생성 시간보다 짧음
+    - 마지막에 suggestions / drug 이벤트
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _MockResponsesHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_breakers()
+        self.drug = Drug.objects.create(name='타이레놀', effect='두통')
+        self.url = f'/api/drugs/{self.drug.pk}/chat/'
+        settings_override = override_settings(OPENAI_BASE_URL=self.base_url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def parse_events(self, chunks):
+        events = []
+        for block in ''.join(chunks).split('\n\n'):
+            if not block:
+                continue
+            lines = dict(line.split(': ', 1) for line in block.split('\n'))
+            events.append((lines['event'], json.loads(lines['data'])))
+        return events
+
+    def test_stream_events_and_ttft(self):
+        started = time.monotonic()
+        resp = self.client.post(self.url + '?stream=1', {'message': '효능?'}, format='json')
+        self.assertEqual(resp['Content-Type'], 'text/event-stream; charset=utf-8')
+        self.assertFalse(resp.is_async)
+
+        chunks = []
+        ttft = None
+        for chunk in resp.streaming_content:
+            if ttft is None:
+                ttft = time.monotonic() - started
+            chunks.append(chunk.decode())
+        total = time.monotonic() - started
+
+        events = self.parse_events(chunks)
+        names = [name for name, _ in events]
+        self.assertEqual(names[-3:], ['suggestions', 'drug', 'done'])
+        reply = ''.join(data['text'] for name, data in events if name == 'delta')
+        self.assertEqual(reply, ''.join(_MockResponsesHandler.CHUNKS))
+        self.assertEqual(dict(events)['drug'], {'id': self.drug.pk, 'name': '타이레놀'})
+
+        # 첫 조각은 전체 생성이 끝나기 전에 도착
+        self.assertLess(ttft, total / 2)
+
+        # 기존(블로킹) 방식은 첫 바이트까지 전체 생성 시간이 걸림
+        started = time.monotonic()
+        # (같은 질문은 답변 캐시에 걸리므로 다른 질문으로 비교)
+        blocking = self.client.post(self.url, {'message': '효능이 뭐예요?'}, format='json')
+        blocking_ttft = time.monotonic() - started
+        self.assertEqual(blocking.data['reply'], reply)
+        self.assertLess(ttft, blocking_ttft)
+
+    def test_async_iterator_under_asgi(self):
+        # ASGI 에서는 비동기 이터레이터로 감싸 이벤트마다 바로 전달 (끝까지 모아서 보내지 않음)
+        url, payload, headers = chat_request(self.drug, '효능?')
+        events = stream_chat_events(url, payload, headers, suggestions=[], drug_meta={'id': self.drug.pk})
+        resp = sse_response(AsyncRequestFactory().post(self.url), events)
+        self.assertTrue(resp.is_async)
+
+        async def collect():
+            started = time.monotonic()
+            return [(time.monotonic() - started, chunk.decode()) async for chunk in resp.streaming_content]
+
+        arrivals = async_to_sync(collect)()
+        events = self.parse_events(chunk for _, chunk in arrivals)
+        self.assertEqual([name for name, _ in events][-3:], ['suggestions', 'drug', 'done'])
+        reply = ''.join(data['text'] for name, data in events if name == 'delta')
+        self.assertEqual(reply, ''.join(_MockResponsesHandler.CHUNKS))
+        self.assertLess(arrivals[0][0], arrivals[-1][0] / 2)
+
+    def test_upstream_error_still_ends_with_metadata(self):
+        with override_settings(OPENAI_BASE_URL='http://127.0.0.1:9', HTTP_RETRY_BACKOFF=0):
+            resp = self.client.post(self.url + '?stream=1', {'message': '효능?'}, format='json')
+            events = self.parse_events(c.decode() for c in resp.streaming_content)
+        self.assertEqual([name for name, _ in events], ['error', 'suggestions', 'drug', 'done'])
+
+
+class DrugChatAnswerCacheTest(APITestCase):
+    """
+    챗봇 답변 캐시
+    - (의약품, 정보 버전, 정규화된 질문) 이 같으면 모델을 다시 호출하지 않음
+    - 의약품 정보가 바뀌면 새로 생성, 추천 질문은 미리 생성 가능
+    """
+
+    def setUp(self):
+        self.drug = Drug.objects.create(name='타이레놀', effect='두통')
+        self.url = f'/api/drugs/{self.drug.pk}/chat/'
+        patcher = mock.patch('ingredients.views.request_chat_reply', return_value='두통에 씁니다.')
+        self.upstream = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def ask(self, message):
+        return self.client.post(self.url, {'message': message}, format='json').data
+
+    def test_repeated_question_is_cached(self):
+        self.assertFalse(self.ask('효능')['cached'])
+        data = self.ask(' 효능? ')
+        self.assertTrue(data['cached'])
+        self.assertEqual(data['reply'], '두통에 씁니다.')
+        self.upstream.assert_called_once()
+        self.assertEqual(DrugChatAnswer.objects.get().hits, 1)
+
+    def test_drug_change_invalidates(self):
+        self.ask('효능')
+        self.drug.effect = '두통, 발열'
+        self.drug.save()
+
+        self.assertFalse(self.ask('효능')['cached'])
+        self.assertEqual(self.upstream.call_count, 2)
+        # 이전 버전 답변은 정리됨
+        self.assertEqual(DrugChatAnswer.objects.count(), 1)
+
+    def test_upstream_failure_is_not_cached(self):
+        self.upstream.return_value = None
+        self.ask('효능')
+        self.assertFalse(DrugChatAnswer.objects.exists())
+
+    @override_settings(CHAT_ANSWER_CACHE_MAX_ENTRIES=2, CHAT_ANSWER_CACHE_EVICT_INTERVAL=0)
+    def test_evicts_least_recently_used(self):
+        for question in ['효능', '복용법', '부작용']:
+            self.ask(question)
+        questions = set(DrugChatAnswer.objects.values_list('question', flat=True))
+        self.assertEqual(questions, {'복용법', '부작용'})
+
+    @override_settings(CHAT_ANSWER_CACHE_EVICT_INTERVAL=3600)
+    def test_eviction_is_periodic(self):
+        with mock.patch('ingredients.chat_cache.evict_answers') as evict:
+            for question in ['효능', '복용법', '부작용']:
+                self.ask(question)
+        self.assertLessEqual(evict.call_count, 1)
+
+    def test_long_questions_with_same_prefix_do_not_collide(self):
+        prefix = '이 약을 먹어도 되나요 ' * 30
+        self.upstream.side_effect = ['첫 번째 답변', '두 번째 답변']
+        self.assertEqual(self.ask(prefix + '임산부')['reply'], '첫 번째 답변')
+        self.assertEqual(self.ask(prefix + '어린이')['reply'], '두 번째 답변')
+        self.assertEqual(self.ask(prefix + '임산부')['reply'], '첫 번째 답변')
+        self.assertEqual(DrugChatAnswer.objects.count(), 2)
+        self.assertTrue(all(len(q) == 255 for q in DrugChatAnswer.objects.values_list('question', flat=True)))
+
+    def test_prewarm_serves_chips_without_upstream(self):
+        with mock.patch('ingredients.chat_cache.request_chat_reply', return_value='미리 만든 답변') as prewarm:
+            call_command('prewarm_chat_answers', drug_ids=[self.drug.pk], rate=0, stdout=StringIO())
+            self.assertEqual(prewarm.call_count, 4)
+
+            # 두 번째 실행은 모두 캐시에 있음
+            call_command('prewarm_chat_answers', drug_ids=[self.drug.pk], rate=0, stdout=StringIO())
+            self.assertEqual(prewarm.call_count, 4)
+
+        for chip in ['효능', '복용법', '주의사항', '부작용']:
+            data = self.ask(chip)
+            self.assertTrue(data['cached'])
+            self.assertEqual(data['reply'], '미리 만든 답변')
+        self.upstream.assert_not_called()
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """
+    처음 FAILURES 번은 503, 이후 200 을 돌려주는 서버 (keep-alive)
+    """
+
+    FAILURES = 0
+    protocol_version = 'HTTP/1.1'
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests_seen.append(self.client_address)
+        failing = len(self.requests_seen) <= self.FAILURES
+        body = b'{"ok": false}' if failing else b'{"ok": true}'
+        self.send_response(503 if failing else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.do_GET()
+
+
+@override_settings(HTTP_RETRY_BACKOFF=0)
+class HttpClientTest(APITestCase):
+    """
+    공유 HTTP 클라이언트
+    - 같은 호스트로의 연속 호출은 연결 재사용 (keep-alive)
+    - 429 / 5xx 재시도, upstream 별 지표
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _FlakyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/items'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        _FlakyHandler.requests_seen = []
+        _FlakyHandler.FAILURES = 0
+        http_client.reset_sessions()
+        http_client.reset_metrics()
+        reset_breakers()
+
+    def test_connections_are_reused(self):
+        for _ in range(3):
+            self.assertEqual(http_client.get('drug_api', self.url).json(), {'ok': True})
+        # 클라이언트 포트가 같으면 같은 TCP 연결
+        self.assertEqual(len(set(_FlakyHandler.requests_seen)), 1)
+
+    def test_retries_5xx_and_records_metrics(self):
+        _FlakyHandler.FAILURES = 2
+        resp = http_client.get('drug_api', self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(_FlakyHandler.requests_seen), 3)
+
+        metrics = http_client.upstream_metrics()['drug_api']
+        self.assertEqual(metrics['calls'], 1)
+        self.assertEqual(metrics['errors'], 0)
+        self.assertIsNotNone(metrics['p95_ms'])
+
+    def test_gives_up_after_retry_budget(self):
+        _FlakyHandler.FAILURES = 100
+        with override_settings(HTTP_RETRY_TOTAL=1):
+            resp = http_client.get('drug_api', self.url)
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(len(_FlakyHandler.requests_seen), 2)
+        self.assertEqual(http_client.upstream_metrics()['drug_api']['errors'], 1)
+
+    def test_post_is_not_retried(self):
+        # 모델 호출처럼 과금되는 POST 는 5xx 여도 한 번만 보냄
+        _FlakyHandler.FAILURES = 2
+        resp = http_client.post('drug_api', self.url, json={})
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(len(_FlakyHandler.requests_seen), 1)
+
+    def test_metrics_endpoint_requires_admin(self):
+        http_client.get('drug_api', self.url)
+        self.assertEqual(self.client.get('/api/metrics/upstreams/').status_code, 401)
+
+        admin = User.objects.create_superuser(username='admin', password='pw', nickname='admin')
+        self.client.force_authenticate(admin)
+        resp = self.client.get('/api/metrics/upstreams/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['drug_api']['calls'], 1)
+
+
+class CircuitBreakerTest(APITestCase):
+    """
+    회로 차단기 상태 전이
+    closed → (실패 비율 초과) → open → (대기) → half_open → 성공 시 closed / 실패 시 open
+    """
+
+    def make(self, **kwargs):
+        options = dict(window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=1.0, open_seconds=0.05)
+        options.update(kwargs)
+        return CircuitBreaker('test', **options)
+
+    def test_opens_on_failure_rate_and_recovers(self):
+        breaker = self.make()
+        for ok in (True, False, True, False):
+            breaker.before_call()
+            breaker.record(ok, 0.01)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.before_call()
+        # 시험 호출 중에는 다른 호출 거절
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record(True, 0.01)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = self.make()
+        for _ in range(4):
+            breaker.record(True, 2.0)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_failed_probe_reopens(self):
+        breaker = self.make()
+        for _ in range(4):
+            breaker.record(False, 0.01)
+        time.sleep(0.06)
+        breaker.before_call()
+        breaker.record(False, 0.01)
+        self.assertEqual(breaker.state, OPEN)
+
+
+class DegradedResponseTest(APITestCase):
+    """
+    GMS 장애 / 지연 시 API 별 대체 응답
+    - 요약: 저장된 요약은 그대로, 없으면 작업을 쌓지 않고 503
+    - ai-search: 일반 검색으로 대체
+    - 챗봇: 바로 "일시적으로 사용할 수 없음"
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _MockResponsesHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_breakers()
+        self.addCleanup(reset_breakers)
+        self.drug = Drug.objects.create(name='까스활명수', effect='소화불량, 식욕감퇴')
+
+    def open_circuit(self, upstream='openai'):
+        breaker = get_breaker(upstream)
+        for _ in range(breaker.min_calls):
+            breaker.record(False, 0.01)
+        self.assertEqual(breaker.state, OPEN)
+
+    @mock.patch('ingredients.views.request_chat_reply')
+    def test_chat_fails_fast_when_open(self, upstream):
+        self.open_circuit()
+        url = f'/api/drugs/{self.drug.pk}/chat/'
+
+        resp = self.client.post(url, {'message': '효능'}, format='json')
+        self.assertEqual(resp.status_code, 503)
+        self.assertIn('일시적으로', resp.data['reply'])
+        upstream.assert_not_called()
+
+        resp = self.client.post(url + '?stream=1', {'message': '효능'}, format='json')
+        body = b''.join(resp.streaming_content).decode()
+        self.assertTrue(body.startswith('event: error'))
+        self.assertIn('event: done', body)
+
+    def test_chat_deadline(self):
+        # 목 서버는 0.4초 뒤에 응답 → 0.1초 마감이면 바로 503
+        with override_settings(OPENAI_BASE_URL=self.base_url, CHAT_DEADLINE=0.1):
+            started = time.monotonic()
+            resp = self.client.post(f'/api/drugs/{self.drug.pk}/chat/', {'message': '효능'}, format='json')
+            elapsed = time.monotonic() - started
+        self.assertEqual(resp.status_code, 503)
+        self.assertLess(elapsed, 0.35)
+
+    def test_ai_search_falls_back_to_plain_search(self):
+        with mock.patch('ingredients.utils.request_keywords_from_ai', side_effect=CircuitOpenError('open')):
+            resp = self.client.get('/api/drugs/ai-search/', {'q': '명치가 답답하고 소화불량'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['symptom_source'], 'fallback')
+        self.assertEqual([d['name'] for d in resp.data['results']], ['까스활명수'])
+
+    def test_summary_when_open(self):
+        self.open_circuit('openai_summary')
+        resp = self.client.get(f'/api/drugs/{self.drug.pk}/ai-summary/')
+        self.assertEqual(resp.status_code, 503)
+        self.assertFalse(DrugAiSummaryJob.objects.exists())
+
+        DrugAiSummary.objects.create(drug=self.drug, one_liner='소화제')
+        resp = self.client.get(f'/api/drugs/{self.drug.pk}/ai-summary/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['one_liner'], '소화제')
+
+    def test_summary_breaker_is_separate(self):
+        # 느린 요약 호출은 챗봇 / 검색 회로를 열지 않음
+        summary = get_breaker('openai_summary')
+        for _ in range(summary.min_calls):
+            summary.record(True, 15.0)
+        self.assertEqual(summary.state, CLOSED)
+        self.assertEqual(get_breaker('openai').state, CLOSED)
+
+        self.open_circuit('openai_summary')
+        self.assertEqual(get_breaker('openai').state, CLOSED)
+
+        # 챗봇 회로가 열려도 요약 작업은 등록됨
+        reset_breakers()
+        self.open_circuit('openai')
+        with mock.patch('ingredients.ai_summary._submit'):
+            resp = self.client.get(f'/api/drugs/{self.drug.pk}/ai-summary/')
+        self.assertEqual(resp.status_code, 202)
+
+
+class MockUpstreamTest(APITestCase):
+    """
+    부하 테스트용 목 upstream 서버
+    - 실제 호출 코드(http_client 경유)가 그대로 목 서버와 통신할 수 있어야 함
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = MockUpstreamConfig(latency=0, chunk_delay=0, stream_chunks=3, drugs=250)
+        cls.server = start_mock_upstream(config=cls.config)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.config.error_rate = 0
+        http_client.reset_sessions()
+        reset_breakers()
+
+    def test_drug_list_paging(self):
+        with override_settings(E_DRUG_API_URL=f'{self.base_url}/getDrbEasyDrugList'):
+            items = fetch_all_drugs_from_api()
+        self.assertEqual(len(items), 250)
+        self.assertEqual(len({item['itemSeq'] for item in items}), 250)
+        self.assertTrue(items[2]['itemImage'].endswith('/images/3.jpg'))
+        self.assertIsNone(items[0]['itemImage'])
+
+    def test_drug_list_fetched_concurrently(self):
+        self.config.latency = 0.1
+        try:
+            stats = {}
+            with override_settings(
+                E_DRUG_API_URL=f'{self.base_url}/getDrbEasyDrugList',
+                E_DRUG_API_PAGE_SIZE=25,
+                E_DRUG_API_FETCH_WORKERS=5,
+            ):
+                started = time.monotonic()
+                items = fetch_all_drugs_from_api(stats=stats)
+                elapsed = time.monotonic() - started
+        finally:
+            self.config.latency = 0
+
+        # 10 페이지: 첫 페이지 + 나머지 9 페이지를 5개씩 동시에 → 순차 조회(1초)보다 빠름
+        self.assertEqual([item['itemSeq'] for item in items], [str(200000000 + n) for n in range(1, 251)])
+        self.assertEqual(stats['total'], 250)
+        self.assertEqual(stats['pages'], 10)
+        self.assertEqual(stats['items'], 250)
+        self.assertLess(elapsed, 0.7)
+
+    def test_drug_list_page_retry(self):
+        self.config.error_rate = 0.3
+        with override_settings(
+            E_DRUG_API_URL=f'{self.base_url}/getDrbEasyDrugList',
+            E_DRUG_API_PAGE_SIZE=10,
+            HTTP_RETRY_BACKOFF=0,
+            CIRCUIT_BREAKER={'min_calls': 1000},
+        ):
+            items = fetch_all_drugs_from_api()
+        self.assertEqual(len(items), 250)
+
+    def test_chat_completions_shapes(self):
+        drug = Drug.objects.create(name='타이레놀', effect='두통', usage='1정', warning='없음')
+        with override_settings(OPENAI_BASE_URL=f'{self.base_url}/v1'):
+            summary = call_gpt_for_drug_summary(drug)
+            keywords = request_keywords_from_ai('머리가 아파요')
+        self.assertIn('one_liner', summary)
+        self.assertEqual(len(keywords), 2)
+
+    def test_responses_stream(self):
+        resp = requests.post(f'{self.base_url}/v1/responses', json={'stream': True}, stream=True)
+        deltas = list(iter_output_deltas(resp))
+        self.assertEqual(deltas, ['목 답변 1. ', '목 답변 2. ', '목 답변 3. '])
+
+    def test_error_rate(self):
+        self.config.error_rate = 1
+        resp = requests.get(f'{self.base_url}/getDrbEasyDrugList')
+        self.assertIn(resp.status_code, (500, 429))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+
+class EffectIndexTest(APITestCase):
+    """
+    효능 벡터 색인 (TF-IDF 문자 n-gram, 코사인 top-k)
+    - 관련도 순 정렬 / 점수 / top_k 제한
+    - 카탈로그 변경 시 재생성
+    """
+
+    def setUp(self):
+        self.tylenol = Drug.objects.create(name='타이레놀', effect='두통, 치통, 발열, 오한의 완화')
+        self.gebo = Drug.objects.create(name='게보린', effect='두통, 생리통')
+        self.gas = Drug.objects.create(name='까스활명수', effect='소화불량, 식욕감퇴, 과식, 체함')
+        self.pas = Drug.objects.create(name='파스', effect='근육통, 관절통, 요통')
+
+    def test_ranked_by_similarity(self):
+        hits = effect_index.search_effects(['생리통', '두통'])
+        ids = [pk for pk, _ in hits]
+        self.assertEqual(ids[:2], [self.gebo.pk, self.tylenol.pk])
+        self.assertNotIn(self.gas.pk, ids)
+
+        scores = [score for _, score in hits]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(all(0 < score <= 1.0001 for score in scores))
+
+    def test_top_k(self):
+        self.assertEqual(len(effect_index.search_effects(['두통', '근육통'], top_k=1)), 1)
+        self.assertEqual(effect_index.search_effects(['없는증상']), [])
+
+    def test_arrays_are_memory_mapped(self):
+        index = effect_index.get_index()
+        self.assertIsInstance(index.weights, np.memmap)
+        self.assertEqual(index.meta['drugs'], 4)
+
+    def test_rebuilt_on_catalog_changes(self):
+        build_id = effect_index.get_index().meta['build_id']
+
+        # 저장 시그널
+        self.pas.effect = '소화불량, 위통'
+        self.pas.save()
+        self.assertIn(self.pas.pk, [pk for pk, _ in effect_index.search_effects(['소화불량'])])
+        self.assertNotEqual(effect_index.get_index().meta['build_id'], build_id)
+
+        # 시그널이 없는 bulk_create 는 카탈로그 변화(개수 / 최대 id)로 감지
+        Drug.objects.bulk_create([Drug(name='베아제', effect='소화불량, 위부팽만감')])
+        with override_settings(EFFECT_INDEX_CHECK_INTERVAL=0):
+            names = Drug.objects.filter(pk__in=[pk for pk, _ in effect_index.search_effects(['소화불량'])])
+            self.assertIn('베아제', set(names.values_list('name', flat=True)))
+
+    @override_settings(EFFECT_INDEX_KEEP_BUILDS=2)
+    def test_keeps_recent_builds(self):
+        builds = [effect_index.build_effect_index()['build_id'] for _ in range(4)]
+        root = Path(settings.EFFECT_INDEX_DIR)
+        remaining = {path.name for path in root.iterdir() if path.is_dir()}
+        self.assertEqual(remaining, set(builds[-2:]))
+        self.assertEqual(effect_index.get_index().meta['build_id'], builds[-1])
+
+    def test_only_effect_changes_mark_stale(self):
+        drug = Drug.objects.get(pk=self.pas.pk)
+        with mock.patch('ingredients.signals.mark_stale') as mark_stale:
+            # 이미지 저장처럼 이름 / 효능이 그대로인 저장은 색인을 건드리지 않음
+            drug.image_url = 'https://example.com/pas.jpg'
+            drug.save()
+            mark_stale.assert_not_called()
+
+            drug.effect = '근육통, 타박상'
+            drug.save()
+            mark_stale.assert_called_once()
+
+    @mock.patch('ingredients.utils.extract_keywords_with_ai', return_value=['생리통', '두통'])
+    def test_ai_search_returns_scores(self, _):
+        resp = self.client.get('/api/drugs/ai-search/', {'q': '머리가 아프고 생리통이 있어요'})
+        self.assertEqual(resp.status_code, 200)
+        results = resp.data['results']
+        self.assertEqual([d['name'] for d in results][:2], ['게보린', '타이레놀'])
+        self.assertGreater(results[0]['search_score'], results[1]['search_score'])
+
+
+class EffectIndexBackgroundRebuildTest(TransactionTestCase):
+    """
+    색인 재생성은 백그라운드에서, 그동안은 마지막 색인으로 검색
+    """
+
+    def setUp(self):
+        self.index_dir = tempfile.TemporaryDirectory()
+        self.override = override_settings(
+            EFFECT_INDEX_DIR=self.index_dir.name,
+            EFFECT_INDEX_BACKGROUND_REBUILD=True,
+        )
+        self.override.enable()
+        effect_index.reset_index()
+
+    def tearDown(self):
+        self.override.disable()
+        self.index_dir.cleanup()
+        effect_index.reset_index()
+
+    def test_serves_previous_build_while_rebuilding(self):
+        Drug.objects.create(name='게보린', effect='두통, 생리통')
+        first = effect_index.get_index()
+        Drug.objects.create(name='까스활명수', effect='소화불량, 체함')
+
+        release = threading.Event()
+        build = effect_index.build_effect_index
+
+        def slow_build():
+            release.wait(5)
+            return build()
+
+        with mock.patch.object(effect_index, 'build_effect_index', slow_build):
+            self.assertIs(effect_index.get_index(), first)
+            self.assertEqual(effect_index.search_effects(['소화불량']), [])
+            release.set()
+            effect_index._rebuild_thread.join(5)
+
+        index = effect_index.get_index()
+        self.assertNotEqual(index.meta['build_id'], first.meta['build_id'])
+        self.assertEqual(index.meta['drugs'], 2)
+
+    def test_rebuild_skipped_while_other_process_builds(self):
+        Drug.objects.create(name='게보린', effect='두통, 생리통')
+        first = effect_index.get_index()
+        Drug.objects.create(name='까스활명수', effect='소화불량, 체함')
+
+        with effect_index.build_lock(blocking=False) as acquired:
+            self.assertTrue(acquired)
+            with mock.patch.object(effect_index, '_build') as build:
+                effect_index.get_index()
+                effect_index._rebuild_thread.join(5)
+            build.assert_not_called()
+
+        # 잠금이 풀린 뒤 다음 확인에서 다시 시도
+        with override_settings(EFFECT_INDEX_CHECK_INTERVAL=0):
+            effect_index.get_index()
+            effect_index._rebuild_thread.join(5)
+            self.assertNotEqual(effect_index.get_index().meta['build_id'], first.meta['build_id'])
+
+
+class DrugAiSearchRankingTest(APITestCase):
+    """
+    AI 증상 검색 결과 정렬 / 페이지
+    - 일치한 증상 수가 많을수록, 효능 문장 앞쪽에 나올수록 먼저
+    - limit / offset 페이지, count 는 별도 COUNT 쿼리 없이
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.both = Drug.objects.create(name='종합감기약', effect='발열, 두통, 콧물의 완화')
+        cls.head_first = Drug.objects.create(name='두통약', effect='두통, 치통, 생리통')
+        cls.head_last = Drug.objects.create(name='진통제', effect='치통, 생리통, 요통, 근육통, 두통')
+        cls.others = [
+            Drug.objects.create(name=f'해열제{i}', effect=f'발열, 오한 {i}')
+            for i in range(5)
+        ]
+
+    def search(self, **params):
+        with mock.patch('ingredients.utils.extract_keywords_with_ai', return_value=['두통', '발열']):
+            return self.client.get('/api/drugs/ai-search/', {'q': '머리가 아프고 열이 나요', **params})
+
+    def test_score(self):
+        self.assertGreater(
+            score_symptom_match('두통, 발열', {'두통', '발열'}, 0.1),
+            score_symptom_match('두통', {'두통', '발열'}, 1.0),
+        )
+        self.assertGreater(
+            score_symptom_match('두통, 치통', {'두통'}, 0.5),
+            score_symptom_match('치통, 두통', {'두통'}, 0.5),
+        )
+
+    def test_ranked_by_symptom_coverage_and_position(self):
+        resp = self.search(limit=50)
+        names = [d['name'] for d in resp.data['results']]
+        self.assertEqual(names[0], '종합감기약')
+        self.assertLess(names.index('두통약'), names.index('진통제'))
+        self.assertEqual(resp.data['count'], 8)
+        self.assertIsNone(resp.data['next'])
+
+    def test_removed_drugs_are_hidden(self):
+        self.search()    # 색인 생성
+        # 색인이 다시 만들어지기 전에 목록에서 빠진 의약품도 결과에 나오지 않아야 함
+        Drug.objects.filter(pk=self.head_first.pk).update(removed_at=timezone.now())
+        names = [d['name'] for d in self.search(limit=50).data['results']]
+        self.assertNotIn('두통약', names)
+        self.assertIn('진통제', names)
+
+    def test_paginated(self):
+        first = self.search(limit=3)
+        self.assertEqual(first.data['count'], 8)
+        self.assertEqual(len(first.data['results']), 3)
+        self.assertIn('offset=3', first.data['next'])
+
+        rest = self.search(limit=50, offset=3)
+        seen = [d['id'] for d in first.data['results']] + [d['id'] for d in rest.data['results']]
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len(set(seen)), 8)
+
+        self.assertEqual(self.search(limit='x').status_code, 400)
+
+    def test_queries_do_not_depend_on_match_count(self):
+        self.search(limit=2)    # 색인 생성
+        with CaptureQueriesContext(connection) as ctx:
+            self.search(limit=2)
+        small = len(ctx.captured_queries)
+
+        for i in range(20):
+            Drug.objects.create(name=f'두통해열제{i}', effect='두통, 발열')
+        self.search(limit=2)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.search(limit=2)
+        self.assertEqual(len(ctx.captured_queries), small)
+        self.assertEqual(resp.data['count'], 28)
+
+
+class DrugIngestTest(TransactionTestCase):
+    """
+    의약품 목록 적재 파이프라인
+    - 페이지 스트림 → 배치 bulk_create (배치마다 INSERT / 커밋 1번)
+    - 이미지는 적재 뒤 별도 단계에서
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = start_mock_upstream(config=MockUpstreamConfig(latency=0, drugs=95, image_every=10))
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.media = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.media.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        http_client.reset_sessions()
+        reset_breakers()
+        overrides = override_settings(
+            E_DRUG_API_URL=f'{self.base_url}/getDrbEasyDrugList',
+            E_DRUG_API_PAGE_SIZE=10,
+            MEDIA_ROOT=self.media.name,
+            DRUG_AUTOLOAD_LOCK=f'{self.media.name}/bootstrap.lock',
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def client_get(self, **params):
+        return APIClient().get('/api/drugs/', params).data
+
+    def test_batched_inserts(self):
+        with CaptureQueriesContext(connection) as ctx:
+            result = ingest_drugs(batch_size=40)
+
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "ingredients_drug"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(result['drugs'], 95)
+        self.assertEqual(result['batches'], 3)
+        self.assertEqual(Drug.objects.count(), 95)
+
+        # 색인 / 통계 행도 함께 맞춰짐 (도움순 목록은 통계 행과 INNER JOIN)
+        self.assertEqual({d['name'] for d in self.client_get(search='모의약품95')}, {'모의약품95정'})
+        self.assertEqual(DrugStats.objects.count(), 95)
+        self.assertEqual(len(self.client_get(order='helpful')), 95)
+        drug = Drug.objects.get(name='모의약품7정')
+        self.assertEqual(drug.item_seq, '200000007')
+        self.assertEqual(drug.effect, '이 약은 소화불량, 식욕감퇴, 과식, 체함, 소화촉진에 사용합니다.')
+        self.assertFalse(drug.image)
+
+    def test_pages_are_streamed(self):
+        pulled = []
+
+        def pages():
+            for n in range(5):
+                pulled.append(n)
+                yield [{'itemName': f'약{n}-{i}', 'efcyQesitm': '두통'} for i in range(10)]
+
+        counts = []
+        ingest_drugs(pages(), batch_size=20, progress=lambda count: counts.append((count, len(pulled))))
+        # 첫 배치는 두 페이지만 읽은 상태에서 저장됨
+        self.assertEqual(counts[0], (20, 2))
+        self.assertEqual(counts[-1][0], 50)
+
+    def test_images_fetched_in_later_stage(self):
+        ingest_drugs()
+        result = fetch_missing_images(workers=4, batch_size=4)
+        self.assertEqual(result, {'saved': 9, 'failed': 0})
+
+        with_image = Drug.objects.exclude(image='')
+        self.assertEqual(with_image.count(), 9)
+        self.assertTrue(all(d.image.name.startswith('drugs/') for d in with_image))
+
+        # 다시 실행하면 남은 것이 없음
+        self.assertEqual(fetch_missing_images(), {'saved': 0, 'failed': 0})
+
+    def test_bootstrap_runs_once(self):
+        # 다른 프로세스(여기서는 다른 파일 핸들)가 잠금을 잡고 있으면 건너뜀
+        with catalog_lock() as acquired:
+            self.assertTrue(acquired)
+            with catalog_lock() as second:
+                self.assertFalse(second)
+            self.assertIsNone(bootstrap_catalog())
+        self.assertFalse(Drug.objects.exists())
+
+        result = bootstrap_catalog()
+        self.assertEqual(result['drugs'], 95)
+        self.assertEqual(result['images']['saved'], 9)
+        # 이미 채워져 있으면 다시 적재하지 않음
+        self.assertIsNone(bootstrap_catalog())
+        self.assertEqual(Drug.objects.count(), 95)
+
+    def test_app_ready_does_no_io(self):
+        with CaptureQueriesContext(connection) as ctx, mock.patch.object(http_client, 'request') as upstream:
+            apps.get_app_config('ingredients').ready()
+        self.assertEqual(ctx.captured_queries, [])
+        upstream.assert_not_called()
+
+
+class DrugSyncTest(APITestCase):
+    """
+    itemSeq 기준 증분 동기화
+    - 새 항목 추가 / 바뀐 항목만 갱신 / 사라진 항목은 removed_at 표시
+    - 바뀐 것이 없으면 의약품 테이블에 쓰지 않음
+    """
+
+    def item(self, n, effect='두통', image=None):
+        return {
+            'itemSeq': str(n),
+            'itemName': f'약{n}',
+            'efcyQesitm': effect,
+            'useMethodQesitm': '1일 3회',
+            'atpnWarnQesitm': '주의',
+            'itemImage': image,
+        }
+
+    def catalog(self, *items):
+        # 페이지 2개로 나눠서 전달
+        return [list(items[:2]), list(items[2:])]
+
+    def sync(self, *items, total=None, **kwargs):
+        # total: API 가 알려준 totalCount (기본은 전달한 항목 수 = 전체 목록을 다 받음)
+        stats = {'total': len(items) if total is None else total}
+        return sync_drugs(self.catalog(*items), stats=stats, **kwargs)
+
+    def test_sync(self):
+        items = [self.item(n) for n in range(1, 6)]
+        result = self.sync(*items, batch_size=2)
+        self.assertEqual(
+            {k: result[k] for k in ('inserted', 'updated', 'unchanged', 'removed')},
+            {'inserted': 5, 'updated': 0, 'unchanged': 0, 'removed': 0},
+        )
+        self.assertEqual(DrugStats.objects.filter(drug__item_seq__isnull=False).count(), 5)
+
+        # 변경 없음 → 조회만
+        with CaptureQueriesContext(connection) as ctx:
+            result = self.sync(*items, batch_size=2)
+        self.assertEqual(result['unchanged'], 5)
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE'))]
+        self.assertEqual(writes, [])
+
+        # 1 변경, 5 삭제, 6 추가
+        items = [self.item(1, effect='발열'), *items[1:4], self.item(6)]
+        result = self.sync(*items)
+        self.assertEqual(
+            {k: result[k] for k in ('inserted', 'updated', 'unchanged', 'removed')},
+            {'inserted': 1, 'updated': 1, 'unchanged': 3, 'removed': 1},
+        )
+        self.assertEqual(Drug.objects.get(item_seq='1').effect, '발열')
+
+        removed = Drug.objects.get(item_seq='5')
+        self.assertIsNotNone(removed.removed_at)
+        names = {d['name'] for d in self.client.get('/api/drugs/').data}
+        self.assertNotIn('약5', names)
+        self.assertIn('약6', names)
+
+        # 다시 나타나면 복구
+        result = self.sync(*items, self.item(5))
+        self.assertEqual(result['updated'], 1)
+        self.assertIsNone(Drug.objects.get(item_seq='5').removed_at)
+
+    def test_command_skips_while_catalog_locked(self):
+        # 초기 적재 등 다른 프로세스가 잠금을 잡고 있으면 동기화하지 않음
+        with tempfile.TemporaryDirectory() as tmp, override_settings(DRUG_AUTOLOAD_LOCK=f'{tmp}/bootstrap.lock'):
+            with catalog_lock(), mock.patch('ingredients.management.commands.sync_drugs.sync_drugs') as sync:
+                with self.assertRaises(CommandError):
+                    call_command('sync_drugs', stdout=StringIO())
+            sync.assert_not_called()
+
+    def test_empty_catalog_removes_nothing(self):
+        self.sync(self.item(1))
+        self.assertEqual(sync_drugs([[]], stats={'total': 0})['removed'], 0)
+        self.assertIsNone(Drug.objects.get(item_seq='1').removed_at)
+
+    def test_incomplete_catalog_removes_nothing(self):
+        self.sync(self.item(1), self.item(2), self.item(3))
+        # 3페이지 중 일부만 받은 경우
+        result = self.sync(self.item(1), self.item(2), total=3)
+        self.assertEqual(result['removed'], 0)
+        self.assertFalse(result['complete'])
+        self.assertIsNone(Drug.objects.get(item_seq='3').removed_at)
+
+        # stats 없이 목록만 넘기면 전체 여부를 알 수 없으므로 삭제 표시 안 함
+        self.assertEqual(sync_drugs(self.catalog(self.item(1)))['removed'], 0)
+
+    def test_unmatched_legacy_rows_are_removed(self):
+        Drug.objects.create(name='약1', effect='옛 효능')
+        gone = Drug.objects.create(name='단종된 약', effect='옛 효능')
+
+        self.assertEqual(self.sync(self.item(1), self.item(2), total=5)['removed'], 0)
+        gone.refresh_from_db()
+        self.assertIsNone(gone.removed_at)
+
+        result = self.sync(self.item(1), self.item(2))
+        self.assertEqual(result['removed'], 1)
+        gone.refresh_from_db()
+        self.assertIsNotNone(gone.removed_at)
+        self.assertIsNone(Drug.objects.get(item_seq='1').removed_at)
+
+    def test_links_legacy_rows_by_name(self):
+        legacy = Drug.objects.create(name='약1', effect='옛 효능')
+        result = self.sync(self.item(1), self.item(2))
+        self.assertEqual((result['inserted'], result['updated']), (1, 1))
+
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.item_seq, '1')
+        self.assertEqual(legacy.effect, '두통')
+
+    def test_image_url_change_clears_image(self):
+        self.sync(self.item(1, image='http://img/a'))
+        Drug.objects.filter(item_seq='1').update(image='drugs/a.jpg')
+
+        self.sync(self.item(1, image='http://img/a'), self.item(2))
+        self.assertEqual(Drug.objects.get(item_seq='1').image.name, 'drugs/a.jpg')
+
+        self.sync(self.item(1, image='http://img/b'), self.item(2))
+        self.assertFalse(Drug.objects.get(item_seq='1').image)
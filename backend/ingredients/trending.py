@@ -0,0 +1,133 @@
+# ingredients/trending.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Drug, DrugViewBucket, TrendingDrug
+
+
+# 집계 기간 (None 은 전체 기간 = Drug.view_count, 인덱스로 바로 읽으므로 미리 계산하지 않음)
+WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    'all': None,
+}
+
+
+def truncate_hour(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+# ============================
+# 시간별 조회수 기록
+# ============================
+def record_hourly_views(counts, now=None):
+    """
+    {drug_id: 조회수} 를 현재 시간대 버킷에 더함
+    - 조회수 버퍼 flush 때 함께 호출 (INSERT ... ON CONFLICT DO UPDATE 1회)
+    """
+    if not counts:
+        return
+
+    hour = truncate_hour(now or timezone.now())
+    table = DrugViewBucket._meta.db_table
+    hour_value = connection.ops.adapt_datetimefield_value(hour)
+
+    # 그 사이 삭제된 의약품은 SELECT 결과가 없어 자연스럽게 건너뜀
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {table} (drug_id, hour, count) '
+            f'SELECT id, %s, %s FROM {Drug._meta.db_table} WHERE id = %s '
+            f'ON CONFLICT (drug_id, hour) DO UPDATE SET count = {table}.count + excluded.count',
+            [(hour_value, count, drug_id) for drug_id, count in counts.items()],
+        )
+
+
+# ============================
+# 기간별 TOP-K 계산
+# ============================
+def compute_top(window, k, now=None):
+    """
+    기간 내 조회수 상위 k개 → [(drug_id, views), ...]
+    """
+    span = WINDOWS[window]
+
+    if span is None:
+        return list(
+            Drug.objects
+            .order_by('-view_count', '-id')
+            .values_list('id', 'view_count')[:k]
+        )
+
+    since = truncate_hour(now or timezone.now()) - span + timedelta(hours=1)
+    return list(
+        DrugViewBucket.objects
+        .filter(hour__gte=since)
+        .values('drug')
+        .annotate(views=Sum('count'))
+        .order_by('-views', '-drug')
+        .values_list('drug', 'views')[:k]
+    )
+
+
+def refresh_trending(k=None, now=None, prune=True):
+    """
+    기간별(24h / 7d / 30d) TOP-K 를 다시 계산해 TrendingDrug 에 저장 (주기 작업)
+    - prune=True 면 가장 긴 기간보다 오래된 버킷 삭제
+
+    반환값: {window: 저장된 행 수}
+    """
+    k = k or settings.TRENDING_TOP_K
+    now = now or timezone.now()
+    result = {}
+
+    for window, span in WINDOWS.items():
+        if span is None:
+            continue
+        top = compute_top(window, k, now=now)
+
+        # 기간별로 교체해서 조회 중에도 빈 목록이 보이지 않도록 함
+        with transaction.atomic():
+            TrendingDrug.objects.filter(window=window).delete()
+            TrendingDrug.objects.bulk_create([
+                TrendingDrug(window=window, rank=rank, drug_id=drug_id, views=views, computed_at=now)
+                for rank, (drug_id, views) in enumerate(top, start=1)
+            ])
+        result[window] = len(top)
+
+    if prune:
+        oldest = max(span for span in WINDOWS.values() if span)
+        DrugViewBucket.objects.filter(hour__lt=truncate_hour(now) - oldest).delete()
+
+    return result
+
+
+# ============================
+# 조회
+# ============================
+def trending_drugs(queryset, window):
+    """
+    미리 계산된 TOP-K 순서대로 의약품 리스트 반환 (K 건만 읽음)
+    - 아직 계산된 적이 없으면 그 자리에서 계산한 순서 사용
+    - 전체 기간은 스냅샷 없이 (view_count, id) 인덱스로 바로 읽음
+    """
+    if WINDOWS[window] is None:
+        return list(queryset.order_by('-view_count', '-id')[:settings.TRENDING_TOP_K])
+
+    drugs = list(
+        queryset
+        .filter(trending_entries__window=window)
+        .order_by('trending_entries__rank')
+    )
+    if drugs or TrendingDrug.objects.filter(window=window).exists():
+        return drugs
+
+    top = compute_top(window, settings.TRENDING_TOP_K)
+    order = {drug_id: i for i, (drug_id, _) in enumerate(top)}
+    drugs = list(queryset.filter(pk__in=order))
+    drugs.sort(key=lambda d: order[d.pk])
+    return drugs
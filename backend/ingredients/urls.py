@@ -18,6 +18,9 @@ urlpatterns = [
     # 의약품 반응 (도움됨 / 도움안됨)
     path('drugs/<int:drug_id>/reaction/', views.drug_reaction),
 
+    # 여러 의약품 반응 요약 (목록 카드용)
+    path('drugs/reactions/', views.drug_reactions_batch),
+
     # 조회수 기준 인기 의약품
     path('drugs/popular/views/', views.popular_drugs_by_view),
 
@@ -37,6 +40,13 @@ urlpatterns = [
     # AI 요약 정보 조회
     path('drugs/<int:pk>/ai-summary/', views.drug_ai_summary),
 
+    # AI 요약 생성 작업 상태 조회
+    path(
+        'drugs/<int:pk>/ai-summary/jobs/<int:job_id>/',
+        views.drug_ai_summary_job,
+        name='drug-ai-summary-job',
+    ),
+
     # 의약품 전용 챗봇
     path('drugs/<int:pk>/chat/', views.drug_chat, name='drug_chat'),
 
@@ -47,4 +57,12 @@ urlpatterns = [
 
     # 의약품 정보 QR 코드 생성
     path('drugs/<int:drug_id>/qr/', views.generate_drug_qr, name='drug-qr'),
+
+
+    # --------------------
+    #  운영
+    # --------------------
+
+    # 외부 API 호출 지표 (관리자)
+    path('metrics/upstreams/', views.upstream_metrics),
 ]
@@ -1,92 +1,133 @@
 # ingredients/utils.py
-import requests
 import json
+import logging
+import math
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+import requests
+
 from django.conf import settings
-from django.db import connection
-from django.db.models import Q
 from django.core.files.base import ContentFile
 
+from . import http_client
+from .effect_index import search_effects
+from .keyword_cache import get_cached_symptoms, normalize_query, store_symptoms
 from .models import Drug
+from .symptom_lexicon import is_confident, match_symptoms
 
-
-BASE_URL = "https://apis.data.go.kr/1471000/DrbEasyDrugInfoService/getDrbEasyDrugList"
-GMS_OPENAI_URL = "https://gms.ssafy.io/gmsapi/api.openai.com/v1/chat/completions"
+logger = logging.getLogger(__name__)
 
 
 # ============================
 # e약은on API 연동
 # ============================
-def fetch_all_drugs_from_api():
-    """
-    e약은on API에서 전체 의약품 목록을 페이지 단위로 순회하여 가져옴
+def fetch_drug_page(page, rows=None):
     """
-    page = 1
-    all_items = []
+    e약은on API 한 페이지 조회 (실패 시 E_DRUG_API_PAGE_ATTEMPTS 번까지 다시 시도)
 
-    while True:
-        params = {
-            "serviceKey": settings.E_DRUG_API_KEY,
-            "pageNo": page,
-            "numOfRows": 100,
-            "type": "json",
-        }
-
-        response = requests.get(BASE_URL, params=params)
-
-        # API 요청 실패 시 예외 발생
-        if response.status_code != 200:
-            raise Exception(f"API 요청 실패: {response.status_code}")
-
-        data = response.json()
-        items = data.get("body", {}).get("items", [])
+    반환값: 응답 body dict (items / totalCount ...)
+    """
+    params = {
+        "serviceKey": settings.E_DRUG_API_KEY,
+        "pageNo": page,
+        "numOfRows": rows or settings.E_DRUG_API_PAGE_SIZE,
+        "type": "json",
+    }
 
-        # 더 이상 데이터가 없으면 종료
-        if not items:
-            break
+    attempts = settings.E_DRUG_API_PAGE_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        try:
+            response = http_client.get('drug_api', settings.E_DRUG_API_URL, params=params)
+            # API 요청 실패 시 예외 발생
+            if response.status_code != 200:
+                raise Exception(f"API 요청 실패: {response.status_code}")
+            return response.json().get("body") or {}
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            logger.warning(f"⚠️ e약은on {page} 페이지 재시도 ({attempt}/{attempts}): {e}")
+            time.sleep(settings.HTTP_RETRY_BACKOFF * attempt)
 
-        all_items.extend(items)
-        page += 1
 
-    return all_items
+def _page_items(body):
+    items = body.get("items") or []
+    # 결과가 1건이면 리스트가 아닌 dict 로 올 수 있음
+    return [items] if isinstance(items, dict) else items
 
 
-# ============================
-# DB 캐싱
-# ============================
-def cache_drugs_on_startup():
+def iter_drug_pages(workers=None, stats=None):
     """
-    서버 시작 시 Drug 테이블이 비어있으면
-    e약은on API에서 데이터를 가져와 DB에 캐싱
+    e약은on API 의 페이지별 항목 리스트를 페이지 순서대로 내보내는 제너레이터
+    1. 첫 페이지의 totalCount 로 나머지 페이지 수를 계산
+    2. 나머지 페이지는 스레드 풀(workers 개)로 동시에 조회
+       - 최대 workers 페이지만 미리 요청해 두므로 전체 목록을 메모리에 쌓지 않음
+    - totalCount 가 없으면 빈 페이지가 나올 때까지 한 페이지씩 조회
+    - stats(dict) 를 주면 끝난 뒤 total / pages / items / seconds / pages_per_second 를 채움
+      (total 은 API 가 알려준 totalCount, 없으면 None)
     """
-    # 테이블이 아직 생성되지 않았으면 종료
-    if 'ingredients_drug' not in connection.introspection.table_names():
-        return
-
-    # 이미 데이터가 있으면 재수집하지 않음
-    if Drug.objects.exists():
-        print("✅ Drug cache already exists")
-        return
-
-    print("🚀 Fetching drugs from e약은on API...")
-
-    drugs = fetch_all_drugs_from_api()
+    started = time.monotonic()
+    rows = settings.E_DRUG_API_PAGE_SIZE
+    workers = workers or settings.E_DRUG_API_FETCH_WORKERS
 
-    for d in drugs:
-        drug = Drug.objects.create(
-            name=d.get("itemName", ""),
-            effect=d.get("efcyQesitm", ""),
-            usage=d.get("useMethodQesitm", ""),
-            warning=d.get("atpnWarnQesitm", ""),
-            image_url=d.get("itemImage"),
-        )
+    first = fetch_drug_page(1, rows)
+    try:
+        total = int(first.get("totalCount"))
+    except (TypeError, ValueError):
+        total = None
+
+    page_items = _page_items(first)
+    pages, items = 1, len(page_items)
+    yield page_items
+
+    if total is None:
+        page = 2
+        while page_items:
+            page_items = _page_items(fetch_drug_page(page, rows))
+            pages, items = pages + 1, items + len(page_items)
+            yield page_items
+            page += 1
+    elif total > rows:
+        remaining = iter(range(2, math.ceil(total / rows) + 1))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='drug-api') as pool:
+            # 요청 순서대로 꺼내므로 페이지 순서가 유지됨
+            pending = deque(
+                pool.submit(fetch_drug_page, page, rows)
+                for page in islice(remaining, workers)
+            )
+            while pending:
+                page_items = _page_items(pending.popleft().result())
+                page = next(remaining, None)
+                if page is not None:
+                    pending.append(pool.submit(fetch_drug_page, page, rows))
+                pages, items = pages + 1, items + len(page_items)
+                yield page_items
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "total": total,
+        "pages": pages,
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 2) if elapsed else None,
+    }
+    logger.info(
+        f"e약은on 목록 조회: {summary['items']} items / {summary['pages']} pages / "
+        f"{summary['seconds']}s ({summary['pages_per_second']} pages/s)"
+    )
+    if stats is not None:
+        stats.update(summary)
 
-        # 🔥 외부 이미지 URL이 있으면 이미지 파일로 저장
-        if drug.image_url:
-            download_and_save_image(drug, drug.image_url)
 
-    print(f"✅ Drug cache completed ({len(drugs)} items)")
+def fetch_all_drugs_from_api(workers=None, stats=None):
+    """
+    e약은on API에서 전체 의약품 목록을 리스트로 가져옴 (iter_drug_pages 참고)
+    """
+    return [item for items in iter_drug_pages(workers, stats) for item in items]
 
 
 # ============================
@@ -96,7 +137,22 @@ def extract_keywords_with_ai(text):
     """
     사용자 자연어 문장에서
     - 일상 표현 → 의학적으로 표준화된 증상 키워드로 변환
-    - JSON 형식으로만 응답받음
+    - 정규화된 검색어 기준으로 캐시 (LRU → DB), 캐시에 없을 때만 AI 호출
+    """
+    query = normalize_query(text)
+
+    symptoms = get_cached_symptoms(query)
+    if symptoms is not None:
+        return symptoms
+
+    symptoms = request_keywords_from_ai(text)
+    store_symptoms(query, symptoms)
+    return symptoms
+
+
+def request_keywords_from_ai(text):
+    """
+    GPT 호출로 증상 키워드 추출 (JSON 형식으로만 응답받음)
     """
     prompt = f"""
 너는 의료 NLP 시스템이야.
@@ -131,14 +187,14 @@ def extract_keywords_with_ai(text):
         "temperature": 0
     }
 
-    res = requests.post(
-        GMS_OPENAI_URL,
+    res = http_client.post(
+        'openai',
+        f"{settings.OPENAI_BASE_URL}/chat/completions",
         headers={
             "Authorization": f"Bearer {settings.GMS_KEY}",
             "Content-Type": "application/json"
         },
         json=payload,
-        timeout=15
     )
 
     # HTTP 에러 발생 시 예외
@@ -153,25 +209,76 @@ def extract_keywords_with_ai(text):
 # ============================
 # 약 검색 로직
 # ============================
-def search_drugs_by_effect_keywords(keywords):
+def _normalize(text):
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+def score_symptom_match(effect, keywords, similarity):
     """
-    effect 텍스트에 키워드가 포함된 의약품 검색
+    효능 텍스트 한 건의 증상 일치 점수
+      일치한 증상 수 + (위치 점수 평균 + 유사도) / 2
+    - 위치 점수: 효능 문장 앞쪽에 나올수록 1에 가까움 (주 효능이 먼저 나열됨)
+    - 뒤의 항은 1 이하라서 더 많은 증상과 일치하는 의약품이 항상 먼저 옴
     """
-    q = Q()
-    for k in keywords:
-        q |= Q(effect__icontains=k)
+    effect = _normalize(effect)
+    if not effect:
+        return similarity / 2
+
+    matched, positions = 0, []
+    for keyword in keywords:
+        index = effect.find(keyword)
+        if index >= 0:
+            matched += 1
+            positions.append(1 - index / len(effect))
 
-    return Drug.objects.filter(q).distinct()
+    position = sum(positions) / len(positions) if positions else 0.0
+    return matched + (position + similarity) / 2
+
+
+def search_drugs_by_effect_keywords(keywords, top_k=None):
+    """
+    증상 키워드와 관련된 의약품을 관련도 순으로 반환
+    1. 효능 벡터 색인(TF-IDF 코사인 유사도)으로 후보 top_k 개
+    2. 후보의 효능 텍스트에서 일치한 증상 수 / 위치로 다시 점수 계산
+
+    반환값: [(drug_id, score), ...] (점수 내림차순, 같으면 최신 의약품 먼저)
+    """
+    hits = search_effects(keywords, top_k)
+    if not hits:
+        return []
+
+    keywords = {k for k in (_normalize(k).strip() for k in keywords) if k}
+    effects = dict(Drug.objects.filter(pk__in=[pk for pk, _ in hits]).values_list('id', 'effect'))
+
+    ranked = [
+        (pk, round(score_symptom_match(effects.get(pk), keywords, similarity), 4))
+        for pk, similarity in hits
+        if pk in effects
+    ]
+    ranked.sort(key=lambda hit: (-hit[1], -hit[0]))
+    return ranked
 
 
 def search_drugs_by_ai(text):
     """
-    1. AI로 증상 키워드 추출
+    1. 증상 사전으로 먼저 매칭, 확신도가 낮을 때만 AI로 증상 키워드 추출
     2. effect 필드 기반으로 의약품 검색
+    - AI 호출이 실패하면(회로 차단 / 마감 초과 / 응답 오류) 검색어 단어로 바로 검색
+
+    반환값: ([(drug_id, score), ...], 증상 키워드, 키워드를 얻은 경로 'lexicon' / 'ai' / 'fallback')
     """
-    keywords = extract_keywords_with_ai(text)
-    drugs = search_drugs_by_effect_keywords(keywords)
-    return drugs, keywords
+    match = match_symptoms(text)
+    if is_confident(match):
+        keywords, source = match.symptoms, 'lexicon'
+    else:
+        try:
+            keywords, source = extract_keywords_with_ai(text), 'ai'
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logger.warning(f"AI 키워드 추출 실패, 일반 검색으로 대체: {e}")
+            return search_drugs_by_effect_keywords(text.split()), [], 'fallback'
+
+    hits = search_drugs_by_effect_keywords(keywords)
+    return hits, keywords, source
 
 
 # ============================
@@ -183,7 +290,7 @@ def download_and_save_image(drug, image_url):
     Drug.image 필드에 파일로 저장
     """
     try:
-        res = requests.get(image_url, timeout=10)
+        res = http_client.get('image', image_url)
         if res.status_code != 200:
             return
 
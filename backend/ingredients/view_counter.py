@@ -0,0 +1,162 @@
+# ingredients/view_counter.py
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Drug
+from .trending import record_hourly_views
+
+logger = logging.getLogger(__name__)
+
+
+# ============================
+# 프로세스 내 조회수 버퍼
+# ============================
+# 상세 조회마다 UPDATE 를 날리면 인기 약 하나에 SQLite 쓰기 잠금이 몰린다.
+# 조회수는 메모리에 모아 두었다가 일정 시간 / 건수마다 UPDATE 한 번으로 반영한다.
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def record_view(drug_id):
+    """
+    조회 1건을 버퍼에 기록
+
+    반환값: 이 약에 대해 아직 DB 에 반영되지 않은 조회수 (이번 조회 포함)
+    - 응답의 view_count 는 DB 값 + 반환값
+    """
+    with _lock:
+        _pending[drug_id] += 1
+        buffered = _pending[drug_id]
+        due = (
+            sum(_pending.values()) >= settings.DRUG_VIEW_FLUSH_THRESHOLD
+            or time.monotonic() - _last_flush >= settings.DRUG_VIEW_FLUSH_INTERVAL
+        )
+
+    if due:
+        flush_views()
+
+    return buffered
+
+
+def pending_views(drug_id):
+    with _lock:
+        return _pending.get(drug_id, 0)
+
+
+def flush_views():
+    """
+    버퍼에 쌓인 조회수를 UPDATE ... CASE 한 번으로 DB 에 반영
+    - 같은 트랜잭션에서 시간별 조회수 버킷도 갱신
+
+    반환값: 반영된 조회 건수
+    """
+    global _last_flush
+
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+
+    if not batch:
+        return 0
+
+    try:
+        with transaction.atomic():
+            Drug.objects.filter(pk__in=batch).update(
+                view_count=F('view_count') + Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in batch.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+            # 트렌딩 집계용 시간별 버킷에도 반영
+            record_hourly_views(batch)
+    except Exception:
+        # 반영 실패 시 다음 flush 때 다시 시도하도록 버퍼에 되돌림
+        logger.exception('조회수 반영 실패')
+        with _lock:
+            _pending.update(batch)
+        return 0
+
+    return sum(batch.values())
+
+
+def discard_views():
+    """
+    버퍼를 DB 에 반영하지 않고 비움 (테스트용)
+    """
+    global _last_flush
+    with _lock:
+        _pending.clear()
+        _last_flush = time.monotonic()
+
+
+_exit_flush_registered = False
+
+
+def register_exit_flush():
+    """
+    프로세스 종료 시 남은 조회수 반영
+    - 모듈 import 때 등록하면 테스트 / 관리 커맨드 종료 시에도 기본 DB 에 쓰게 되므로
+      요청을 받는 프로세스(wsgi.py / asgi.py, runserver 포함)에서만 호출
+    """
+    global _exit_flush_registered
+    with _lock:
+        if _exit_flush_registered:
+            return
+        _exit_flush_registered = True
+    atexit.register(flush_views)
+
+
+# ============================
+# 주기적 반영
+# ============================
+# record_view 의 시간 기준은 다음 조회가 들어와야 확인되므로
+# 조회가 끊기면 버퍼가 남은 채로 머문다. 데몬 스레드가 주기마다 대신 반영한다.
+_flush_stop = threading.Event()
+_flush_thread = None
+
+
+def _flush_periodically():
+    while not _flush_stop.wait(settings.DRUG_VIEW_FLUSH_INTERVAL):
+        try:
+            flush_views()
+        except Exception:
+            logger.exception('주기적 조회수 반영 실패')
+        finally:
+            connection.close()
+
+
+def start_periodic_flush():
+    """
+    DRUG_VIEW_FLUSH_INTERVAL 마다 버퍼를 반영하는 데몬 스레드 시작 (프로세스당 1번)
+    - register_exit_flush 와 같이 요청을 받는 프로세스에서만 호출
+    """
+    global _flush_thread
+    with _lock:
+        if _flush_thread is not None:
+            return _flush_thread
+        _flush_stop.clear()
+        _flush_thread = threading.Thread(target=_flush_periodically, name='view-flush', daemon=True)
+        _flush_thread.start()
+    return _flush_thread
+
+
+def stop_periodic_flush():
+    """
+    start_periodic_flush 로 시작한 스레드를 멈춤 (테스트용)
+    """
+    global _flush_thread
+    with _lock:
+        thread, _flush_thread = _flush_thread, None
+    if thread is not None:
+        _flush_stop.set()
+        thread.join()
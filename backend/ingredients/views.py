@@ -4,22 +4,42 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Count
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 # ========================
 # Django 기본
 # ========================
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from django.db.models import Avg, Count, Q, F, FloatField, ExpressionWrapper
+from django.db import transaction
 
 # ========================
 # 외부 / 유틸
 # ========================
 import json
-import requests
 import logging
+from requests import RequestException
+from rest_framework.utils.urls import replace_query_param
 from .utils import search_drugs_by_ai
+from .search import rank_drugs
+from .view_counter import record_view
+from . import http_client
+from .chat import (
+    CHAT_SUGGESTIONS,
+    CHAT_UNAVAILABLE_REPLY,
+    ChatUpstreamError,
+    chat_request,
+    request_chat_reply,
+)
+from .chat_cache import get_cached_answer, store_answer
+from .chat_stream import cached_chat_events, sse_response, stream_chat_events, unavailable_chat_events
+from .circuit import get_breaker, is_available
+from .ai_summary import enqueue_summary_job, job_payload, summary_payload
+from .trending import WINDOWS, trending_drugs
+from .querysets import comments_prefetch, parse_comments_limit, with_stats
+from .pagination import InvalidCursor, keyset_order_by, keyset_paginate
+from .stats import apply_comment_delta, reaction_summaries
+from .reactions import clear_reaction, set_reaction
 
 
 # ========================
@@ -27,8 +47,8 @@ from .utils import search_drugs_by_ai
 # ========================
 from .models import (
     Drug,
-    DrugAiSummary,   
-    DrugReaction,
+    DrugAiSummary,
+    DrugAiSummaryJob,
 )
 from .serializers import (
     DrugSerializer,
@@ -50,55 +70,15 @@ logger = logging.getLogger(__name__)
 
 # Gemini 이미지 생성 엔드포인트
 GMS_GEMINI_IMAGE_URL = "https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp-image-generation:generateContent"
-GMS_OPENAI_URL = "https://gms.ssafy.io/gmsapi/api.openai.com/v1/chat/completions"
-
 
-# gpt 호출 함수
-def call_gpt_for_drug_summary(drug):
-    developer_msg = """
-너는 한국어로 약 정보를 쉽게 설명해주는 AI야.
-반드시 JSON만 출력해야 해.
-
-{
-  "one_liner": "",
-  "easy_explain": "",
-  "key_points": [],
-  "cautions": [],
-  "when_to_see_doctor": []
+# 목록 정렬 파라미터 → 정렬 필드 (없으면 id 역순)
+DRUG_ORDER_FIELDS = {
+    'helpful': 'helpful_ratio',
+    'rating': 'avg_rating',
 }
-""".strip()
-
-    user_msg = f"""
-약 이름: {drug.name}
-효능: {drug.effect}
-복용법: {drug.usage}
-주의사항: {drug.warning}
-""".strip()
-
-
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": [
-            {"role": "developer", "content": developer_msg},
-            {"role": "user", "content": user_msg},
-        ],
-        "temperature": 0.2,
-    }
-
-    r = requests.post(
-        GMS_OPENAI_URL,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {settings.GMS_KEY}",
-        },
-        json=payload,
-        timeout=30,
-    )
-    r.raise_for_status()
-    data = r.json()
 
-    content = data["choices"][0]["message"]["content"]
-    return json.loads(content)
+# 통계 정렬의 보조 키 (DrugStats 의 (값, drug) 인덱스 순서대로 읽도록 DrugStats 쪽 키 사용)
+DRUG_STATS_ORDER_PK = 'stats'
 
 
 # ================================
@@ -116,10 +96,15 @@ def create_drug_comment(request, pk):
 
     serializer = DrugCommentSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    serializer.save(
-        author=request.user,
-        drug=drug
-    )
+
+    # 댓글 저장과 통계 갱신을 한 트랜잭션으로 처리
+    with transaction.atomic():
+        comment = serializer.save(
+            author=request.user,
+            drug=drug
+        )
+        apply_comment_delta(drug.id, comment.rating)
+
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
@@ -133,19 +118,21 @@ def create_drug_comment(request, pk):
 @permission_classes([AllowAny])
 def drug_detail(request, pk):
     """
-    GET /drugs/<pk>/
+    GET /drugs/<pk>/?comments_limit=N
     - 약 상세 정보
-    - 조회수 증가
+    - 조회수 증가 (버퍼에 모았다가 일괄 반영)
+    - comments_limit 가 있으면 최신 댓글 N개만
     """
-    drug = get_object_or_404(Drug, pk=pk)
-
-    #  조회수 증가
-    Drug.objects.filter(pk=pk).update(
-        view_count=F('view_count') + 1
+    # 통계 + 댓글/작성자를 한 번에 조회
+    drug = get_object_or_404(
+        with_stats(Drug.objects).prefetch_related(
+            comments_prefetch(parse_comments_limit(request.query_params))
+        ),
+        pk=pk,
     )
 
-    # 최신 값 다시 가져오기
-    drug.refresh_from_db()
+    #  조회수 증가 (아직 DB 에 반영되지 않은 버퍼 값을 더해서 응답)
+    drug.view_count += record_view(drug.pk)
 
     serializer = DrugDetailSerializer(drug)
     return Response(serializer.data)
@@ -154,11 +141,30 @@ def drug_detail(request, pk):
 @permission_classes([AllowAny])
 def popular_drugs_by_view(request):
     """
-    GET /api/drugs/popular/views/
-    - 조회수 기준 인기 약 TOP 10
+    GET /api/drugs/popular/views/?window=24h|7d|30d|all
+    - 기간별 조회수 기준 인기 약 TOP-K (기본: 전체 기간)
+    - 24h / 7d / 30d 는 refresh_trending 커맨드로 미리 계산된 목록을 읽음
+    - all 은 현재 조회수로 바로 정렬
     """
-    drugs = Drug.objects.order_by('-view_count')[:10]
-    serializer = DrugSerializer(drugs, many=True)
+    window = request.query_params.get('window', 'all')
+    if window not in WINDOWS:
+        return Response(
+            {'detail': f'window 값은 {", ".join(WINDOWS)} 중 하나여야 합니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    fields = DrugSerializer.select_fields(request.query_params)
+    drugs = with_stats(Drug.objects.filter(removed_at__isnull=True).only(*DrugSerializer.model_columns(fields)))
+    if 'comments' in fields:
+        drugs = drugs.prefetch_related(
+            comments_prefetch(parse_comments_limit(request.query_params))
+        )
+
+    serializer = DrugSerializer(
+        trending_drugs(drugs, window),
+        many=True,
+        context={'selected_fields': fields},
+    )
     return Response(serializer.data)
 
 # ================================
@@ -176,34 +182,12 @@ def drug_reaction(request, drug_id):
     - 로그인 필수
     - 같은 버튼 다시 누르면 반응 취소
     """
-    drug = get_object_or_404(Drug, pk=drug_id)
-
     # ---------- GET ----------
     if request.method == 'GET':
-        summary = (
-            DrugReaction.objects
-            .filter(drug=drug)
-            .values('reaction')
-            .annotate(count=Count('id'))
-        )
-
-        data = {
-            'helpful': 0,
-            'unhelpful': 0,
-            'my_reaction': None,
-        }
-
-        for item in summary:
-            data[item['reaction']] = item['count']
-
-        if request.user.is_authenticated:
-            my = DrugReaction.objects.filter(
-                user=request.user,
-                drug=drug
-            ).first()
-            data['my_reaction'] = my.reaction if my else None
-
-        return Response(data)
+        summary = reaction_summaries([drug_id], request.user).get(drug_id)
+        if summary is None:
+            raise Http404
+        return Response(summary)
 
     # ---------- POST ----------
     if not request.user.is_authenticated:
@@ -214,12 +198,10 @@ def drug_reaction(request, drug_id):
 
     reaction_type = request.data.get('reaction')
 
-    # 반응 취소
+    # 반응 취소 (DELETE 1번 + 통계 갱신, 지운 반응이 없을 때만 의약품 존재 확인)
     if reaction_type is None:
-        DrugReaction.objects.filter(
-            user=request.user,
-            drug=drug
-        ).delete()
+        if clear_reaction(request.user, drug_id) is None and not Drug.objects.filter(pk=drug_id).exists():
+            raise Http404
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     if reaction_type not in ['helpful', 'unhelpful']:
@@ -228,16 +210,42 @@ def drug_reaction(request, drug_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    reaction_obj, _ = DrugReaction.objects.update_or_create(
-        user=request.user,
-        drug=drug,
-        defaults={'reaction': reaction_type}
-    )
+    # INSERT ... ON CONFLICT DO UPDATE 1번 + 통계 갱신 (의약품이 없으면 None)
+    reaction_obj = set_reaction(request.user, drug_id, reaction_type)
+    if reaction_obj is None:
+        raise Http404
 
     serializer = DrugReactionSerializer(reaction_obj)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def drug_reactions_batch(request):
+    """
+    GET /drugs/reactions/?ids=1,2,3
+    - 여러 약의 도움됨 / 도움안됨 개수 + 로그인 시 내 반응
+    - 목록 카드마다 요청하지 않도록 고정된 쿼리 수(최대 2번)로 처리
+    - 응답: { "<id>": { helpful, unhelpful, my_reaction }, ... }
+    """
+    try:
+        ids = {int(i) for i in request.query_params.get('ids', '').split(',') if i.strip()}
+    except ValueError:
+        return Response(
+            {'detail': 'ids 는 콤마로 구분된 숫자여야 합니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(ids) > settings.DRUG_REACTIONS_BATCH_MAX:
+        return Response(
+            {'detail': f'ids 는 최대 {settings.DRUG_REACTIONS_BATCH_MAX}개까지 요청할 수 있습니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    summaries = reaction_summaries(ids, request.user) if ids else {}
+    return Response({str(pk): summary for pk, summary in summaries.items()})
+
+
 # ================================
 # 📊 약 목록 + 검색 + 정렬
 # ================================
@@ -245,42 +253,79 @@ def drug_reaction(request, drug_id):
 def drug_list(request):
     """
     GET /drugs/?search=타이레놀&order=helpful|rating
-    - 약 이름 검색
+    - 약 이름 검색 (order 가 없으면 관련도(search_score)순)
     - 기본순 / 도움순 / 평점순 정렬
+
+    GET /drugs/?page_size=20&cursor=<next_cursor>
+    - cursor 또는 page_size 가 있으면 커서 페이지네이션 모드
+    - 응답: { results, next, next_cursor }
+
+    GET /drugs/?fields=id,name,effect&expand=comments
+    - 기본은 카드용 필드만, 긴 텍스트 / 댓글은 요청 시에만 포함
     """
     order = request.query_params.get('order')
     search = request.query_params.get('search')  # ⭐ 핵심 추가
 
-    drugs = Drug.objects.annotate(
-        avg_rating=Avg('comments__rating'),
-        helpful_count=Count(
-            'reactions',
-            filter=Q(reactions__reaction='helpful')
-        ),
-        unhelpful_count=Count(
-            'reactions',
-            filter=Q(reactions__reaction='unhelpful')
-        ),
-    ).annotate(
-        helpful_ratio=ExpressionWrapper(
-            100.0 * F('helpful_count') /
-            (F('helpful_count') + F('unhelpful_count')),
-            output_field=FloatField()
+    # 응답에 필요한 컬럼만 읽음 (긴 텍스트 컬럼은 요청 시에만)
+    fields = DrugSerializer.select_fields(request.query_params)
+    context = {'selected_fields': fields}
+
+    # 집계는 DrugStats 에 미리 계산되어 있으므로 JOIN 한 컬럼만 읽음
+    drugs = with_stats(Drug.objects.filter(removed_at__isnull=True).only(*DrugSerializer.model_columns(fields)))
+
+    # 댓글은 요청된 경우에만 한 번의 쿼리로 미리 가져옴
+    if 'comments' in fields:
+        drugs = drugs.prefetch_related(
+            comments_prefetch(parse_comments_limit(request.query_params))
         )
-    )
 
-    # 약 이름 필터링 핵심 
+    # 약 이름 필터링 핵심 (전문 검색 색인 사용, BM25 관련도를 search_score 로)
     if search:
-        drugs = drugs.filter(name__icontains=search)
+        drugs = rank_drugs(drugs, search, column='name')
+
+    order_field = DRUG_ORDER_FIELDS.get(order)
+    pk_field = DRUG_STATS_ORDER_PK if order_field else 'id'
+    if order_field is None and search:
+        order_field = 'search_score'
+
+    # ---------- 커서 페이지네이션 ----------
+    if 'cursor' in request.query_params or 'page_size' in request.query_params:
+        try:
+            page_size = int(request.query_params.get('page_size', settings.DRUG_LIST_PAGE_SIZE))
+        except ValueError:
+            page_size = settings.DRUG_LIST_PAGE_SIZE
+        page_size = max(1, min(page_size, settings.DRUG_LIST_MAX_PAGE_SIZE))
+
+        try:
+            page, next_cursor = keyset_paginate(
+                drugs,
+                order_field=order_field,
+                cursor=request.query_params.get('cursor'),
+                page_size=page_size,
+                pk_field=pk_field,
+            )
+        except InvalidCursor:
+            return Response(
+                {'detail': '잘못된 cursor 값입니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', next_cursor
+            )
+
+        serializer = DrugSerializer(page, many=True, context=context)
+        return Response({
+            'results': serializer.data,
+            'next': next_url,
+            'next_cursor': next_cursor,
+        })
 
-    if order == 'helpful':
-        drugs = drugs.order_by('-helpful_ratio')
-    elif order == 'rating':
-        drugs = drugs.order_by('-avg_rating')
-    else:
-        drugs = drugs.order_by('-id')
+    drugs = drugs.order_by(*keyset_order_by(order_field, pk_field))
 
-    serializer = DrugSerializer(drugs, many=True)
+    serializer = DrugSerializer(drugs, many=True, context=context)
     return Response(serializer.data)
 
 
@@ -288,95 +333,61 @@ def drug_list(request):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def drug_ai_summary(request, pk):
+    """
+    GET /drugs/<pk>/ai-summary/
+    - 저장된 요약이 있으면 바로 반환 (200)
+    - 없으면 백그라운드 생성 작업을 등록하고 202 + 작업 조회 URL 반환
+    - AI 호출이 차단된 상태(회로 열림)면 작업을 쌓지 않고 바로 503
+    """
     drug = get_object_or_404(Drug, pk=pk)
 
     # 1️⃣ 캐시 먼저 확인
     try:
-        summary = drug.ai_summary
-        return Response({
-            "one_liner": summary.one_liner,
-            "easy_explain": summary.easy_explain,
-            "key_points": summary.key_points,
-            "cautions": summary.cautions,
-            "when_to_see_doctor": summary.when_to_see_doctor,
-            "cached": True,
-            "updated_at": summary.updated_at,
-        })
+        return Response(summary_payload(drug.ai_summary, cached=True))
     except DrugAiSummary.DoesNotExist:
         pass
 
-    # 2️⃣ GPT 호출
-
-    try:
-        parsed = call_gpt_for_drug_summary(drug)
-    except Exception as e:
+    if not is_available('openai_summary'):
+        retry_after = int(get_breaker('openai_summary').open_seconds)
         return Response(
-            {
-                "detail": "AI 요약 생성 실패",
-                "error": str(e),
-            },
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {"status": "unavailable", "detail": "AI 요약을 일시적으로 생성할 수 없습니다.", "retry_after": retry_after},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(retry_after)},
         )
 
-    # 3️⃣ DB 저장
-    summary = DrugAiSummary.objects.create(
-        drug=drug,
-        one_liner=parsed.get("one_liner", ""),
-        easy_explain=parsed.get("easy_explain", ""),
-        key_points=parsed.get("key_points", []),
-        cautions=parsed.get("cautions", []),
-        when_to_see_doctor=parsed.get("when_to_see_doctor", []),
-    )
-
-    return Response({
-        "one_liner": summary.one_liner,
-        "easy_explain": summary.easy_explain,
-        "key_points": summary.key_points,
-        "cautions": summary.cautions,
-        "when_to_see_doctor": summary.when_to_see_doctor,
-        "cached": False,
-        "updated_at": summary.updated_at,
-    })
-
-
-# ai 챗봇 
-SYSTEM_PROMPT = """
-너는 의약품 정보를 친절하게 설명해주는 AI 어시스턴트야.
-전문 용어는 최대한 쉽게 풀어서 설명해 줘.
-이 약과 직접 관련 없는 내용은 추측하지 말고,
-의학적 판단이나 처방이 필요한 경우에는
-자연스럽게 의료진 상담을 권장해 줘.
-"""
-
-def build_context(drug):
-    return f"""
-다음은 특정 의약품에 대한 공식 정보입니다.
-이 정보는 참고용 컨텍스트입니다.
-
-약 이름: {drug.name}
-효능: {drug.effect or "정보 없음"}
-복용 방법: {drug.usage or "정보 없음"}
-주의사항: {drug.warning or "정보 없음"}
-"""
-
+    # 2️⃣ 생성 작업 등록 (요청 스레드에서 GPT 를 기다리지 않음)
+    job = enqueue_summary_job(drug)
 
+    return Response(
+        job_payload(job),
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Retry-After": str(settings.AI_SUMMARY_POLL_INTERVAL)},
+    )
 
-def extract_reply_from_response(data):
-    try:
-        for item in data.get("output", []):
-            if item.get("role") == "assistant":
-                for c in item.get("content", []):
-                    if c.get("type") == "output_text":
-                        return c.get("text")
-    except Exception as e:
-        logger.error(f"❌ 응답 파싱 실패: {e}")
-    return None
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def drug_ai_summary_job(request, pk, job_id):
+    """
+    GET /drugs/<pk>/ai-summary/jobs/<job_id>/
+    - 요약 생성 작업 상태 (pending / running / done / failed)
+    - done 이면 summary 포함
+    """
+    job = get_object_or_404(DrugAiSummaryJob, pk=job_id, drug_id=pk)
+    return Response(job_payload(job))
 
 
+# ai 챗봇 
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def drug_chat(request, pk):
+    """
+    POST /drugs/<pk>/chat/
+    - 같은 약에 같은 질문(추천 질문 칩 등)은 캐시된 답변 반환 (cached=True)
+    - ?stream=1 이면 text/event-stream 으로 답변 조각을 바로 전달
+      (event: delta → ... → suggestions → drug → done)
+    - 모델 호출이 차단 / 실패하면 바로 "일시적으로 사용할 수 없음" 응답 (503)
+    """
     drug = get_object_or_404(Drug, pk=pk)
     user_msg = request.data.get("message", "").strip()
 
@@ -386,48 +397,64 @@ def drug_chat(request, pk):
             status=400
         )
 
-    url = f"{settings.OPENAI_BASE_URL}/responses"
-
-    payload = {
-    "model": "gpt-5-nano",
-    "instructions": SYSTEM_PROMPT,
-    "input": f"""
-    {build_context(drug)}
-
-    사용자 질문:
-    {user_msg}
-    """.strip(),
-        "reasoning": {"effort": "low"},
-        
-    }
+    stream = request.query_params.get("stream") in ("1", "true")
+    drug_meta = {"id": drug.id, "name": drug.name}
 
+    cached = get_cached_answer(drug, user_msg)
+    if cached is not None:
+        if stream:
+            return sse_response(request, cached_chat_events(cached, CHAT_SUGGESTIONS, drug_meta))
+        return Response({
+            "reply": cached,
+            "suggestions": CHAT_SUGGESTIONS,
+            "drug": drug_meta,
+            "cached": True,
+        })
 
-    headers = {
-        "Authorization": f"Bearer {settings.GMS_KEY}",
-        "Content-Type": "application/json",
-    }
+    if not is_available('openai'):
+        if stream:
+            return sse_response(request, unavailable_chat_events(CHAT_UNAVAILABLE_REPLY, CHAT_SUGGESTIONS, drug_meta))
+        return Response(
+            {"reply": CHAT_UNAVAILABLE_REPLY, "suggestions": CHAT_SUGGESTIONS, "drug": drug_meta},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
 
-    r = requests.post(url, json=payload, headers=headers, timeout=30)
+    if stream:
+        url, payload, headers = chat_request(drug, user_msg)
+        return sse_response(request, stream_chat_events(
+            url,
+            payload,
+            headers,
+            suggestions=CHAT_SUGGESTIONS,
+            drug_meta=drug_meta,
+            on_complete=lambda reply: store_answer(drug, user_msg, reply),
+        ))
 
-    if r.status_code != 200:
-        logger.error(f"❌ OpenAI Error {r.status_code}: {r.text}")
+    try:
+        with http_client.deadline(settings.CHAT_DEADLINE):
+            reply = request_chat_reply(drug, user_msg)
+    except RequestException:
+        return Response(
+            {"reply": CHAT_UNAVAILABLE_REPLY, "suggestions": CHAT_SUGGESTIONS, "drug": drug_meta},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    except ChatUpstreamError:
         return Response(
             {"reply": "AI 응답 생성 실패\n※ 의료적 판단/처방이 아닌 정보 제공 목적입니다."},
             status=500
         )
 
-    data = r.json()
-    reply = extract_reply_from_response(data)
-
-    if not reply:
-        logger.error(f"❌ 빈 응답 수신: {json.dumps(data, ensure_ascii=False)}")
+    if reply:
+        store_answer(drug, user_msg, reply)
+    else:
         reply = "답변을 생성하지 못했습니다."
 
     # ✅ 반드시 항상 Response 반환
     return Response({
         "reply": reply,
-        "suggestions": ["효능", "복용법", "주의사항", "부작용"],
-        "drug": {"id": drug.id, "name": drug.name},
+        "suggestions": CHAT_SUGGESTIONS,
+        "drug": drug_meta,
+        "cached": False,
     })
 
 
@@ -441,6 +468,9 @@ def drug_chat(request, pk):
 def drug_ai_search(request):
     """
     GET /api/drugs/ai-search/?q=머리가 지끈거리고 열나요
+    - 일치한 증상 수 / 효능 문장 내 위치 / 유사도 순으로 정렬 (search_score)
+    - 한 번에 limit 개 (기본 AI_SEARCH_PAGE_SIZE), offset 으로 다음 페이지
+    - count 는 관련도 계산 결과 전체 개수 (별도 COUNT 쿼리 없음)
     """
     q = request.GET.get('q', '').strip()
 
@@ -450,13 +480,53 @@ def drug_ai_search(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    drugs, symptoms = search_drugs_by_ai(q)
+    try:
+        limit = int(request.query_params.get('limit', settings.AI_SEARCH_PAGE_SIZE))
+        offset = int(request.query_params.get('offset', 0))
+    except ValueError:
+        return Response(
+            {'detail': 'limit / offset 은 정수여야 합니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    limit = max(1, min(limit, settings.AI_SEARCH_MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    # AI 키워드 추출은 마감 시간 안에서만 (넘으면 일반 검색으로 대체)
+    with http_client.deadline(settings.AI_SEARCH_DEADLINE):
+        hits, symptoms, symptom_source = search_drugs_by_ai(q)
+
+    page_hits = hits[offset:offset + limit]
+    scores = dict(page_hits)
+
+    # 현재 페이지 의약품만 읽음
+    fields = DrugSerializer.select_fields(request.query_params)
+    drugs = with_stats(
+        Drug.objects.filter(pk__in=scores, removed_at__isnull=True).only(*DrugSerializer.model_columns(fields))
+    )
+    if 'comments' in fields:
+        drugs = drugs.prefetch_related(
+            comments_prefetch(parse_comments_limit(request.query_params))
+        )
+
+    by_id = {drug.pk: drug for drug in drugs}
+    page = []
+    for pk, score in page_hits:
+        drug = by_id.get(pk)
+        if drug is not None:
+            drug.search_score = score
+            page.append(drug)
+
+    next_url = None
+    if offset + limit < len(hits):
+        next_url = replace_query_param(request.build_absolute_uri(), 'offset', offset + limit)
 
-    serializer = DrugSerializer(drugs, many=True)
+    serializer = DrugSerializer(page, many=True, context={'selected_fields': fields})
     return Response({
         "input": q,
         "detected_symptoms": symptoms,
-        "count": drugs.count(),
+        "symptom_source": symptom_source,
+        "count": len(hits),
+        "next": next_url,
         "results": serializer.data
     })
 
@@ -512,4 +582,18 @@ def generate_drug_qr(request, drug_id):
         print(f"❌ QR 생성 에러: {str(e)}")
         import traceback
         traceback.print_exc()
-        return Response({'error': str(e)}, status=500)
\ No newline at end of file
+        return Response({'error': str(e)}, status=500)
+
+
+# ================================
+#  외부 API 호출 지표
+# ================================
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def upstream_metrics(request):
+    """
+    GET /metrics/upstreams/
+    - upstream(openai / drug_api / image) 별 호출 수, 오류 수, 지연 시간(ms)
+    - 이 프로세스 기준 값
+    """
+    return Response(http_client.upstream_metrics())